@@ -0,0 +1,185 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2023 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Daemon holding connections to controllers between CLI invocations.
+
+The daemon listens on local Unix socket. Each request is a single JSON line
+with command name, parsed CLI arguments and digest of client configuration, e.g.
+
+    {"command": "status", "args": {"filter": "", "models": null, ...}, "config": "..."}
+
+and the response is a JSON line for each controller as soon as the result is
+completed, either `{"result": {...}}` or `{"error": "..."}`. The request of client
+with different configuration is refused with `{"error": "...", "config": false}`.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Optional, Type
+
+from juju_spell.assignment.runner import ResultType, iter_results
+from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.config import Config, get_config_digest
+from juju_spell.connections import connect_manager
+from juju_spell.exceptions import JujuSpellError
+from juju_spell.filter import get_filtered_config
+from juju_spell.settings import DAEMON_SOCKET_PATH, DEFAULT_PRUNE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigMismatchError(JujuSpellError):
+    """Daemon uses different configuration than client."""
+
+
+def is_daemon_running(socket_path: Path = DAEMON_SOCKET_PATH) -> bool:
+    """Check if daemon socket exists."""
+    return socket_path.is_socket()
+
+
+async def _is_socket_alive(socket_path: Path) -> bool:
+    """Check if any process accepts connections on socket."""
+    try:
+        _, writer = await asyncio.open_unix_connection(str(socket_path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+
+    writer.close()
+    return True
+
+
+class Daemon:
+    """Daemon running Juju commands with warm connections to controllers."""
+
+    def __init__(
+        self,
+        config: Config,
+        commands: Dict[str, Type[BaseJujuCommand]],
+        socket_path: Path = DAEMON_SOCKET_PATH,
+        prune_interval: float = DEFAULT_PRUNE_INTERVAL,
+    ) -> None:
+        """Initialize the daemon.
+
+        :param config: application configuration
+        :param commands: mapping of CLI command name to Juju command, which can be
+                         run by daemon
+        :param socket_path: path to Unix socket
+        :param prune_interval: interval in seconds to prune lost connections and idle
+                               model connections
+        """
+        self.config = config
+        self.config_digest = get_config_digest(config)
+        self.commands = commands
+        self.socket_path = socket_path
+        self.prune_interval = prune_interval
+
+    async def serve(self) -> None:
+        """Serve requests until the daemon is cancelled.
+
+        Raises JujuSpellError if other daemon is already listening on the socket.
+        """
+        if is_daemon_running(self.socket_path):
+            if await _is_socket_alive(self.socket_path):
+                raise JujuSpellError(f"daemon is already running on {self.socket_path}")
+
+            self.socket_path.unlink()  # remove socket left by previous daemon
+
+        umask = os.umask(0o177)  # only owner can send commands
+        try:
+            server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        finally:
+            os.umask(umask)
+
+        logger.info("daemon is listening on %s", self.socket_path)
+        prune = asyncio.ensure_future(self._prune())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            prune.cancel()
+            await connect_manager.clean()
+            with contextlib.suppress(FileNotFoundError):
+                self.socket_path.unlink()
+
+            logger.info("daemon was stopped")
+
+    async def _prune(self) -> None:
+        """Periodically close lost controller connections and idle model connections.
+
+        Connections are not pinged by daemon, the controller connections are kept
+        alive by pinger of python-libjuju.
+        """
+        while True:
+            await asyncio.sleep(self.prune_interval)
+            await connect_manager.prune()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle single request."""
+        try:
+            request = json.loads(await reader.readline())
+            if request.get("config") != self.config_digest:
+                raise ConfigMismatchError("daemon was started with different configuration")
+
+            command = self.commands.get(request.get("command"))
+            if command is None:
+                raise JujuSpellError(f"command `{request.get('command')}` is not supported")
+
+            parsed_args = Namespace(**request["args"])
+            filtered_config = get_filtered_config(self.config, parsed_args.filter)
+            async for result in iter_results(filtered_config, command(), parsed_args):
+                writer.write(json.dumps({"result": result}, default=vars).encode() + b"\n")
+                await writer.drain()
+        except ConfigMismatchError as error:
+            logger.warning("request refused: %s", error)
+            writer.write(json.dumps({"error": str(error), "config": False}).encode() + b"\n")
+        except Exception as error:  # pylint: disable=W0718
+            logger.exception(error)
+            writer.write(json.dumps({"error": str(error)}).encode() + b"\n")
+        finally:
+            await writer.drain()
+            writer.close()
+
+
+async def request(
+    command: str, parsed_args: Namespace, config: Config, socket_path: Path = DAEMON_SOCKET_PATH
+) -> AsyncGenerator[ResultType, None]:
+    """Send command to daemon and yield results as soon as they are received.
+
+    Raises ConfigMismatchError if daemon was started with different configuration.
+    """
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    try:
+        message = {
+            "command": command,
+            "args": vars(parsed_args),
+            "config": get_config_digest(config),
+        }
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        while line := await reader.readline():
+            response: Dict[str, Any] = json.loads(line)
+            error: Optional[str] = response.get("error")
+            if error is not None and response.get("config") is False:
+                raise ConfigMismatchError(error)
+            if error is not None:
+                raise JujuSpellError(f"daemon failed with error: {error}")
+
+            yield response["result"]
+    finally:
+        writer.close()
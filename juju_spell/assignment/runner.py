@@ -2,23 +2,32 @@
 
 Provides different ways to run the Juju command:
 
-    - Batch: 20 commands in 5 parallel
-    - Parallel: 20 in parallel
+    - Batch: 20 commands in 5 parallel (waves of 5 controllers)
+    - Parallel: 20 in parallel (limited by max concurrency)
     - Serial: 20 commands in 1 parallel
+    - Risk: lowest risk controllers first, starting with 1 canary
 """
+import asyncio
 import logging
 from argparse import Namespace
+from collections import defaultdict
 from dataclasses import asdict
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Set, Tuple
 
-from juju_spell.commands.base import BaseJujuCommand, Result
-from juju_spell.config import Config, Controller
+from juju_spell.cache import flush_cache
+from juju_spell.commands.base import BaseJujuCommand, Result, wait_background_tasks
+from juju_spell.config import RISK_LEVELS, Config, Controller
 from juju_spell.connections import connect_manager, get_controller
+from juju_spell.exceptions import JujuSpellError
 
 logger = logging.getLogger(__name__)
 
 ResultType = Dict[str, Dict[str, Any]]
 ResultsType = List[ResultType]
+# result together with index of controller in config
+IndexedResultType = Tuple[int, ResultType]
+IndexedResultsType = AsyncGenerator[IndexedResultType, None]
 
 
 def get_result(controller_config: Controller, output: Result) -> ResultType:
@@ -33,14 +42,198 @@ def get_result(controller_config: Controller, output: Result) -> ResultType:
     }
 
 
+async def run_controller(
+    controller_config: Controller, command: BaseJujuCommand, parsed_args: Namespace
+) -> ResultType:
+    """Run controller target command on single controller.
+
+    Errors of connection to controller or of pre-check are returned as failed
+    result, so single controller does not stop other controllers.
+
+    Parameters:
+        controller_config(Controller): controller configuration
+        command(BaseJujuCommand): command to run
+        parsed_args(Namespace): Namespace from CLI
+    Returns:
+        result(Dict): Controller dict with result.
+    """
+    try:
+        controller = await get_controller(controller_config)
+        # NOTE: copy of parsed_args, because they are shared between controllers
+        command_kwargs = {**vars(parsed_args), "controller_config": controller_config}
+
+        pre_check = await command.pre_check(controller=controller, **command_kwargs)
+
+        if pre_check is not None:
+            output = pre_check
+        elif parsed_args.dry_run:
+            output = await command.dry_run(controller=controller, **command_kwargs)
+        else:
+            output = await command.run(controller=controller, **command_kwargs)
+    except Exception as error:  # pylint: disable=W0718
+        logger.error("%s failed: %s", controller_config.uuid, error)
+        output = Result(False, error=error)
+
+    return get_result(controller_config, output)
+
+
+def _get_skipped_result(controller_config: Controller, reason: str) -> ResultType:
+    """Get result for controller, which was not run."""
+    return get_result(controller_config, Result(False, error=JujuSpellError(f"skipped, {reason}")))
+
+
+async def _collect(results: AsyncIterator[IndexedResultType]) -> ResultsType:
+    """Collect results in the same order as controllers are defined in config."""
+    collected = [indexed_result async for indexed_result in results]
+    return [result for _, result in sorted(collected, key=itemgetter(0))]
+
+
+async def _iter_concurrently(
+    controllers: List[Tuple[int, Controller]],
+    command: BaseJujuCommand,
+    parsed_args: Namespace,
+    max_concurrency: int,
+) -> IndexedResultsType:
+    """Run controller target command on controllers concurrently.
+
+    The results are yielded as soon as they are completed.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_controller(index: int, controller_config: Controller) -> IndexedResultType:
+        async with semaphore:
+            return index, await run_controller(controller_config, command, parsed_args)
+
+    tasks = [
+        asyncio.ensure_future(_run_controller(index, controller_config))
+        for index, controller_config in controllers
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _iter_serial(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> IndexedResultsType:
+    """Run controller target command serially and yield results."""
+    for index, controller_config in enumerate(config.controllers):
+        logger.debug("%s running in serial", controller_config.uuid)
+        yield index, await run_controller(controller_config, command, parsed_args)
+
+
+async def _iter_parallel(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> IndexedResultsType:
+    """Run controller target command in parallel and yield results."""
+    logger.debug("running %d controllers in parallel", len(config.controllers))
+    async for indexed_result in _iter_concurrently(
+        list(enumerate(config.controllers)), command, parsed_args, parsed_args.max_concurrency
+    ):
+        yield indexed_result
+
+
+async def _iter_batch(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> IndexedResultsType:
+    """Run controller target command in batches and yield results."""
+    batch_size = parsed_args.batch_size
+    controllers = list(enumerate(config.controllers))
+    failed = total = 0
+    for position in range(0, len(controllers), batch_size):
+        if position > 0 and parsed_args.batch_interval > 0:
+            logger.debug("waiting %.1fs before next batch", parsed_args.batch_interval)
+            await asyncio.sleep(parsed_args.batch_interval)
+
+        batch = controllers[position : position + batch_size]  # noqa: E203
+        logger.debug("running batch of %d controllers", len(batch))
+        async for index, result in _iter_concurrently(batch, command, parsed_args, batch_size):
+            failed += not result["success"]
+            total += 1
+            yield index, result
+
+        failure_ratio = failed / total
+        if failure_ratio > parsed_args.batch_failure_ratio:
+            logger.warning(
+                "stop running batches, failure ratio %.2f exceeds %.2f",
+                failure_ratio,
+                parsed_args.batch_failure_ratio,
+            )
+            reason = (
+                f"failure ratio {failure_ratio:.2f} exceeded "
+                f"{parsed_args.batch_failure_ratio:.2f}"
+            )
+            for index, controller_config in controllers[position + batch_size :]:  # noqa: E203
+                yield index, _get_skipped_result(controller_config, reason)
+
+            break
+
+
+def get_risk_concurrency(risk: int, max_concurrency: int) -> int:
+    """Get concurrency for controllers with risk level.
+
+    Controllers with the lowest risk are run with max concurrency and controllers
+    with the highest risk are run serially.
+    """
+    lowest, highest = RISK_LEVELS[0], RISK_LEVELS[-1]
+    scale = (highest - risk) / (highest - lowest)
+    return max(1, round(max_concurrency * scale))
+
+
+async def _iter_risk(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> IndexedResultsType:
+    """Run controller target command ordered by controller risk and yield results."""
+    tiers: Dict[int, List[Tuple[int, Controller]]] = defaultdict(list)
+    for index, controller_config in enumerate(config.controllers):
+        tiers[controller_config.risk].append((index, controller_config))
+
+    done: Set[int] = set()
+    wave_size, failed = 1, False
+    for risk in sorted(tiers):
+        controllers = tiers[risk]
+        concurrency = get_risk_concurrency(risk, parsed_args.max_concurrency)
+        wave_size = min(wave_size, concurrency)
+        position = 0
+        while position < len(controllers) and not failed:
+            wave = controllers[position : position + wave_size]  # noqa: E203
+            logger.debug("running %d controllers with risk %d", len(wave), risk)
+            async for index, result in _iter_concurrently(wave, command, parsed_args, wave_size):
+                failed = failed or not result["success"]
+                done.add(index)
+                yield index, result
+
+            position += len(wave)
+            wave_size = min(wave_size * 2, concurrency)
+
+    if failed:
+        logger.warning("stop running controllers, because some controller failed")
+
+    for index, controller_config in enumerate(config.controllers):
+        if index not in done:
+            yield index, _get_skipped_result(controller_config, "previous controller failed")
+
+
 async def run_parallel(
     config: Config, command: BaseJujuCommand, parsed_args: Namespace
 ) -> ResultsType:
     """Run controller target command in parallel.
 
-    THIS FUNCTION IS NOT YET SUPPORTED.
+    The number of controllers processed at the same time is limited by
+    `parsed_args.max_concurrency`. The results are returned in the same order
+    as controllers are defined in config.
+
+    Parameters:
+        config(Config): application configuration
+        command(BaseJujuCommand): command to run
+        parsed_args(Namespace): Namespace from CLI
+    Returns:
+        results(Dict): Controller dict with result.
     """
-    raise NotImplementedError("running in parallel is not yet supported")
+    return await _collect(_iter_parallel(config, command, parsed_args))
 
 
 async def run_serial(
@@ -55,36 +248,100 @@ async def run_serial(
     Returns:
         results(Dict): Controller dict with result.
     """
-    results: ResultsType = []
-    for controller_config in config.controllers:
-        controller = await get_controller(controller_config)
-        logger.debug("%s running in serial", controller.controller_uuid)
-        command_kwargs = vars(parsed_args)
-        command_kwargs["controller_config"] = controller_config
+    return await _collect(_iter_serial(config, command, parsed_args))
 
-        pre_check = await command.pre_check(controller=controller, **command_kwargs)
 
-        if pre_check is not None:
-            output = pre_check
-        elif parsed_args.dry_run:
-            output = await command.dry_run(controller=controller, **command_kwargs)
-        else:
-            output = await command.run(controller=controller, **command_kwargs)
+async def run_batch(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> ResultsType:
+    """Run controller target command in batches.
 
-        result = get_result(controller_config, output)
-        results.append(result)
+    Controllers are split into waves of `parsed_args.batch_size` controllers,
+    which run in parallel. Between waves the runner waits
+    `parsed_args.batch_interval` seconds. If the ratio of failed results exceeds
+    `parsed_args.batch_failure_ratio`, no more waves are scheduled and remaining
+    controllers are marked as skipped.
 
-    return results
+    Parameters:
+        config(Config): application configuration
+        command(BaseJujuCommand): command to run
+        parsed_args(Namespace): Namespace from CLI
+    Returns:
+        results(Dict): Controller dict with result.
+    """
+    return await _collect(_iter_batch(config, command, parsed_args))
 
 
-async def run_batch(
+async def run_risk(
     config: Config, command: BaseJujuCommand, parsed_args: Namespace
 ) -> ResultsType:
-    """Run controller target command in batches.
+    """Run controller target command ordered by controller risk.
+
+    Controllers are grouped by risk level and groups are run from the lowest risk.
+    The first controller is run alone as a canary and the size of next wave is
+    doubled after every successful wave, up to the concurrency of risk level (see
+    `get_risk_concurrency`). Once any controller fails, no more waves are scheduled
+    and remaining controllers are marked as skipped. The results are returned in
+    the same order as controllers are defined in config.
 
-    THIS FUNCTION IS NOT YET SUPPORTED.
+    Parameters:
+        config(Config): application configuration
+        command(BaseJujuCommand): command to run
+        parsed_args(Namespace): Namespace from CLI
+    Returns:
+        results(Dict): Controller dict with result.
+    """
+    return await _collect(_iter_risk(config, command, parsed_args))
+
+
+RUN_TYPES = {
+    "parallel": _iter_parallel,
+    "batch": _iter_batch,
+    "risk": _iter_risk,
+    "serial": _iter_serial,
+}
+
+
+async def iter_results(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> AsyncGenerator[ResultType, None]:
+    """Run command on controllers and yield results as soon as they are completed.
+
+    Contrary to `stream`, the connections to controllers are kept open. Postponed
+    cache writes are flushed at the end.
+    """
+    run_type = parsed_args.run_type
+    logger.info("streaming with run_type: %s", run_type)
+    try:
+        async for _, result in RUN_TYPES.get(run_type, _iter_serial)(config, command, parsed_args):
+            yield result
+    finally:
+        flush_cache()
+
+
+async def _finish() -> None:
+    """Wait for background tasks of commands, flush cache and close connections."""
+    try:
+        await wait_background_tasks()
+    finally:
+        flush_cache()
+        await connect_manager.clean()
+
+
+async def stream(
+    config: Config, command: BaseJujuCommand, parsed_args: Namespace
+) -> AsyncGenerator[ResultType, None]:
+    """Run command on controllers and yield results as soon as they are completed.
+
+    Contrary to `run`, the results are not kept in memory and they are not
+    ordered as controllers are defined in config. Background tasks of commands are
+    awaited before connections are closed.
     """
-    raise NotImplementedError("running in batches is not yet supported")
+    try:
+        async for result in iter_results(config, command, parsed_args):
+            yield result
+    finally:
+        await _finish()
 
 
 async def run(config: Config, command: BaseJujuCommand, parsed_args: Namespace) -> ResultsType:
@@ -96,7 +353,9 @@ async def run(config: Config, command: BaseJujuCommand, parsed_args: Namespace)
             return await run_parallel(config, command, parsed_args)
         if run_type == "batch":
             return await run_batch(config, command, parsed_args)
+        if run_type == "risk":
+            return await run_risk(config, command, parsed_args)
 
         return await run_serial(config, command, parsed_args)
     finally:
-        await connect_manager.clean()
+        await _finish()
@@ -17,12 +17,17 @@
 """Data structures to offer caching cache to juju-spell."""
 from __future__ import annotations
 
+import copy
 import dataclasses
+import json
 import logging
+import sqlite3
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from time import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import yaml
 
@@ -32,35 +37,92 @@ from juju_spell.settings import DEFAULT_CACHE_DIR
 logger = logging.getLogger(__name__)
 
 DEFAULT_TTL_RULE = 3600  # in seconds
-DEFAULT_CACHE_BACKEND = "FileCache"
-AVALIABLE_BACKENDS = {DEFAULT_CACHE_BACKEND}
+DEFAULT_SOFT_TTL_RULE = 300  # in seconds
+FILE_CACHE_BACKEND = "FileCache"
+SQLITE_CACHE_BACKEND = "SQLiteCache"
+DEFAULT_CACHE_BACKEND = SQLITE_CACHE_BACKEND
+AVALIABLE_BACKENDS = {FILE_CACHE_BACKEND, SQLITE_CACHE_BACKEND}
+SQLITE_CACHE_FILE = "cache.sqlite3"
+DEFAULT_MEMORY_CACHE_ITEMS = 1024
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024**2
 
 
-def use_cache(backend: str = DEFAULT_CACHE_BACKEND) -> "Cache":
-    """Get the cache class based on the caching backend."""
+def use_cache(
+    backend: str = DEFAULT_CACHE_BACKEND,
+    memory: bool = True,
+    write_behind: bool = False,
+    policy: Optional["CachePolicy"] = None,
+    namespace: Optional[str] = None,
+) -> "Cache":
+    """Get the cache class based on the caching backend.
+
+    With memory, the cache is wrapped in LRUCache, which shares in-memory store with
+    all other caches of the same backend in this process. The keys evicted from the
+    backend are removed from in-memory store too. With write_behind, the
+    writes to the backend are postponed until `flush_cache` is called. The namespace
+    is prefix of keys, whose number is limited by `max_entries` of policy.
+    """
     if backend not in AVALIABLE_BACKENDS:
         raise JujuSpellError(f"Supported cache backends are {AVALIABLE_BACKENDS}")
-    return FileCache()
+    cache_class = SQLiteCache if backend == SQLITE_CACHE_BACKEND else FileCache
+    cache: Cache = cache_class(policy, namespace)
+    if not memory:
+        return cache
 
+    store = _memory_stores.setdefault(backend, MemoryStore())
+    return LRUCache(cache, store, write_behind)
 
-@dataclasses.dataclass
+
+def flush_cache() -> None:
+    """Write all postponed writes to cache backends."""
+    write_behind_queue.flush()
+
+
+@dataclasses.dataclass(frozen=True)
 class CachePolicy:
-    """A class for cache policy."""
+    """A class for cache policy.
+
+    The data older than ttl are expired and they are not returned from cache. The
+    data older than soft_ttl are stale, they are returned, but they should be
+    refreshed. If max_entries is set, only that many of the most recently written
+    keys are kept in namespace of cache.
+    """
 
     ttl: int = DEFAULT_TTL_RULE
+    soft_ttl: int = DEFAULT_SOFT_TTL_RULE
+    max_entries: Optional[int] = None
+
+    def is_stale(self, timestamp: float) -> bool:
+        """Check if data with timestamp are stale."""
+        return timestamp + self.soft_ttl < time()
 
 
 class Cache(metaclass=ABCMeta):
-    """A cache for command's output with cache policy."""
+    """A cache for command's output with cache policy.
+
+    The on_evict callback is called with keys evicted over max_entries of namespace.
+    """
 
-    policy: CachePolicy = CachePolicy()
     cache_directory: Path = DEFAULT_CACHE_DIR
 
-    def __init__(self) -> None:
+    def __init__(
+        self, policy: Optional[CachePolicy] = None, namespace: Optional[str] = None
+    ) -> None:
         """Initialize the cache."""
+        self.policy = policy or CachePolicy()
+        self.namespace = namespace
+        self.on_evict: Optional[Callable[[List[str]], None]] = None
         if not self.cache_directory.exists():
             self.cache_directory.mkdir()
 
+    @property
+    def prefix(self) -> Optional[str]:
+        """Get prefix of keys in namespace, which has limited number of keys."""
+        if self.namespace is None or self.policy.max_entries is None:
+            return None
+
+        return f"{self.namespace}_"
+
     @abstractmethod
     def get(self, key: str) -> Any:
         """Get the data from the cache."""
@@ -73,6 +135,27 @@ class Cache(metaclass=ABCMeta):
     def delete(self, key: str) -> None:
         """Delete the data from the cache."""
 
+    def _evicted(self, keys: List[str]) -> None:
+        """Log evicted keys and pass them to on_evict callback."""
+        for key in keys:
+            logger.debug("%s evicted from cache namespace %s", key, self.namespace)
+
+        if keys and self.on_evict is not None:
+            self.on_evict(keys)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the data of multiple keys from the cache.
+
+        Keys, which are not in cache or are expired, are not returned.
+        """
+        contexts = {key: self.get(key) for key in keys}
+        return {key: context for key, context in contexts.items() if context is not None}
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Add or update the data of multiple keys in the cache."""
+        for key, value in items.items():
+            self.put(key, value)
+
 
 @dataclasses.dataclass
 class FileCacheContext:
@@ -98,11 +181,31 @@ class FileCache(Cache):
     def put(self, key: str, value: Dict[str, Any]) -> None:
         """Add or update the data in the file cache."""
         self._commit(key, FileCacheContext(timestamp=time(), data=value))
+        self._evict()
 
     def delete(self, key: str) -> None:
         """Delete the data from the file cache."""
         self._remove(key)
 
+    def _evict(self) -> None:
+        """Remove the least recently written files over max_entries of namespace."""
+        prefix = self.prefix
+        if prefix is None:
+            return
+
+        try:
+            paths = [
+                path for path in self.cache_directory.iterdir() if path.name.startswith(prefix)
+            ]
+            paths.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+            evicted = paths[self.policy.max_entries :]  # noqa: E203
+            for path in evicted:
+                path.unlink(missing_ok=True)
+        except OSError as error:
+            raise JujuSpellError(f"{str(error)}.") from error
+
+        self._evicted([path.name for path in evicted])
+
     def _check_expired(self, context: FileCacheContext) -> bool:
         """Check if the cache is expired or not."""
         return context.timestamp + self.policy.ttl < time()
@@ -143,3 +246,322 @@ class FileCache(Cache):
             raise JujuSpellError(f"permission denied to delete file `{cache_name}`.") from error
         except Exception as error:
             raise JujuSpellError(f"{str(error)}.") from error
+
+
+class SQLiteCache(Cache):
+    """Store the data in single SQLite database.
+
+    Values are stored as JSON, which is faster to load than YAML, and looked up by
+    indexed key. Multiple values can be read or written in single transaction with
+    `get_many` and `put_many`.
+    """
+
+    def __init__(
+        self, policy: Optional[CachePolicy] = None, namespace: Optional[str] = None
+    ) -> None:
+        """Initialize the cache."""
+        super().__init__(policy, namespace)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connect to the database and create cache table."""
+        if self._connection is None:
+            database = self.cache_directory / SQLITE_CACHE_FILE
+            try:
+                self._connection = sqlite3.connect(database)
+                with self._connection:
+                    self._connection.execute(
+                        "CREATE TABLE IF NOT EXISTS cache "
+                        "(key TEXT PRIMARY KEY, timestamp REAL NOT NULL, data BLOB NOT NULL)"
+                    )
+                    self._connection.execute(
+                        "CREATE INDEX IF NOT EXISTS cache_timestamp ON cache (timestamp)"
+                    )
+            except sqlite3.Error as error:
+                raise JujuSpellError(f"unable to open cache database `{database}`.") from error
+
+        return self._connection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the data from the database."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the data of multiple keys from the database.
+
+        Keys, which are not in cache or are expired, are not returned.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(keys))
+        with self._transaction() as connection:
+            connection.execute(
+                f"DELETE FROM cache WHERE key IN ({placeholders}) AND timestamp < ?",
+                [*keys, time() - self.policy.ttl],
+            )
+            rows = connection.execute(
+                f"SELECT key, timestamp, data FROM cache WHERE key IN ({placeholders})", keys
+            ).fetchall()
+
+        return {
+            key: dataclasses.asdict(FileCacheContext(timestamp=timestamp, data=json.loads(data)))
+            for key, timestamp, data in rows
+        }
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Add or update the data in the database."""
+        self.put_many({key: value})
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Add or update the data of multiple keys in single transaction."""
+        timestamp = time()
+        rows: List[Tuple[str, float, bytes]] = [
+            (key, timestamp, json.dumps(value, separators=(",", ":")).encode())
+            for key, value in items.items()
+        ]
+        evicted: List[str] = []
+        with self._transaction() as connection:
+            connection.executemany(
+                "REPLACE INTO cache (key, timestamp, data) VALUES (?, ?, ?)", rows
+            )
+            prefix = self.prefix
+            if prefix is not None:
+                evicted = [
+                    key
+                    for key, in connection.execute(
+                        "SELECT key FROM cache WHERE substr(key, 1, ?) = ? "
+                        "ORDER BY timestamp DESC LIMIT -1 OFFSET ?",
+                        (len(prefix), prefix, self.policy.max_entries),
+                    )
+                ]
+                connection.executemany(
+                    "DELETE FROM cache WHERE key = ?", [(key,) for key in evicted]
+                )
+
+        self._evicted(evicted)
+
+    def delete(self, key: str) -> None:
+        """Delete the data from the database."""
+        with self._transaction() as connection:
+            cursor = connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+        if cursor.rowcount == 0:
+            raise JujuSpellError(f"`{key}` does not exists.")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in transaction and raise errors of database as JujuSpellError."""
+        try:
+            with self.connection as connection:
+                yield connection
+        except sqlite3.Error as error:
+            raise JujuSpellError(f"{str(error)}.") from error
+
+
+class MemoryStore:
+    """Bounded in-memory store of cache contexts.
+
+    When there are more than max_items contexts or their size exceeds max_bytes,
+    the expired contexts are evicted first and then the least recently used ones.
+    """
+
+    def __init__(
+        self,
+        max_items: int = DEFAULT_MEMORY_CACHE_ITEMS,
+        max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES,
+    ) -> None:
+        """Initialize empty store."""
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, Tuple[Dict[str, Any], int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get number of contexts in store."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get copy of context and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: str, context: Dict[str, Any], expired_before: float) -> None:
+        """Add copy of context and evict other contexts if store is full.
+
+        Contexts with timestamp older than expired_before are evicted first.
+        """
+        self.remove(key)
+        size = len(json.dumps(context, default=str))
+        if size > self.max_bytes:
+            logger.debug("%s is too big to be stored in memory", key)
+            return
+
+        self._entries[key] = (copy.deepcopy(context), size)
+        self.size += size
+        if self._is_full():
+            for expired_key, (expired, _) in list(self._entries.items()):
+                if expired["timestamp"] < expired_before:
+                    self.remove(expired_key)
+
+        while self._is_full():
+            self.remove(next(iter(self._entries)))
+
+    def remove(self, key: str) -> None:
+        """Remove context from store."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def _is_full(self) -> bool:
+        """Check if store exceeds its limits."""
+        return len(self._entries) > self.max_items or self.size > self.max_bytes
+
+
+_memory_stores: Dict[str, MemoryStore] = {}
+BackendId = Tuple[str, Path, Optional[str], CachePolicy]
+
+
+class WriteBehindQueue:
+    """Queue of postponed writes to persistent caches.
+
+    Writes of the same key are coalesced and all writes to single backend with the
+    same namespace and policy are flushed with single `put_many` call.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty queue."""
+        self._pending: Dict[BackendId, Tuple[Cache, Dict[str, Dict[str, Any]]]] = {}
+
+    def __len__(self) -> int:
+        """Get number of postponed writes."""
+        return sum(len(items) for _, items in self._pending.values())
+
+    @staticmethod
+    def _get_id(backend: Cache) -> BackendId:
+        """Get identifier of backend storage, namespace and policy."""
+        return type(backend).__name__, backend.cache_directory, backend.namespace, backend.policy
+
+    def put(self, backend: Cache, key: str, value: Dict[str, Any]) -> None:
+        """Postpone write of value to backend."""
+        _, items = self._pending.setdefault(self._get_id(backend), (backend, {}))
+        items[key] = value
+
+    def remove(self, backend: Cache, key: str) -> bool:
+        """Remove postponed write from queue and return whether it was there."""
+        _, items = self._pending.get(self._get_id(backend), (backend, {}))
+        return items.pop(key, None) is not None
+
+    def flush(self) -> None:
+        """Write all postponed writes to backends.
+
+        Errors are only logged, since the data are still in memory.
+        """
+        pending, self._pending = self._pending, {}
+        for backend, items in pending.values():
+            if not items:
+                continue
+
+            logger.debug("flushing %d writes to %s", len(items), type(backend).__name__)
+            try:
+                backend.put_many(items)
+            except JujuSpellError as error:
+                logger.warning("failed to write to cache: %s", error)
+
+
+write_behind_queue = WriteBehindQueue()
+
+
+class LRUCache(Cache):
+    """In-memory cache in front of persistent cache.
+
+    The data are written to both memory and persistent cache, and read from memory,
+    unless they are not there or they are expired. The policy is shared with the
+    persistent cache. With write_behind, the writes to persistent cache are queued
+    and written by `flush_cache`. The keys evicted by persistent cache are removed
+    from memory, so they are not returned after they were evicted.
+    """
+
+    def __init__(self, backend: Cache, store: MemoryStore, write_behind: bool = False) -> None:
+        """Initialize the cache."""
+        self.backend = backend
+        super().__init__(backend.policy, backend.namespace)
+        self.store = store
+        self.write_behind = write_behind
+        backend.on_evict = self._remove_evicted
+
+    @property
+    def policy(self) -> CachePolicy:
+        """Get policy of persistent cache."""
+        return self.backend.policy
+
+    @policy.setter
+    def policy(self, policy: CachePolicy) -> None:
+        """Set policy of persistent cache."""
+        self.backend.policy = policy
+
+    def _remove_evicted(self, keys: List[str]) -> None:
+        """Remove keys evicted by persistent cache from memory."""
+        for key in keys:
+            self.store.remove(key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the data from memory or from persistent cache."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the data of multiple keys from memory or from persistent cache.
+
+        Keys missing in memory are read from persistent cache with single call.
+        """
+        expired_before = time() - self.policy.ttl
+        contexts, missing = {}, []
+        for key in keys:
+            context = self.store.get(key)
+            if context is not None and context["timestamp"] >= expired_before:
+                contexts[key] = context
+            else:
+                self.store.remove(key)
+                missing.append(key)
+
+        if missing:
+            loaded = self.backend.get_many(missing)
+            for key, context in loaded.items():
+                self.store.put(key, context, expired_before)
+
+            contexts.update(loaded)
+
+        return contexts
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Add or update the data in persistent cache and in memory."""
+        self.put_many({key: value})
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Add or update the data of multiple keys in persistent cache and in memory."""
+        if self.write_behind:
+            for key, value in items.items():
+                write_behind_queue.put(self.backend, key, value)
+        else:
+            self.backend.put_many(items)
+
+        timestamp = time()
+        expired_before = timestamp - self.policy.ttl
+        for key, value in items.items():
+            self.store.put(key, {"timestamp": timestamp, "data": value}, expired_before)
+
+    def delete(self, key: str) -> None:
+        """Delete the data from memory and persistent cache."""
+        self.store.remove(key)
+        queued = write_behind_queue.remove(self.backend, key)
+        try:
+            self.backend.delete(key)
+        except JujuSpellError:
+            if not queued:
+                raise
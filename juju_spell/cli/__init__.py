@@ -22,6 +22,7 @@ from .grant import GrantCMD
 from .list_models import ListModelsCMD
 from .ping import PingCMD
 from .remove_user import RemoveUserCMD
+from .serve import ServeCMD
 from .show_controller import ShowControllerInformationCMD
 from .status import StatusCMD
 from .update_packages import UpdatePackages
@@ -37,4 +38,5 @@ __all__ = [
     "UpdatePackages",
     "ListModelsCMD",
     "ConfigCMD",
+    "ServeCMD",
 ]
@@ -20,17 +20,31 @@ import asyncio
 import json
 import os
 from abc import ABCMeta, abstractmethod
-from typing import Any, Optional, Type
+from typing import Any, List, Optional, Type
 
 from craft_cli import BaseCommand, emit
 from craft_cli.dispatcher import _CustomArgumentParser
 
-from juju_spell.assignment.runner import run
-from juju_spell.cli.utils import confirm, parse_comma_separated_str, parse_filter
+from juju_spell.assignment.daemon import ConfigMismatchError, is_daemon_running, request
+from juju_spell.assignment.runner import run, stream
+from juju_spell.cli.utils import (
+    confirm,
+    parse_comma_separated_str,
+    parse_filter,
+    parse_non_negative_float,
+    parse_positive_int,
+    parse_ratio,
+)
 from juju_spell.commands.base import BaseJujuCommand
 from juju_spell.config import Config
 from juju_spell.exceptions import JujuSpellError
 from juju_spell.filter import get_filtered_config
+from juju_spell.settings import (
+    DEFAULT_BATCH_FAILURE_RATIO,
+    DEFAULT_BATCH_INTERVAL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+)
 
 
 class BaseCMD(BaseCommand, metaclass=ABCMeta):
@@ -46,14 +60,19 @@ class BaseCMD(BaseCommand, metaclass=ABCMeta):
         """Execute CLI command.
 
         **This function should not be changed.**
+
+        The output returned by `execute_cli` is formatted and printed. None is not
+        printed, it means that the command already printed its output, e.g. results
+        streamed as ndjson, or it has no output.
         """
         try:
             self.before(parsed_args)
             emit.trace(f"function 'before' was run for {self.name} command")
             retval = self.execute_cli(parsed_args)
             emit.trace(f"raw output of {self.name} command: {retval}")
-            message = self.format_output(retval)
-            emit.message(message)  # print the output
+            if retval is not None:
+                message = self.format_output(retval)
+                emit.message(message)  # print the output
             self.after(parsed_args)
             emit.trace(f"function 'after' was run for {self.name} command")
             return 0
@@ -73,7 +92,10 @@ class BaseCMD(BaseCommand, metaclass=ABCMeta):
 
     @abstractmethod
     def execute_cli(self, parsed_args: argparse.Namespace) -> Any:  # pragma: no cover
-        """Abstract function need to be defined for each JujuSpell CLI command."""
+        """Abstract function need to be defined for each JujuSpell CLI command.
+
+        Returns output to be printed or None if there is nothing more to print.
+        """
 
     def before(self, parsed_args: argparse.Namespace) -> None:  # pragma: no cover
         """Run before execution."""
@@ -110,9 +132,9 @@ class BaseJujuCMD(BaseCMD, metaclass=ABCMeta):
         parser.add_argument(
             "--run-type",
             type=str,
-            choices=["parallel", "batch", "serial"],
+            choices=["parallel", "batch", "risk", "serial"],
             default="serial",
-            help="parallel, batch or serial",
+            help="parallel, batch, risk or serial",
         )
         parser.add_argument(
             "--filter",
@@ -129,6 +151,37 @@ class BaseJujuCMD(BaseCMD, metaclass=ABCMeta):
             type=parse_comma_separated_str,
             help="model filter",
         )
+        parser.add_argument(
+            "--max-concurrency",
+            type=parse_positive_int,
+            default=DEFAULT_MAX_CONCURRENCY,
+            help="Maximum number of controllers processed at once with parallel run-type.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=parse_positive_int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of controllers in single batch with batch run-type.",
+        )
+        parser.add_argument(
+            "--batch-interval",
+            type=parse_non_negative_float,
+            default=DEFAULT_BATCH_INTERVAL,
+            help="Seconds to wait between batches with batch run-type.",
+        )
+        parser.add_argument(
+            "--batch-failure-ratio",
+            type=parse_ratio,
+            default=DEFAULT_BATCH_FAILURE_RATIO,
+            help="Stop next batches when ratio of failed controllers exceeds this value.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            choices=["json", "ndjson"],
+            default="json",
+            help="json output after all controllers or ndjson streamed per controller",
+        )
 
     def execute_cli(self, parsed_args: argparse.Namespace) -> Any:
         """Execute Juju Commands."""
@@ -137,14 +190,57 @@ class BaseJujuCMD(BaseCMD, metaclass=ABCMeta):
 
         filtered_config = get_filtered_config(self.config, parsed_args.filter)
         loop = asyncio.get_event_loop()
+        if getattr(parsed_args, "output", "json") == "ndjson":
+            loop.run_until_complete(self.stream_output(filtered_config, parsed_args))
+            return None
+
+        if getattr(parsed_args, "swr", False):
+            # json output is printed only after background refresh is finished
+            emit.progress(
+                "--swr without daemon requires ndjson output, it will be ignored", permanent=True
+            )
+            parsed_args.swr = False
+
         task = loop.create_task(run(filtered_config, self.command(), parsed_args))
         loop.run_until_complete(asyncio.gather(task))
         return task.result()
 
+    async def stream_output(self, config: Config, parsed_args: argparse.Namespace) -> None:
+        """Print result of each controller as single JSON line once it's completed."""
+        async for result in stream(config, self.command(), parsed_args):
+            emit.message(json.dumps(result, default=vars))
+
 
 class JujuReadCMD(BaseJujuCMD, metaclass=ABCMeta):
     """Base CLI command for handling Juju commands with read access."""
 
+    def execute_cli(self, parsed_args: argparse.Namespace) -> Any:
+        """Execute Juju Commands with daemon if it's running."""
+        if is_daemon_running():
+            loop = asyncio.get_event_loop()
+            try:
+                return loop.run_until_complete(self.execute_daemon(parsed_args))
+            except (ConnectionRefusedError, FileNotFoundError):
+                emit.debug("daemon is not accessible, command will be run without it")
+            except ConfigMismatchError:
+                emit.debug("daemon uses different config, command will be run without it")
+
+        return super().execute_cli(parsed_args)
+
+    async def execute_daemon(self, parsed_args: argparse.Namespace) -> Optional[List[Any]]:
+        """Send Juju command to daemon."""
+        assert self.name is not None, "command without name can not be sent to daemon"
+        emit.debug(f"sending {self.name} command to daemon")
+        ndjson = getattr(parsed_args, "output", "json") == "ndjson"
+        results = []
+        async for result in request(self.name, parsed_args, self.config):
+            if ndjson:
+                emit.message(json.dumps(result))
+            else:
+                results.append(result)
+
+        return None if ndjson else results
+
 
 class JujuWriteCMD(BaseJujuCMD, metaclass=ABCMeta):
     """Base CLI command for handling Juju commands with write access."""
@@ -25,7 +25,9 @@ from craft_cli.dispatcher import _CustomArgumentParser
 
 from juju_spell import utils
 from juju_spell.cli.base import JujuWriteCMD
+from juju_spell.cli.utils import parse_positive_int
 from juju_spell.commands.config import ApplicationConfig, ConfigCommand
+from juju_spell.settings import DEFAULT_APPLICATION_CONCURRENCY
 
 logger = logging.getLogger()
 
@@ -74,6 +76,10 @@ class ConfigCMD(JujuWriteCMD):
         ubuntu:
           hostname: "my-ubuntu-host"
 
+        The values are returned as they were set, with --verify option they are
+        read back from applications.
+        $ juju-spell config nova-compute --config-set "a=1" --verify
+
 
         """
     )
@@ -106,6 +112,18 @@ class ConfigCMD(JujuWriteCMD):
             required=False,
             help="The path to yaml-formatted application config.",
         )
+        parser.add_argument(
+            "--app-concurrency",
+            type=parse_positive_int,
+            default=DEFAULT_APPLICATION_CONCURRENCY,
+            help="Maximum number of applications of single model configured at once.",
+        )
+        parser.add_argument(
+            "--verify",
+            default=False,
+            action="store_true",
+            help="Read config back from applications after it was set.",
+        )
 
 
 def get_application_config(path: str) -> List[ApplicationConfig]:
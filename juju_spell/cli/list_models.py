@@ -69,6 +69,13 @@ class ListModelsCMD(JujuReadCMD):
         - model-a
         - model-b
         - model-c
+
+        With --swr option the cached models are returned immediately and models
+        cached for longer than 5 minutes are refreshed in background. Models cached
+        for longer than an hour are refreshed before they are returned. Without
+        daemon, it works only with ndjson output, which prints models before refresh
+        finishes, and it's ignored with json output.
+        $ juju-spell list-models --swr --output ndjson
         """
     )
     command = ListModelsCommand
@@ -81,6 +88,12 @@ class ListModelsCMD(JujuReadCMD):
             action="store_true",
             help="This will force refresh all models from the controllers.",
         )
+        parser.add_argument(
+            "--swr",
+            default=False,
+            action="store_true",
+            help="Return cached models and refresh stale models in background.",
+        )
 
     @staticmethod
     def format_output(retval: Any) -> str:
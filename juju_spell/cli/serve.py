@@ -0,0 +1,77 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2023 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""JujuSpell serve command."""
+import argparse
+import asyncio
+import contextlib
+import signal
+import textwrap
+from typing import Dict, Type
+
+from craft_cli.dispatcher import _CustomArgumentParser
+
+from juju_spell.assignment.daemon import Daemon
+from juju_spell.cli.base import BaseCMD, JujuReadCMD
+from juju_spell.commands.base import BaseJujuCommand
+
+
+def get_read_commands() -> Dict[str, Type[BaseJujuCommand]]:
+    """Get Juju commands of all read-only CLI commands, including indirect subclasses."""
+    commands = {}
+    classes = JujuReadCMD.__subclasses__()
+    while classes:
+        cmd = classes.pop()
+        classes.extend(cmd.__subclasses__())
+        if cmd.name is not None and getattr(cmd, "command", None) is not None:
+            commands[cmd.name] = cmd.command
+
+    return commands
+
+
+class ServeCMD(BaseCMD):
+    """JujuSpell serve command to run daemon with warm connections."""
+
+    name = "serve"
+    help_msg = "Run daemon keeping connections to controller(s) open"
+    overview = textwrap.dedent(
+        """
+        The serve command runs daemon, which keeps connections to controllers
+        open between invocations of read-only commands. When the daemon is
+        running, read-only commands are sent to it over local Unix socket
+        (path can be changed with JUJUSPELL_SOCKET environment variable).
+
+        The daemon uses configuration loaded when it was started. Commands with
+        different configuration, e.g. loaded with `--config`, are run without it.
+
+        Example:
+        $ juju-spell serve &
+        $ juju-spell status
+        """
+    )
+
+    def fill_parser(self, parser: _CustomArgumentParser) -> None:
+        """Serve command does not have any arguments."""
+
+    def execute_cli(self, parsed_args: argparse.Namespace) -> None:
+        """Run daemon until it's interrupted."""
+        daemon = Daemon(self.config, get_read_commands())
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(daemon.serve())
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, task.cancel)
+
+        with contextlib.suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
@@ -16,6 +16,7 @@
 """JujuSpell juju add user command."""
 import logging
 import os
+import re
 import textwrap
 from pathlib import Path
 from typing import List
@@ -24,7 +25,11 @@ from craft_cli.dispatcher import _CustomArgumentParser
 
 from juju_spell import utils
 from juju_spell.cli.base import JujuWriteCMD
+from juju_spell.cli.utils import parse_max_unavailable
 from juju_spell.commands.update_packages import (
+    DEFAULT_MAX_UNAVAILABLE,
+    DEFAULT_RAW_OUTPUT_MODE,
+    RAW_OUTPUT_MODES,
     Application,
     PackageToUpdate,
     UpdatePackagesCommand,
@@ -77,6 +82,25 @@ class UpdatePackages(JujuWriteCMD):
             help="patch file",
             required=True,
         )
+        parser.add_argument(
+            "--max-unavailable",
+            type=parse_max_unavailable,
+            default=DEFAULT_MAX_UNAVAILABLE,
+            help="Number or percentage of units of application updated at the same time.",
+        )
+        parser.add_argument(
+            "--refresh",
+            default=False,
+            action="store_true",
+            help="Run dry-run on all units instead of using cached results.",
+        )
+        parser.add_argument(
+            "--raw-output",
+            type=str,
+            choices=RAW_OUTPUT_MODES,
+            default=DEFAULT_RAW_OUTPUT_MODE,
+            help="Store full, truncated or compressed raw output of units.",
+        )
 
 
 def get_patch_config(file_path: str) -> Updates:
@@ -92,6 +116,11 @@ def get_patch_config(file_path: str) -> Updates:
             )
             packages_to_update.append(package_to_update)
 
+        try:
+            re.compile(app["application"])
+        except re.error as error:
+            errors.append(f"application['{app['application']}'] is not valid expression: {error}")
+
         dist_upgrade = app.get("dist_upgrade", False)
         if not isinstance(dist_upgrade, bool):
             errors.append(f"application['{app['application']}'].dist_upgrade should be bool")
@@ -99,12 +128,11 @@ def get_patch_config(file_path: str) -> Updates:
             Application(
                 name_expr=app["application"],
                 dist_upgrade=dist_upgrade,
-                results=[],
-                packages_to_update=packages_to_update,
+                packages_to_update=tuple(packages_to_update),
             )
         )
 
     if len(errors) > 0:
         raise JujuSpellError(f"errors in input file:{os.linesep}{os.linesep.join(errors)}")
 
-    return Updates(applications=applications)
+    return Updates(applications=tuple(applications))
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Unilities."""
+import math
 import re
 import sys
 from argparse import ArgumentTypeError
@@ -96,3 +97,58 @@ def parse_filter(value: str) -> str:
         raise ArgumentTypeError(f"Argument filter format wrong: {value}")
 
     return value
+
+
+def parse_positive_int(value: str) -> int:
+    """Type check for positive integer arguments."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"Argument must be an integer: {value}") from None
+
+    if number <= 0:
+        raise ArgumentTypeError(f"Argument must be a positive integer: {value}")
+
+    return number
+
+
+def parse_non_negative_float(value: str) -> float:
+    """Type check for non-negative number arguments, e.g. seconds."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise ArgumentTypeError(f"Argument must be a number: {value}") from None
+
+    if not math.isfinite(number) or number < 0:
+        raise ArgumentTypeError(f"Argument must be a non-negative number: {value}")
+
+    return number
+
+
+def parse_ratio(value: str) -> float:
+    """Type check for ratio arguments in range [0, 1]."""
+    try:
+        ratio = float(value)
+    except ValueError:
+        raise ArgumentTypeError(f"Argument must be a number: {value}") from None
+
+    if not 0 <= ratio <= 1:
+        raise ArgumentTypeError(f"Argument must be in range [0, 1]: {value}")
+
+    return ratio
+
+
+def parse_max_unavailable(value: str) -> str:
+    """Type check for number of units or percentage of units, e.g. 2 or 25%."""
+    if value.endswith("%"):
+        try:
+            percentage = float(value[:-1])
+        except ValueError:
+            raise ArgumentTypeError(f"Argument must be a percentage: {value}") from None
+
+        if not 0 < percentage <= 100:
+            raise ArgumentTypeError(f"Argument must be in range (0%, 100%]: {value}")
+
+        return value
+
+    return str(parse_positive_int(value))
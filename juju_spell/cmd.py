@@ -51,6 +51,7 @@ def get_command_groups() -> List[CommandGroup]:
     command_groups = [
         CommandGroup("ReadOnly", ro_commands),
         CommandGroup("ReadWrite", rw_commands),
+        CommandGroup("Daemon", [cli.ServeCMD]),
     ]
 
     return command_groups
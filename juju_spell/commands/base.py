@@ -15,15 +15,37 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """JujuSpell base juju command."""
+import asyncio
 import dataclasses
 import logging
+import re
 from abc import ABCMeta, abstractmethod
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from typing import Any, AsyncGenerator, Coroutine, Dict, List, Optional, Tuple
 
+from juju import tag
+from juju.client import client
 from juju.controller import Controller
+from juju.errors import JujuError
 from juju.model import Model
 
+from juju_spell.cache import CachePolicy
 from juju_spell.exceptions import JujuSpellError
+from juju_spell.settings import (
+    DEFAULT_MODEL_ACCESS_BATCH_SIZE,
+    DEFAULT_MODEL_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# tasks run in background by commands, see `BaseJujuCommand.run_in_background`
+_background_tasks: Dict[str, "asyncio.Task[Any]"] = {}
+
+
+async def wait_background_tasks() -> None:
+    """Wait for all tasks run in background by commands."""
+    while _background_tasks:
+        await asyncio.gather(*_background_tasks.values(), return_exceptions=True)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -43,6 +65,46 @@ class BaseJujuCommand(metaclass=ABCMeta):
         self.name = getattr(self.__class__, "__name__", "unknown")
         self.logger = logging.getLogger(self.name)
 
+    @property
+    def command_name(self) -> str:
+        """Get name of command used in CLI, e.g. `list-models` for ListModelsCommand."""
+        name = re.sub(r"Command$", "", self.name)
+        return re.sub(r"(?<!^)(?=[A-Z])", "-", name).lower()
+
+    def get_cache_policy(
+        self, cache_policies: Dict[str, CachePolicy], default: Optional[CachePolicy] = None
+    ) -> CachePolicy:
+        """Get cache policy of command from cache policies of controller configuration.
+
+        The policies are defined by name of command used in CLI. If there is no
+        policy for command, the default one is returned.
+        """
+        return cache_policies.get(self.command_name) or default or CachePolicy()
+
+    def run_in_background(
+        self, key: str, coroutine: Coroutine[Any, Any, Any]
+    ) -> "asyncio.Task[Any]":
+        """Run coroutine in background.
+
+        Only one task with the same key runs at the same time, so if such task is
+        already running, the coroutine is closed and the running task is returned.
+        Errors of the task are only logged. The runner waits for background tasks
+        before it closes connections to controllers.
+        """
+        if key in _background_tasks:
+            coroutine.close()
+            return _background_tasks[key]
+
+        async def _run() -> None:
+            try:
+                await coroutine
+            except Exception as error:  # pylint: disable=W0718
+                self.logger.warning("background task %s failed: %s", key, error)
+
+        task = _background_tasks[key] = asyncio.ensure_future(_run())
+        task.add_done_callback(lambda _: _background_tasks.pop(key, None))
+        return task
+
     async def get_filtered_model_names(
         self,
         controller: Controller,
@@ -62,23 +124,74 @@ class BaseJujuCommand(metaclass=ABCMeta):
             all_models = _apply_model_mappings(models, model_mappings)
         return all_models
 
+    async def get_filtered_model_uuids(
+        self,
+        controller: Controller,
+        model_mappings: Dict[str, List[str]],
+        models: Optional[List[str]] = None,
+    ) -> Dict[str, str]:
+        """Get filtered model names and their UUIDs without connecting to models.
+
+        The UUIDs are obtained from single listing of controller models. Model,
+        which is not found in the listing, is considered to be a model UUID.
+        """
+        model_names = await self.get_filtered_model_names(controller, model_mappings, models)
+        uuids = await controller.model_uuids()
+        return {model_name: uuids.get(model_name, model_name) for model_name in model_names}
+
     async def get_filtered_models(
         self,
         controller: Controller,
         model_mappings: Dict[str, List[str]],
         models: Optional[List[str]] = None,
+        max_concurrency: int = DEFAULT_MODEL_CONCURRENCY,
     ) -> AsyncGenerator[Tuple[str, Model], None]:
         """Get filtered models for controller.
 
         If models is None, then all models for controller will be returned.  If
         the model_mapping[model] exits for specific model it will be replaced
         by the list of values from model_mapping[model] from config.
+
+        Up to `max_concurrency` models are connected at the same time and they are
+        yielded as soon as they are connected, so the order of models is not kept.
+        Each model is disconnected after it was processed.
         """
         all_models = await self.get_filtered_model_names(controller, model_mappings, models=models)
-        for model_name in all_models:
-            model = await controller.get_model(model_name)
-            yield model_name, model
-            await model.disconnect()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        connected: Dict[int, Model] = {}  # models, which were not disconnected yet
+
+        async def _get_model(model_name: str) -> Tuple[str, Model]:
+            await semaphore.acquire()
+            try:
+                model = await controller.get_model(model_name)
+            except BaseException:
+                semaphore.release()
+                raise
+
+            connected[id(model)] = model
+            return model_name, model
+
+        async def _disconnect(model: Model) -> None:
+            connected.pop(id(model), None)
+            try:
+                await model.disconnect()
+            finally:
+                semaphore.release()
+
+        tasks = [asyncio.ensure_future(_get_model(model_name)) for model_name in all_models]
+        try:
+            for task in asyncio.as_completed(tasks):
+                model_name, model = await task
+                try:
+                    yield model_name, model
+                finally:
+                    await _disconnect(model)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            for model in list(connected.values()):
+                await _disconnect(model)
 
     # pylint: disable=W0613
     async def pre_check(self, controller: Controller, **kwargs: Any) -> Optional[Result]:
@@ -145,6 +258,58 @@ class BaseJujuCommand(metaclass=ABCMeta):
         """
 
 
+async def modify_models_access(
+    controller: Controller,
+    username: str,
+    model_uuids: List[str],
+    acl: str,
+    action: str,
+    batch_size: int = DEFAULT_MODEL_ACCESS_BATCH_SIZE,
+) -> Dict[str, str]:
+    """Grant or revoke user access to multiple models.
+
+    All changes are sent with ModifyModelAccess API call in batches of `batch_size`
+    changes, instead of single call for each model. The API call raises JujuError if
+    any change of batch failed, without telling which one, so changes of failed batch
+    are sent again one by one to find out failed models. A change applied by the failed
+    batch may then be reported by Juju as failed, e.g. user already has the access.
+    Args:
+        controller: juju controller
+        username: user, whose access is changed
+        model_uuids: UUIDs of models
+        acl: access control ('read', 'write' or 'admin')
+        action: 'grant' or 'revoke'
+        batch_size: maximum number of changes in single API call
+    Returns:
+        errors for models, which access was not changed
+    """
+    model_facade = client.ModelManagerFacade.from_connection(controller.connection())
+    user_tag = tag.user(username)
+    errors = {}
+    for position in range(0, len(model_uuids), batch_size):
+        batch = model_uuids[position : position + batch_size]  # noqa: E203
+        changes = [
+            client.ModifyModelAccess(acl, action, tag.model(model_uuid), user_tag)
+            for model_uuid in batch
+        ]
+        logger.debug("%s access %s for %d models of %s", action, acl, len(changes), username)
+        try:
+            await model_facade.ModifyModelAccess(changes=changes)
+        except JujuError as batch_error:
+            if len(changes) == 1:
+                errors[batch[0]] = "; ".join(batch_error.errors)
+                continue
+
+            logger.debug("%s access %s failed for batch: %s", action, acl, batch_error.message)
+            for model_uuid, change in zip(batch, changes):
+                try:
+                    await model_facade.ModifyModelAccess(changes=[change])
+                except JujuError as error:
+                    errors[model_uuid] = "; ".join(error.errors)
+
+    return errors
+
+
 def _apply_model_mappings(
     models: List[str],
     model_mappings: Optional[Dict[str, List[str]]],
@@ -1,7 +1,8 @@
 """Config command for juju-spell."""
+import asyncio
 import dataclasses
 import logging
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Tuple, Union
 
 from craft_cli import emit
 from juju.application import Application
@@ -10,6 +11,7 @@ from juju.model import Model
 from websockets.exceptions import InvalidStatusCode
 
 from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.settings import DEFAULT_APPLICATION_CONCURRENCY
 
 logger = logging.getLogger()
 
@@ -33,6 +35,7 @@ class ConfigCommand(BaseJujuCommand):
                 controller=controller,
                 models=kwargs.get("models", None),
                 model_mappings=kwargs["controller_config"].model_mapping,
+                max_concurrency=kwargs["controller_config"].model_concurrency,
             ):
                 emit.message(f"{controller.controller_uuid} model:{name} processing")
                 config = await apply_configuration(kwargs, model)
@@ -50,9 +53,11 @@ async def apply_configuration(kwargs: Dict[str, Any], model: Model) -> Dict[str,
     updates: List[ApplicationConfig] = kwargs.get("config_file", None)
     single_property: str = kwargs.get("config-get", None)
     properties: Dict[str, str] = kwargs.get("config_set", None)
+    app_concurrency: int = kwargs.get("app_concurrency", DEFAULT_APPLICATION_CONCURRENCY)
+    verify: bool = kwargs.get("verify", False)
 
     if updates:
-        config = await apply_file_config(model, updates)
+        config = await apply_file_config(model, updates, app_concurrency, verify)
     elif application:
         juju_app: Application = model.applications.get(application)
         if not juju_app:
@@ -63,6 +68,9 @@ async def apply_configuration(kwargs: Dict[str, Any], model: Model) -> Dict[str,
         if properties:
             await juju_app.set_config(properties)
             keys = list(properties.keys())
+            if not verify and (not single_property or single_property in properties):
+                config[application] = written_values(properties, single_property)
+                return config
 
         all_config_of_app = await juju_app.get_config()
         if single_property:
@@ -109,15 +117,59 @@ def values_only(
     return new_values
 
 
-async def apply_file_config(model: Model, updates: List[ApplicationConfig]) -> dict:
-    """Apply file configuration to (multiple) juju applications."""
-    config = {}
+def written_values(properties: Dict[str, str], *keys: Union[str, None]) -> Dict[str, str]:
+    """Get values of properties, which were set to application.
+
+    The values are returned as they were set, without reading them back from
+    application config.
+    """
+    return {key: value for key, value in properties.items() if not any(keys) or key in keys}
+
+
+async def apply_file_config(
+    model: Model,
+    updates: List[ApplicationConfig],
+    max_concurrency: int = DEFAULT_APPLICATION_CONCURRENCY,
+    verify: bool = False,
+) -> dict:
+    """Apply file configuration to (multiple) juju applications.
+
+    Applications are configured concurrently, at most max_concurrency at the same time.
+    Entries for the same application are merged in order of file before they are applied,
+    so the last value of property wins. Once configuration of any application fails,
+    the others are cancelled.
+    With verify, the config is read back from applications after it was set.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _apply(
+        application: str, juju_app: Application, properties: Dict[str, str]
+    ) -> Tuple[str, dict]:
+        async with semaphore:
+            await juju_app.set_config(properties)
+            if not verify:
+                return application, written_values(properties)
+
+            all_config = await juju_app.get_config()
+
+        return application, values_only(all_config, *properties.keys())
+
+    merged: Dict[str, Dict[str, str]] = {}
     for update in updates:
-        juju_app: Application = model.applications.get(update.application)
+        merged.setdefault(update.application, {}).update(update.config)
+
+    tasks = []
+    for application, properties in merged.items():
+        juju_app: Application = model.applications.get(application)
         if not juju_app:
             continue
 
-        await juju_app.set_config(update.config)
-        all_config = await juju_app.get_config()
-        config.update({update.application: values_only(all_config, *update.config.keys())})
-    return config
+        tasks.append(asyncio.ensure_future(_apply(application, juju_app, properties)))
+
+    try:
+        return dict(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+
+        raise
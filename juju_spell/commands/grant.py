@@ -19,7 +19,7 @@ from typing import Any, List, Optional
 from juju.controller import Controller
 from juju.errors import JujuError
 
-from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.commands.base import BaseJujuCommand, modify_models_access
 
 __all__ = ["GrantCommand", "ACL_CHOICES"]
 
@@ -71,32 +71,32 @@ class GrantCommand(BaseJujuCommand):
         )
         await controller.grant(username=kwargs["user"], acl=controller_acl)
 
-        async for _, model in self.get_filtered_models(
+        model_uuids = await self.get_filtered_model_uuids(
             controller=controller,
             models=models,
             model_mappings=kwargs["controller_config"].model_mapping,
-        ):
-            try:
-                self.logger.info(
-                    "%s Start grant model %s permission %s for user %s",
-                    controller.controller_uuid,
-                    model.uuid,
-                    model_acl,
-                    kwargs["user"],
-                )
-                await controller.grant_model(
-                    username=kwargs["user"],
-                    model_uuid=model.uuid,
-                    acl=model_acl,
-                )
-            except JujuError as err:
-                self.logger.info(
-                    "%s Grant model %s permission %s for user %s fail",
-                    controller.controller_uuid,  # pylint: disable=duplicate-code
-                    model.uuid,
-                    model_acl,
-                    kwargs["user"],
-                )
-                if not overwrite:
-                    raise err
+        )
+        self.logger.info(
+            "%s Start grant %d models permission %s for user %s",
+            controller.controller_uuid,
+            len(model_uuids),
+            model_acl,
+            kwargs["user"],
+        )
+        errors = await modify_models_access(
+            controller, kwargs["user"], list(model_uuids.values()), model_acl, "grant"
+        )
+        for model_uuid, error in errors.items():
+            self.logger.info(
+                "%s Grant model %s permission %s for user %s fail: %s",
+                controller.controller_uuid,
+                model_uuid,
+                model_acl,
+                kwargs["user"],
+                error,
+            )
+
+        if errors and not overwrite:
+            raise JujuError([f"model {uuid}: {error}" for uuid, error in errors.items()])
+
         return True
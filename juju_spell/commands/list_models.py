@@ -11,28 +11,54 @@ class ListModelsCommand(BaseJujuCommand):
     """Command to list models from the local cache or from the controllers."""
 
     async def execute(self, controller: Controller, **kwargs: Any) -> Dict[str, Union[List, bool]]:
-        """List models from the local cache or from the controllers."""
-        cache: Cache = use_cache(DEFAULT_CACHE_BACKEND)
+        """List models from the local cache or from the controllers.
+
+        With swr, the stale models from cache are returned and refreshed in background.
+        Expired models are always refreshed before they are returned.
+        """
+        controller_config = kwargs["controller_config"]
+        cache: Cache = use_cache(
+            DEFAULT_CACHE_BACKEND,
+            write_behind=True,
+            policy=self.get_cache_policy(controller_config.cache_policies),
+            namespace=self.name,
+        )
         list_models_key = f"{self.name}_{controller.controller_uuid}"
+        model_mapping = controller_config.model_mapping
         context = None
-        models = []
 
         if not kwargs["refresh"]:
             context = cache.get(list_models_key)
-            if context:
-                context["data"]["refresh"] = False
-                models = context["data"]["models"]
-
-        if kwargs["refresh"] or context is None:
-            models = list(
-                await self.get_filtered_model_names(
-                    controller=controller,
-                    models=None,
-                    model_mappings=kwargs["controller_config"].model_mapping,
-                )
+
+        if context is None:
+            context = await self.refresh_models(controller, cache, list_models_key, model_mapping)
+        else:
+            self.logger.debug(
+                "%s list models from cache: %s",
+                controller.controller_uuid,
+                context["data"]["models"],
             )
-            cache.put(list_models_key, {"models": models, "refresh": True})
-            context = cache.get(list_models_key)
+            context["data"]["refresh"] = False
+            if kwargs.get("swr", False) and cache.policy.is_stale(context["timestamp"]):
+                self.logger.debug("%s refreshing stale models", controller.controller_uuid)
+                self.run_in_background(
+                    list_models_key,
+                    self.refresh_models(controller, cache, list_models_key, model_mapping),
+                )
 
-        self.logger.debug("%s list models: %s", controller.controller_uuid, models)
         return context
+
+    async def refresh_models(
+        self, controller: Controller, cache: Cache, key: str, model_mapping: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Get models from controller and store them to cache."""
+        models = list(
+            await self.get_filtered_model_names(
+                controller=controller,
+                models=None,
+                model_mappings=model_mapping,
+            )
+        )
+        self.logger.debug("%s list models: %s", controller.controller_uuid, models)
+        cache.put(key, {"models": models, "refresh": True})
+        return cache.get(key)
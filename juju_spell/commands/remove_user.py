@@ -48,24 +48,23 @@ class RemoveUserCommand(BaseJujuCommand):
     ) -> Union[bool, Result]:
         """Execute."""
         # Revoke model
-        revoke_model_cmd = RevokeModelCommand()
-        async for _, model in self.get_filtered_models(
+        model_uuids = await self.get_filtered_model_uuids(
             controller=controller,
             models=models,
             model_mappings=kwargs["controller_config"].model_mapping,
-        ):
-            revoke_model_result = await revoke_model_cmd.run(
-                controller=controller, user=user, model_uuid=model.uuid, acl="read"
+        )
+        revoke_model_cmd = RevokeModelCommand()
+        revoke_model_result = await revoke_model_cmd.run(
+            controller=controller, user=user, model_uuids=list(model_uuids.values()), acl="read"
+        )
+        if not revoke_model_result.success:
+            self.logger.warning(
+                "%s models revoke model user %s fail. %s %s",
+                controller.controller_uuid,
+                user,
+                revoke_model_result.output,
+                revoke_model_result.error,
             )
-            if not revoke_model_result.success:
-                self.logger.warning(
-                    "%s model %s revoke model user %s fail. %s %s",
-                    controller.controller_uuid,
-                    model.uuid,
-                    user,
-                    revoke_model_result.output,
-                    revoke_model_result.error,
-                )
 
         # Revoke
         revoke_cmd = RevokeCommand()
@@ -14,11 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Revoke commands."""
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from juju.controller import Controller
 
-from juju_spell.commands.base import BaseJujuCommand
+from juju_spell.commands.base import BaseJujuCommand, modify_models_access
+from juju_spell.exceptions import JujuSpellError
 
 __all__ = ["RevokeCommand", "RevokeModelCommand"]
 
@@ -47,8 +48,28 @@ class RevokeModelCommand(BaseJujuCommand):
         user: Optional[str] = None,
         model_uuid: Optional[str] = None,
         acl: Optional[str] = "read",
+        model_uuids: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> bool:
-        """Execute."""
-        await controller.revoke_model(username=user, model_uuid=model_uuid, acl=acl)
+        """Execute.
+
+        With `model_uuids` the permission is revoked on all models in batched requests.
+        """
+        if model_uuids is None:
+            await controller.revoke_model(username=user, model_uuid=model_uuid, acl=acl)
+            return True
+
+        if user is None or acl is None:
+            raise JujuSpellError("user and acl are required to revoke access on models")
+
+        errors = await modify_models_access(controller, user, model_uuids, acl, "revoke")
+        for error_model_uuid, error in errors.items():
+            self.logger.warning(
+                "%s model %s revoke model user %s fail: %s",
+                controller.controller_uuid,
+                error_model_uuid,
+                user,
+                error,
+            )
+
         return True
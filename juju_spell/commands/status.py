@@ -19,6 +19,7 @@ class StatusCommand(BaseJujuCommand):
             controller=controller,
             models=models,
             model_mappings=kwargs["controller_config"].model_mapping,
+            max_concurrency=kwargs["controller_config"].model_concurrency,
         ):
             status = await model.get_status()
             self.logger.debug("%s model %s status: %s", controller.controller_uuid, name, status)
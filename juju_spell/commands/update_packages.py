@@ -1,14 +1,24 @@
 """Command to update packages on units."""
-import copy
+import asyncio
+import base64
 import dataclasses
+import hashlib
+import math
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
 
+from juju import tag
 from juju.action import Action
+from juju.client import client
 from juju.controller import Controller
 from juju.model import Model
 
+from juju_spell.cache import DEFAULT_CACHE_BACKEND, Cache, CachePolicy, use_cache
 from juju_spell.commands.base import BaseJujuCommand, Result
+from juju_spell.settings import DEFAULT_MODEL_CONCURRENCY
 
 __all__ = ["UpdatePackagesCommand"]
 
@@ -19,6 +29,65 @@ UPDATE_TEMPLATE = (
 )
 
 TIMEOUT_TO_RUN_COMMAND_SECONDS = 600
+DEFAULT_MAX_UNAVAILABLE = "1"  # units of application updated at the same time
+DRY_RUN_CACHE_TTL = 3600  # seconds
+REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+RAW_OUTPUT_MODES = ["full", "truncated", "compressed"]
+DEFAULT_RAW_OUTPUT_MODE = "full"
+RAW_OUTPUT_LIMIT = 4096  # characters kept from the end of truncated raw output
+# Inst libdrm2 [2.4.110-1ubuntu1] (2.4.113-2~ubuntu0.22.04.1 Ubuntu:22.04/jammy-updates [amd64])  # noqa
+# Unpacking software-properties-common (0.99.9.11) over (0.99.9.10) ...
+APT_OUTPUT_PATTERN = re.compile(
+    r"^(?:Inst (?P<inst_package>\S+) \[(?P<inst_from>[^\]]+)\] \((?P<inst_to>[^\s)]+)"
+    r"|Unpacking (?P<unpack_package>\S+) \((?P<unpack_to>[^)]+)\)"
+    r" over \((?P<unpack_from>[^)]+)\))",
+    re.MULTILINE,
+)
+
+
+def get_raw_output(stdout: str, mode: str) -> str:
+    """Get raw output of command stored in unit result.
+
+    With "truncated" mode only the end of output is kept, since errors are printed
+    there, and with "compressed" mode the output is zlib compressed and base64 encoded.
+    """
+    if mode == "truncated" and len(stdout) > RAW_OUTPUT_LIMIT:
+        return "..." + stdout[-RAW_OUTPUT_LIMIT:]
+
+    if mode == "compressed":
+        return base64.b64encode(zlib.compress(stdout.encode())).decode()
+
+    return stdout
+
+
+def get_unit_name(receiver: str) -> str:
+    """Get unit name from receiver tag of action, e.g. `app/10` from `unit-app-10`."""
+    application, number = tag.untag("unit-", receiver).rsplit("-", 1)
+    return f"{application}/{number}"
+
+
+def is_action_succeeded(action: Action) -> bool:
+    """Check if action completed and its command exited with zero code.
+
+    The exit code is reported as `Code` by Juju 2.9 and as `return-code` by Juju 3.
+    """
+    results = action.data.get("results", {})
+    code = results.get("return-code", results.get("Code", 0))
+    return action.status == "completed" and int(code) == 0
+
+
+def get_unit_concurrency(max_unavailable: str, units: int) -> int:
+    """Get number of units updated at the same time.
+
+    The max_unavailable is either number of units, e.g. "2", or percentage of units,
+    e.g. "25%". At least one unit is always updated.
+    """
+    if max_unavailable.endswith("%"):
+        concurrency = math.floor(units * float(max_unavailable[:-1]) / 100)
+    else:
+        concurrency = int(max_unavailable)
+
+    return max(1, min(concurrency, units))
 
 
 @dataclasses.dataclass
@@ -39,6 +108,7 @@ class UnitUpdateResult:
     packages: List[PackageUpdateResult]
     raw_output: Optional[str] = ""
     success: bool = False
+    cached: bool = False  # result of dry-run was loaded from cache
 
 
 @dataclasses.dataclass
@@ -49,7 +119,7 @@ class UpdateResult:
     application: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class PackageToUpdate:
     """Package to update and version."""
 
@@ -57,21 +127,105 @@ class PackageToUpdate:
     version: str
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class Application:
     """Application to update and its packages."""
 
     name_expr: str
     dist_upgrade: bool
-    packages_to_update: List[PackageToUpdate]
-    results: List[UpdateResult]  # output
+    packages_to_update: Tuple[PackageToUpdate, ...]
+
+
+class ApplicationMatcher:
+    """Index of application name expressions.
+
+    Expressions are matched with `re.match`, so they are anchored to the start of
+    application name. Literal expressions, e.g. "^nova-compute$", are looked up in
+    a dictionary and prefix expressions, e.g. "^nova-.*", by prefixes of the
+    application name. Only the other expressions are matched as regular expressions.
+    """
+
+    def __init__(self, name_exprs: Sequence[str]) -> None:
+        """Compile name expressions to index."""
+        self.literals: Dict[str, List[int]] = defaultdict(list)
+        self.prefixes: Dict[str, List[int]] = defaultdict(list)
+        self.patterns: List[Tuple[int, Pattern[str]]] = []
+        for index, name_expr in enumerate(name_exprs):
+            literal, is_prefix = self._parse(name_expr)
+            if literal is None:
+                self.patterns.append((index, re.compile(name_expr)))
+            elif is_prefix:
+                self.prefixes[literal].append(index)
+            else:
+                self.literals[literal].append(index)
+
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes})
+
+    @staticmethod
+    def _parse(name_expr: str) -> Tuple[Optional[str], bool]:
+        """Get literal part of expression and whether it's a prefix.
+
+        Returns None as literal if expression needs to be matched as regular expression.
+        """
+        literal = name_expr[1:] if name_expr.startswith("^") else name_expr
+        is_prefix = True
+        if literal.endswith(".*$"):
+            literal = literal[:-3]
+        elif literal.endswith(".*"):
+            literal = literal[:-2]
+        elif literal.endswith("$"):
+            literal, is_prefix = literal[:-1], False
 
+        if any(char in REGEX_SPECIAL_CHARS for char in literal):
+            return None, False
 
-@dataclasses.dataclass
+        return literal, is_prefix
+
+    def match(self, application: str) -> List[int]:
+        """Get indexes of name expressions matching application."""
+        indexes = list(self.literals.get(application, []))
+        for length in self.prefix_lengths:
+            if length > len(application):
+                break
+
+            indexes += self.prefixes.get(application[:length], [])
+
+        indexes += [index for index, pattern in self.patterns if pattern.match(application)]
+        return sorted(indexes)
+
+
+@dataclasses.dataclass(frozen=True)
 class Updates:
-    """Encapsulating update class."""
+    """Encapsulating update class.
+
+    The updates are shared between all models, so they must not be modified.
+    """
+
+    applications: Tuple[Application, ...]
+    matcher: ApplicationMatcher = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compile name expressions of applications."""
+        matcher = ApplicationMatcher([app.name_expr for app in self.applications])
+        object.__setattr__(self, "matcher", matcher)
+
+
+@dataclasses.dataclass
+class ApplicationResult:
+    """Results of application from updates on single model."""
+
+    name_expr: str
+    results: List[UpdateResult]
 
-    applications: List[Application]
+
+@dataclasses.dataclass
+class ModelUpdateResult:
+    """Results of updates on single model.
+
+    Applications are in the same order as in updates.
+    """
+
+    applications: List[ApplicationResult]
 
 
 class UpdatePackagesCommand(BaseJujuCommand):
@@ -84,8 +238,11 @@ class UpdatePackagesCommand(BaseJujuCommand):
             controller=controller,
             models=kwargs["models"],
             model_mapping=kwargs["controller_config"].model_mapping,
+            model_concurrency=kwargs["controller_config"].model_concurrency,
             updates=kwargs["patch"],
             dry_run=False,
+            max_unavailable=kwargs.get("max_unavailable", DEFAULT_MAX_UNAVAILABLE),
+            raw_output=kwargs.get("raw_output", DEFAULT_RAW_OUTPUT_MODE),
         )
 
     async def dry_run(
@@ -99,8 +256,13 @@ class UpdatePackagesCommand(BaseJujuCommand):
             controller=controller,
             models=kwargs["models"],
             model_mapping=kwargs["controller_config"].model_mapping,
+            model_concurrency=kwargs["controller_config"].model_concurrency,
             updates=kwargs["patch"],
             dry_run=True,
+            max_unavailable=kwargs.get("max_unavailable", DEFAULT_MAX_UNAVAILABLE),
+            refresh=kwargs.get("refresh", False),
+            raw_output=kwargs.get("raw_output", DEFAULT_RAW_OUTPUT_MODE),
+            cache_policies=kwargs["controller_config"].cache_policies,
         )
 
     # pylint: disable-next=too-many-arguments
@@ -111,80 +273,257 @@ class UpdatePackagesCommand(BaseJujuCommand):
         dry_run: bool,
         model_mapping: Dict[str, List[str]],
         updates: Updates,
+        model_concurrency: int = DEFAULT_MODEL_CONCURRENCY,
+        max_unavailable: str = DEFAULT_MAX_UNAVAILABLE,
+        refresh: bool = False,
+        raw_output: str = DEFAULT_RAW_OUTPUT_MODE,
+        cache_policies: Optional[Dict[str, CachePolicy]] = None,
     ) -> Optional[Result]:
-        """Run the updates or dry-run."""
+        """Run the updates or dry-run.
+
+        Results of dry-run are cached, so the next dry-run runs apt simulation only on
+        units, which are not in cache. With refresh, it runs on all units. The raw
+        output of units is stored in raw_output mode (see `get_raw_output`). The
+        cache policy of `update-packages` is taken from cache_policies.
+        """
+        cache: Optional[Cache] = None
+        if dry_run:
+            cache = use_cache(
+                DEFAULT_CACHE_BACKEND,
+                write_behind=True,
+                policy=self.get_cache_policy(
+                    cache_policies or {}, CachePolicy(ttl=DRY_RUN_CACHE_TTL)
+                ),
+                namespace=self.name,
+            )
+
         output = {}
         async for name, model in self.get_filtered_models(
             controller=controller,
             model_mappings=model_mapping,
             models=models,
+            max_concurrency=model_concurrency,
         ):
-            model_result: Updates = copy.deepcopy(updates)
-            self.set_apps_to_update(model, model_result, dry_run=dry_run)
-            await self.run_updates_on_model(model, model_result)
+            model_result = self.get_apps_to_update(model, updates, dry_run=dry_run)
+            await self.run_updates_on_model(
+                model, updates, model_result, max_unavailable, cache, refresh, raw_output
+            )
 
             output[name] = model_result
         return Result(output=output, success=True, error=None)
 
-    async def run_updates_on_model(self, model: Model, updates: Updates) -> None:
+    # pylint: disable-next=too-many-arguments
+    async def run_updates_on_model(
+        self,
+        model: Model,
+        updates: Updates,
+        model_result: ModelUpdateResult,
+        max_unavailable: str = DEFAULT_MAX_UNAVAILABLE,
+        cache: Optional[Cache] = None,
+        refresh: bool = False,
+        raw_output: str = DEFAULT_RAW_OUTPUT_MODE,
+    ) -> None:
         """Run updates on model.
 
-        Runs the command on unit and parses the result and assigns it to each unit.
+        Runs the command on unit and parses the result and assigns it to each unit
+        of model result.
+        Applications are updated one by one and units of single application are
+        updated in waves limited by max_unavailable (see `get_unit_concurrency`).
+        Once the command failed on any unit of wave, the remaining units of application
+        are skipped, so no more than max_unavailable units are broken at once.
+        With cache, the results are loaded from cache (unless refresh is set) and
+        stored to cache.
         """
-        for app in updates.applications:
-            for result in app.results:
-                for unit in result.units:
-                    juju_unit = model.units[unit.unit]
-                    self.logger.info(
-                        "updating model:%s unit:%s with command:%s",
-                        model.info.name,
-                        unit.unit,
-                        unit.command,
+        for app, app_result in zip(updates.applications, model_result.applications):
+            for result in app_result.results:
+                if not result.units:
+                    continue
+
+                units, cache_key = result.units, ""
+                if cache is not None:
+                    cache_key = await self.get_cache_key(model, result)
+                    if not refresh:
+                        units = self.load_cached_results(cache, cache_key, units, app)
+
+                finished: List[UnitUpdateResult] = []
+                wave_size = get_unit_concurrency(max_unavailable, len(units))
+                for position in range(0, len(units), wave_size):
+                    wave = units[position : position + wave_size]  # noqa: E203
+                    succeeded = await self.run_updates_on_units(
+                        model, wave, app.packages_to_update, raw_output
                     )
-                    action: Action = await juju_unit.run(
-                        command=unit.command, timeout=TIMEOUT_TO_RUN_COMMAND_SECONDS
-                    )
-                    stdout = action.data["results"]["Stdout"]
-                    updated_packages = self.parse_result(stdout)
-                    unit.packages = updated_packages
-                    self.set_success_flags(unit, app.packages_to_update)
-                    unit.raw_output = stdout
+                    finished += succeeded
+                    if len(succeeded) < len(wave):
+                        self.skip_units(model, units[position + wave_size :])  # noqa: E203
+                        break
+
+                if cache is not None and finished:
+                    self.store_results(cache, cache_key, finished)
+
+    def skip_units(self, model: Model, units: List[UnitUpdateResult]) -> None:
+        """Mark units as skipped, because previous wave of application failed."""
+        for unit in units:
+            self.logger.warning(
+                "model:%s unit:%s skipped, previous wave failed", model.info.name, unit.unit
+            )
+            unit.raw_output = "skipped, previous wave of application failed"
+            unit.success = False
+
+    async def get_cache_key(self, model: Model, result: UpdateResult) -> str:
+        """Get cache key for units of application.
+
+        The key is created from model, application, series and command.
+        """
+        series = await model.applications[result.application].get_series()
+        source = f"{model.info.uuid}/{result.application}/{series}/{result.units[0].command}"
+        return f"{self.name}_{hashlib.sha256(source.encode()).hexdigest()}"
+
+    def load_cached_results(
+        self, cache: Cache, key: str, units: List[UnitUpdateResult], app: Application
+    ) -> List[UnitUpdateResult]:
+        """Set results of units from cache and return units, which are not in cache."""
+        cached = self.get_cached_units(cache, key)
+        missing = []
+        for unit in units:
+            if unit.unit not in cached:
+                missing.append(unit)
+                continue
+
+            self.logger.debug("unit:%s dry-run result loaded from cache", unit.unit)
+            unit.packages = [
+                PackageUpdateResult(**package) for package in cached[unit.unit]["packages"]
+            ]
+            self.set_success_flags(unit, app.packages_to_update)
+            unit.raw_output = None
+            unit.cached = True
+
+        return missing
+
+    def get_cached_units(self, cache: Cache, key: str) -> Dict[str, Any]:
+        """Get cached results of units, which are not older than ttl of cache policy.
+
+        Each unit has its own timestamp, so storing results of some units does not
+        extend the life of results of other units.
+        """
+        context = cache.get(key)
+        if context is None:
+            return {}
+
+        expired = time.time() - cache.policy.ttl
+        return {
+            unit: result
+            for unit, result in context["data"].items()
+            if result["timestamp"] >= expired
+        }
+
+    def store_results(self, cache: Cache, key: str, units: List[UnitUpdateResult]) -> None:
+        """Store parsed packages of units to cache along with other not expired units."""
+        results = self.get_cached_units(cache, key)
+        timestamp = time.time()
+        for unit in units:
+            results[unit.unit] = {
+                "timestamp": timestamp,
+                "packages": [dataclasses.asdict(package) for package in unit.packages],
+            }
+
+        cache.put(key, results)
+
+    async def run_updates_on_units(
+        self,
+        model: Model,
+        units: List[UnitUpdateResult],
+        expected: Sequence[PackageToUpdate],
+        raw_output: str = DEFAULT_RAW_OUTPUT_MODE,
+    ) -> List[UnitUpdateResult]:
+        """Run update command on units with single API call and set their results.
+
+        All units belong to the same application, so they share the same command.
+        The results of API call are not ordered as units, so they are matched to units
+        by receiver of action. Units without matching result are marked as failed.
+        Returns units, on which the command succeeded.
+        """
+        command = units[0].command
+        unit_names = [unit.unit for unit in units]
+        self.logger.info(
+            "updating model:%s units:%s with command:%s", model.info.name, unit_names, command
+        )
+        action_facade = client.ActionFacade.from_connection(model.connection())
+        response = await action_facade.Run(
+            applications=[],
+            commands=command,
+            machines=[],
+            timeout=TIMEOUT_TO_RUN_COMMAND_SECONDS * 10**9,  # nanoseconds
+            units=unit_names,
+        )
+        pending = {unit.unit: unit for unit in units}
+        matched = []
+        for action_result in response.results:
+            receiver = action_result.action.receiver if action_result.action else None
+            unit = pending.pop(get_unit_name(receiver), None) if receiver else None
+            if unit is not None:
+                matched.append((unit, action_result))
+            elif action_result.error is not None:
+                self.logger.error(
+                    "model:%s result without unit: %s",
+                    model.info.name,
+                    action_result.error.message,
+                )
+
+        for unit in pending.values():
+            self.logger.error("model:%s unit:%s no result returned", model.info.name, unit.unit)
+            unit.raw_output = "no result returned"
+            unit.success = False
+
+        started = []
+        for unit, action_result in matched:
+            if action_result.error is not None:
+                self.logger.error(
+                    "model:%s unit:%s update failed: %s",
+                    model.info.name,
+                    unit.unit,
+                    action_result.error.message,
+                )
+                unit.raw_output = action_result.error.message
+                unit.success = False
+            else:
+                started.append((unit, action_result.action.tag))
+
+        actions: List[Action] = await asyncio.gather(
+            *(model.wait_for_action(tag) for _, tag in started)
+        )
+        succeeded = []
+        for (unit, _), action in zip(started, actions):
+            stdout = action.data["results"].get("Stdout", "")
+            unit.packages = self.parse_result(stdout)
+            self.set_success_flags(unit, expected)
+            unit.raw_output = get_raw_output(stdout, raw_output)
+            if is_action_succeeded(action):
+                succeeded.append(unit)
+            else:
+                self.logger.error(
+                    "model:%s unit:%s update failed with status %s",
+                    model.info.name,
+                    unit.unit,
+                    action.status,
+                )
+                unit.success = False
+
+        return succeeded
 
     def parse_result(self, result: str) -> List[PackageUpdateResult]:
         """Parse result.
 
-        Parses the result and creates PackageUpdateResult structure.
+        Finds the "Inst" lines of simulation and "Unpacking" lines of installation
+        in a single pass over the output and creates PackageUpdateResult structure.
         """
-        lines = result.splitlines()
-        packages: List[PackageUpdateResult] = []
-        for line in lines:
-            from_version, name, to_version = self.parse_line(line)
-            if from_version != "" and to_version != "" and name != "":
-                packages.append(
-                    PackageUpdateResult(
-                        package=name, from_version=from_version, to_version=to_version
-                    )
-                )
-
-        return packages
-
-    def parse_line(self, line: str) -> Tuple[str, str, str]:
-        """Parse the line and return (from_version, name, to_version) tuple."""
-        # pylint: disable-next=line-too-long
-        # Inst libdrm2 [2.4.110-1ubuntu1] (2.4.113-2~ubuntu0.22.04.1 Ubuntu:22.04/jammy-updates [amd64]) # noqa
-        to_version = ""
-        from_version = ""
-        name = ""
-        if line.startswith("Inst "):
-            _, name, from_version, to_version, *_ = line.split(" ")
-
-        # Unpacking software-properties-common (0.99.9.11) over (0.99.9.10)
-        elif line.startswith("Unpacking"):
-            _, name, to_version, _, from_version, *_ = line.split(" ")
-        to_version = to_version.strip("()[]")
-        from_version = from_version.strip("()[]")
-        name = name.strip(" ")
-        return from_version, name, to_version
+        return [
+            PackageUpdateResult(
+                package=match["inst_package"] or match["unpack_package"],
+                from_version=match["inst_from"] or match["unpack_from"],
+                to_version=match["inst_to"] or match["unpack_to"],
+            )
+            for match in APT_OUTPUT_PATTERN.finditer(result)
+        ]
 
     def get_update_command(self, app: Application, dry_run: bool) -> str:
         """Generate command according to flags."""
@@ -196,30 +535,45 @@ class UpdatePackagesCommand(BaseJujuCommand):
         package_list = " ".join(app_list)
         return template.format(install="install", packages=package_list)
 
-    def set_apps_to_update(self, model: Model, updates: Updates, dry_run: bool) -> None:
-        """Set units to applications.
+    def get_apps_to_update(
+        self, model: Model, updates: Updates, dry_run: bool
+    ) -> ModelUpdateResult:
+        """Get units of applications to update.
 
-        Finds the matching applications and set the units of these applications as a
-        List[UpdateResult] to application.
+        Finds the matching applications and returns the units of these applications
+        as a List[UpdateResult] for each application of updates.
         """
         self.logger.info("Finding applications to update on model:%s", model.info.name)
-        for update in updates.applications:
-            command = self.get_update_command(app=update, dry_run=dry_run)
-            for app, app_status in model.applications.items():
-                if re.match(update.name_expr, app):
-                    self.logger.info(
-                        "model:%s application:%s units:%s will be updated",
-                        model.info.name,
-                        app,
-                        [u.name for u in app_status.units],
-                    )
-                    unit_updates = [
-                        UnitUpdateResult(unit=u.name, command=command, packages=[])
-                        for u in app_status.units
-                    ]
-                    update.results.append(UpdateResult(application=app, units=unit_updates))
+        commands = [
+            self.get_update_command(app=update, dry_run=dry_run) for update in updates.applications
+        ]
+        model_result = ModelUpdateResult(
+            applications=[
+                ApplicationResult(name_expr=update.name_expr, results=[])
+                for update in updates.applications
+            ]
+        )
+        for app, app_status in model.applications.items():
+            for index in updates.matcher.match(app):
+                self.logger.info(
+                    "model:%s application:%s units:%s will be updated",
+                    model.info.name,
+                    app,
+                    [u.name for u in app_status.units],
+                )
+                unit_updates = [
+                    UnitUpdateResult(unit=u.name, command=commands[index], packages=[])
+                    for u in app_status.units
+                ]
+                model_result.applications[index].results.append(
+                    UpdateResult(application=app, units=unit_updates)
+                )
+
+        return model_result
 
-    def set_success_flags(self, unit: UnitUpdateResult, expected: List[PackageToUpdate]) -> None:
+    def set_success_flags(
+        self, unit: UnitUpdateResult, expected: Sequence[PackageToUpdate]
+    ) -> None:
         """Set success flag for each unit."""
         expected_set = set((e.version, e.package) for e in expected)
         real_set = set((p.to_version, p.package) for p in unit.packages)
@@ -1,5 +1,7 @@
 """Configuration loader."""
 import dataclasses
+import hashlib
+import json
 import logging
 import re
 import uuid
@@ -9,11 +11,14 @@ from typing import Any, Dict, List, Optional
 import confuse
 from confuse import ConfigError, RootView
 
+from juju_spell.cache import DEFAULT_SOFT_TTL_RULE, CachePolicy
 from juju_spell.exceptions import JujuSpellError
 from juju_spell.settings import (
     DEFAULT_CONNECTION_TIMEOUT,
     DEFAULT_CONNECTION_WAIT,
+    DEFAULT_MODEL_CONCURRENCY,
     DEFAULT_PORT_RANGE,
+    DEFAULT_RETRY_BACKOFF,
 )
 from juju_spell.utils import load_yaml_file, merge_list_of_dict_by_key
 
@@ -48,6 +53,8 @@ DESTINATION_REGEX = (
     r"localhost|"  # localhost
     r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})$"  # IP
 )
+RISK_LEVELS = range(1, 6)  # 1 is the lowest risk
+CACHE_POLICY_COMMANDS = ("list-models", "update-packages")  # commands using cache policy
 PORT_RANGE = (
     r"^((6553[0-5])|(655[0-2][0-9])|(65[0-4][0-9]{2})|"
     r"(6[0-4][0-9]{3})|([1-5][0-9]{4})|([0-5]{0,5})|([0-9]{1,4}))"
@@ -111,6 +118,22 @@ class PortRange(Regex):
         return range(int(start_port), int(end_port))
 
 
+class PositiveInteger(confuse.Template):
+    """A template used to validate positive integer and provide custom error."""
+
+    def __init__(self, message: str, default: Optional[int] = None):
+        """Initialize the PositiveInteger object."""
+        super().__init__(default=default)
+        self._message = message
+
+    def convert(self, value: Any, view: confuse.ConfigView) -> int:
+        """Check that the value is integer greater than zero."""
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            self.fail(self._message, view, True)
+
+        return int(value)
+
+
 class ControllerDict(confuse.MappingTemplate):
     """Controller template."""
 
@@ -120,7 +143,7 @@ class ControllerDict(confuse.MappingTemplate):
         template: Optional[confuse.Template] = None,
     ) -> "Controller":
         """Get Controller object from dict."""
-        output = super().value(view, template)
+        output: Dict[str, Any] = super().value(view, template)
         return Controller(**output)
 
 
@@ -146,10 +169,58 @@ class RetryPolicyDict(confuse.MappingTemplate):
         template: Optional[confuse.Template] = None,
     ) -> "RetryPolicy":
         """Get RetryPolicy object from dict."""
-        output = super().value(view, template)
+        output: Dict[str, Any] = super().value(view, template)
         return RetryPolicy(**output)
 
 
+class CachePolicyDict(confuse.Template):
+    """Cache policy template."""
+
+    def __init__(self, fields: Dict[str, confuse.Template]):
+        """Initialize the CachePolicyDict object with templates of optional int fields."""
+        super().__init__()
+        self._fields: confuse.MappingTemplate[str, Optional[int]] = confuse.MappingTemplate(fields)
+
+    def value(self, view: confuse.ConfigView, template: object = None) -> CachePolicy:
+        """Get CachePolicy object from dict, missing values have default value.
+
+        The soft_ttl must not be greater than ttl, the default soft_ttl is lowered to ttl.
+        """
+        output = self._fields.value(view, template)
+        policy = CachePolicy(**{key: value for key, value in output.items() if value is not None})
+        if output.get("soft_ttl") is None and policy.ttl < DEFAULT_SOFT_TTL_RULE:
+            policy = dataclasses.replace(policy, soft_ttl=policy.ttl)
+
+        if policy.soft_ttl > policy.ttl:
+            self.fail("Invalid cache policy, soft_ttl must not be greater than ttl", view)
+
+        return policy
+
+
+class CachePoliciesDict(confuse.MappingValues):
+    """Cache policies template with commands, which use cache policy, as keys."""
+
+    def value(self, view: confuse.ConfigView, template: object = None) -> Dict[str, CachePolicy]:
+        """Get dict of CachePolicy objects and check that all commands use cache policy."""
+        output = super().value(view, template)
+        unknown = sorted(set(output) - set(CACHE_POLICY_COMMANDS))
+        if unknown:
+            self.fail(
+                f"Invalid cache policies of {', '.join(unknown)}, only "
+                f"{', '.join(CACHE_POLICY_COMMANDS)} use cache policy",
+                view,
+            )
+
+        return output
+
+
+CACHE_POLICY_TEMPLATE = CachePolicyDict(
+    {
+        "ttl": confuse.Optional(int),
+        "soft_ttl": confuse.Optional(int),
+        "max_entries": confuse.Optional(int),
+    }
+)
 DEFAULT_KEY = "default"
 JUJUSPELL_CONTROLLER_TEMPLATE = ControllerDict(
     {
@@ -159,7 +230,11 @@ JUJUSPELL_CONTROLLER_TEMPLATE = ControllerDict(
         "owner": str,
         "description": confuse.Optional(str),
         "tags": confuse.Optional(confuse.Sequence(str)),
-        "risk": confuse.Choice(range(1, 6), default=5),
+        "risk": confuse.Choice(RISK_LEVELS, default=5),
+        "model_concurrency": confuse.Optional(
+            PositiveInteger("Invalid model_concurrency, must be positive integer"),
+            default=DEFAULT_MODEL_CONCURRENCY,
+        ),
         "endpoint": String(API_ENDPOINT_REGEX, "Invalid api endpoint definition"),
         "ca_cert": String(CA_CERT_REGEX, "Invalid ca-cert format"),
         "user": str,
@@ -196,9 +271,11 @@ JUJUSPELL_CONTROLLER_TEMPLATE = ControllerDict(
                     "timeout": confuse.Optional(int),
                     "attempt": confuse.Optional(int),
                     "wait": confuse.Optional(int),
+                    "backoff": confuse.Optional(float),
                 }
             )
         ),
+        "cache_policies": confuse.Optional(CachePoliciesDict(CACHE_POLICY_TEMPLATE), default={}),
     }
 )
 
@@ -210,7 +287,10 @@ JUJU_DEFAULT_CONTROLLER_DICT = {
     "owner": confuse.Optional(str),
     "description": confuse.Optional(str),
     "tags": confuse.Optional(confuse.Sequence(str)),
-    "risk": confuse.Optional(confuse.Choice(range(1, 6), default=5)),
+    "risk": confuse.Optional(confuse.Choice(RISK_LEVELS, default=5)),
+    "model_concurrency": confuse.Optional(
+        PositiveInteger("Invalid model_concurrency, must be positive integer")
+    ),
     "endpoint": confuse.Optional(
         String(
             API_ENDPOINT_REGEX,
@@ -269,9 +349,11 @@ JUJU_DEFAULT_CONTROLLER_DICT = {
                 "timeout": confuse.Optional(int),
                 "attempt": confuse.Optional(int),
                 "wait": confuse.Optional(int),
+                "backoff": confuse.Optional(float),
             }
         )
     ),
+    "cache_policies": confuse.Optional(CachePoliciesDict(CACHE_POLICY_TEMPLATE)),
 }
 
 JUJUSPELL_DEFAULT_CONFIG_TEMPLATE = confuse.MappingTemplate(
@@ -307,6 +389,7 @@ class RetryPolicy:
     attempt: Optional[int] = 3
     wait: Optional[int] = DEFAULT_CONNECTION_WAIT
     timeout: Optional[int] = DEFAULT_CONNECTION_TIMEOUT
+    backoff: Optional[float] = DEFAULT_RETRY_BACKOFF
 
 
 @dataclasses.dataclass
@@ -336,8 +419,11 @@ class Controller:  # pylint: disable=R0902
     description: Optional[str] = None
     tags: Optional[List[str]] = None
     risk: int = 5
+    model_concurrency: int = DEFAULT_MODEL_CONCURRENCY
     connection: Optional[Connection] = None
     retry_policy: Optional[RetryPolicy] = None
+    # cache policies of commands, e.g. `list-models`
+    cache_policies: Dict[str, CachePolicy] = dataclasses.field(default_factory=dict)
 
 
 @dataclasses.dataclass
@@ -466,6 +552,12 @@ def load_config(config_path: Path, personal_config_path: Optional[Path] = None)
     return config
 
 
+def get_config_digest(config: Config) -> str:
+    """Get digest of configuration used to check that two processes use the same one."""
+    data = json.dumps(dataclasses.asdict(config), default=str, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
 def convert_config(original_config: Dict[str, Any]) -> Dict[str, Any]:
     """Convert Juju config from `juju show-controller` to JujuSpell config.
 
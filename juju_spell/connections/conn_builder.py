@@ -1,22 +1,58 @@
 """Module to build connection to controller."""
 import logging
-from typing import Callable, Optional
+import random
+from typing import Callable, Optional, Union
 from uuid import UUID
 
 import tenacity
 from juju import juju
 from juju.errors import JujuConnectionError
-from tenacity import RetryCallState, RetryError, Retrying
+from tenacity import AsyncRetrying, RetryCallState, RetryError
 from tenacity.retry import RetryBaseT
 from tenacity.stop import StopBaseT
 from tenacity.wait import WaitBaseT
 
 from juju_spell.config import RetryPolicy
-from juju_spell.settings import DEFAULT_CONNECTION_WAIT, DEFAULT_MAX_FRAME_SIZE
+from juju_spell.settings import (
+    DEFAULT_CONNECTION_WAIT,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_RETRY_JITTER,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _get_wait_time(attempt: int, retry_backoff: Union[int, float]) -> float:
+    """Calculate wait time for reconnection."""
+    return retry_backoff ** (attempt - 2)  # exponential wait y^(x-2)
+
+
+class WaitBackoff(tenacity.wait.wait_base):
+    """Wait strategy with exponential backoff and random jitter.
+
+    The wait time after n-th attempt is `wait * retry_backoff^(n-2)` increased by
+    random jitter up to `jitter` fraction of this time, so connections to multiple
+    controllers are not retried at the same time.
+    """
+
+    def __init__(
+        self,
+        wait: Union[int, float],
+        retry_backoff: Union[int, float] = DEFAULT_RETRY_BACKOFF,
+        jitter: float = DEFAULT_RETRY_JITTER,
+    ) -> None:
+        """Configure wait strategy."""
+        self.wait = wait
+        self.retry_backoff = retry_backoff
+        self.jitter = jitter
+
+    def __call__(self, retry_state: "RetryCallState") -> float:
+        """Get wait time before next attempt."""
+        wait = self.wait * _get_wait_time(retry_state.attempt_number, self.retry_backoff)
+        return wait + random.uniform(0, wait * self.jitter)  # nosec
+
+
 def _after_log(uuid, name) -> Callable:
     """Help function for logs after retry."""
 
@@ -48,9 +84,13 @@ async def _conn(
     wait_func: "WaitBaseT",
     retry_func: "RetryBaseT",
 ):
-    """Execute retry with RetryPolicy."""
+    """Execute retry with RetryPolicy.
+
+    The AsyncRetrying is waiting with asyncio.sleep, so retries do not block
+    connections to other controllers.
+    """
     try:
-        for attempt in Retrying(
+        async for attempt in AsyncRetrying(
             stop=stop_func,
             retry=retry_func,
             wait=wait_func,
@@ -100,13 +140,14 @@ async def build_controller_conn(
     # is unreachable. This can happen, for example, when port forwarding is
     # through a subprocess and the process has not yet started.
     retry_funcs = [tenacity.retry_if_exception_type(JujuConnectionError)]
-    wait_func: tenacity.wait.wait_base = tenacity.wait_fixed(DEFAULT_CONNECTION_WAIT)
+    wait_func = WaitBackoff(
+        retry_policy.wait or DEFAULT_CONNECTION_WAIT,
+        retry_policy.backoff or DEFAULT_RETRY_BACKOFF,
+    )
     stop_funcs = []
 
     if retry_policy.attempt:
         stop_funcs.append(tenacity.stop_after_attempt(retry_policy.attempt))
-    if retry_policy.wait:
-        wait_func = tenacity.wait_fixed(retry_policy.wait)
     if retry_policy.timeout:
         stop_funcs.append(tenacity.stop_after_delay(retry_policy.timeout))
 
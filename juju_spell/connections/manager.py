@@ -1,12 +1,14 @@
 """Module for managing connection to controllers."""
+import asyncio
 import dataclasses
 import logging
-from typing import Dict, Union
+from typing import Dict
 
 from juju import juju
 
 from juju_spell.config import Controller
 from juju_spell.connections.conn_builder import build_controller_conn
+from juju_spell.connections.model_pool import PooledController
 from juju_spell.connections.network import BaseConnection, get_connection
 from juju_spell.settings import DEFAULT_MAX_FRAME_SIZE
 
@@ -21,11 +23,6 @@ class Connection:
     connection_process: BaseConnection
 
 
-def _get_wait_time(attempt: int, retry_backoff: Union[int, float]) -> float:
-    """Calculate wait time for reconnection."""
-    return retry_backoff ** (attempt - 2)  # exponential wait y^(x-2)
-
-
 class ConnectManager:
     """Connect manager is used to define connections for controllers.
 
@@ -60,6 +57,7 @@ class ConnectManager:
 
     _manager = None
     _connections: Dict[str, Connection] = {}
+    _locks: Dict[str, asyncio.Lock] = {}
 
     def __new__(cls) -> "ConnectManager":
         if cls._manager is None:
@@ -77,10 +75,13 @@ class ConnectManager:
     ) -> juju.Controller:
         """Prepare connection to Controller and return it."""
         logger.info("getting a new connection to controller %s", controller_config.name)
-        controller = juju.Controller(max_frame_size=DEFAULT_MAX_FRAME_SIZE)
+        controller = PooledController(
+            max_frame_size=DEFAULT_MAX_FRAME_SIZE, max_idle=controller_config.model_concurrency
+        )
         controller_endpoint, connection_process = get_connection(controller_config, sshuttle)
         connection_process.connect()
         self.connections[controller_config.name] = Connection(controller, connection_process)
+        await connection_process.wait_ready()
         await build_controller_conn(
             controller,
             uuid=controller_config.uuid,
@@ -98,10 +99,25 @@ class ConnectManager:
         """Close all connections."""
         for connection in self.connections.values():
             await connection.controller.disconnect()  # disconnect controller
-            connection.connection_process.clean()  # clean connection process
+            await connection.connection_process.clean()  # clean connection process
             logger.info("%s connection was closed", connection.controller.controller_uuid)
 
         self.connections.clear()
+        self._locks.clear()
+
+    async def prune(self) -> None:
+        """Close connections to controllers, which were disconnected.
+
+        Idle model connections of connected controllers are closed too.
+        """
+        for name, connection in list(self.connections.items()):
+            if connection.controller.is_connected():
+                await connection.controller.model_pool.evict()
+                continue
+
+            await connection.connection_process.clean()  # clean connection process
+            del self.connections[name]
+            logger.info("%s connection was lost and it was pruned", name)
 
     async def get_controller(
         self,
@@ -109,17 +125,30 @@ class ConnectManager:
         sshuttle: bool = False,
         reconnect: bool = False,
     ) -> juju.Controller:
-        """Get controller."""
+        """Get controller.
+
+        Concurrent calls for the same controller are serialized, so only the first
+        one connects to controller and the others use its connection.
+        """
         assert isinstance(
             controller_config, Controller
         ), "Not supported format of controller config"
 
-        connection = self.connections.get(controller_config.name)
-        controller = None
-        if connection and connection.controller.is_connected() and not reconnect:
-            logger.info("%s using controller from cache", connection.controller.controller_uuid)
-            controller = connection.controller
-        elif connection and reconnect:
-            await connection.controller.disconnect()
+        lock = self._locks.setdefault(controller_config.name, asyncio.Lock())
+        async with lock:
+            connection = self.connections.get(controller_config.name)
+            if connection and connection.controller.is_connected() and not reconnect:
+                logger.info(
+                    "%s using controller from cache", connection.controller.controller_uuid
+                )
+                return connection.controller
+
+            if connection:
+                if reconnect:
+                    await connection.controller.disconnect()
+
+                # previous port-forward and its port are released before new connection
+                await connection.connection_process.clean()
+                del self.connections[controller_config.name]
 
-        return controller or await self._connect(controller_config, sshuttle)
+            return await self._connect(controller_config, sshuttle)
@@ -0,0 +1,134 @@
+"""Module for reusing model connections of controller."""
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from juju import juju
+from juju.model import Model
+
+from juju_spell.settings import DEFAULT_MODEL_CONCURRENCY, DEFAULT_MODEL_IDLE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class PooledModel(Model):
+    """Model connection, which is returned to pool instead of disconnecting."""
+
+    def __init__(self, pool: "ModelPool", key: str, **kwargs: Any) -> None:
+        """Initialize model connection owned by pool."""
+        super().__init__(**kwargs)
+        self.pool = pool
+        self.key = key
+
+    async def disconnect(self) -> None:
+        """Return model connection to pool."""
+        await self.pool.release(self)
+
+    async def close(self) -> None:
+        """Close model connection."""
+        await super().disconnect()
+
+
+class ModelPool:
+    """Pool of model connections for single controller.
+
+    Model connections returned to pool are reused by the next `get_model` call for
+    the same model, e.g. by sub-commands of composite command. Connections, which
+    were not used for `idle_timeout` seconds, are closed. At most `max_idle`
+    connections are kept in pool and the least recently released ones are closed.
+    """
+
+    def __init__(
+        self,
+        controller: juju.Controller,
+        idle_timeout: float = DEFAULT_MODEL_IDLE_TIMEOUT,
+        max_idle: int = DEFAULT_MODEL_CONCURRENCY,
+    ) -> None:
+        """Initialize pool for controller."""
+        self.controller = controller
+        self.idle_timeout = idle_timeout
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[Tuple[PooledModel, float]]] = defaultdict(list)
+
+    @property
+    def idle(self) -> Dict[str, List[Tuple[PooledModel, float]]]:
+        """Return idle model connections with time of their release."""
+        return self._idle
+
+    async def get_model(self, model: str) -> PooledModel:
+        """Get idle model connection or connect to the model.
+
+        :param model: model name or UUID
+        """
+        await self.evict()
+        uuids = await self.controller.model_uuids()
+        uuid = uuids.get(model, model)
+        while self._idle[uuid]:
+            pooled_model, _ = self._idle[uuid].pop()
+            if pooled_model.is_connected():
+                logger.debug("model %s connection reused from pool", uuid)
+                return pooled_model
+
+        pooled_model = PooledModel(self, uuid)
+        kwargs = self.controller.connection().connect_params()
+        kwargs["uuid"] = uuid
+        await pooled_model._connect_direct(**kwargs)  # pylint: disable=W0212
+        logger.debug("model %s was connected", uuid)
+        return pooled_model
+
+    async def release(self, model: PooledModel) -> None:
+        """Return model connection to pool and close connections over the limit."""
+        self._idle[model.key].append((model, time.monotonic()))
+        await self.evict()
+        idle = sorted(
+            ((released, key) for key, models in self._idle.items() for _, released in models)
+        )
+        for _, key in idle[: max(0, len(idle) - self.max_idle)]:
+            oldest, _ = self._idle[key].pop(0)  # models of key are ordered by release
+            await oldest.close()
+            logger.debug("model %s connection over idle limit was closed", key)
+
+    async def evict(self) -> None:
+        """Close model connections idle for longer than idle timeout."""
+        deadline = time.monotonic() - self.idle_timeout
+        for key, models in list(self._idle.items()):
+            expired = [model for model, released in models if released <= deadline]
+            self._idle[key] = [item for item in models if item[1] > deadline]
+            for model in expired:
+                await model.close()
+                logger.debug("idle model %s connection was closed", key)
+
+    async def clear(self) -> None:
+        """Close all idle model connections."""
+        for models in self._idle.values():
+            for model, _ in models:
+                await model.close()
+
+        self._idle.clear()
+
+
+class PooledController(juju.Controller):
+    """Juju controller reusing model connections from its pool."""
+
+    def __init__(
+        self, *args: Any, max_idle: int = DEFAULT_MODEL_CONCURRENCY, **kwargs: Any
+    ) -> None:
+        """Initialize controller with empty model pool.
+
+        :param max_idle: maximum number of idle model connections kept in pool
+        """
+        super().__init__(*args, **kwargs)
+        self.model_pool = ModelPool(self, max_idle=max_idle)
+
+    async def get_model(self, model: str) -> PooledModel:
+        """Get model connection from pool.
+
+        Calling `disconnect` on the returned model returns it to pool.
+        """
+        return await self.model_pool.get_model(model)
+
+    async def disconnect(self) -> None:
+        """Close all pooled model connections and disconnect controller."""
+        await self.model_pool.clear()
+        await super().disconnect()
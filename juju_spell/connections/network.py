@@ -1,39 +1,147 @@
 """Module handling connection to remote cloud."""
 import abc
+import asyncio
 import logging
+import os
 import random
+import shutil
 import socket
 import subprocess
-from typing import List, Optional, Tuple
+import tempfile
+import threading
+from typing import IO, Dict, List, Optional, Set, Tuple
 
 from juju_spell.config import Controller
+from juju_spell.exceptions import JujuSpellError
+from juju_spell.settings import (
+    DEFAULT_CONNECTION_TIMEOUT,
+    DEFAULT_PROBE_INTERVAL,
+    EPHEMERAL_PORT_RANGE_PATH,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def _is_port_free(port: int) -> bool:
-    """Check if port is free to use."""
+    """Check if port is free to use by binding to it."""
     tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    result = tcp.connect_ex(("localhost", port))
-    tcp.close()
-    return result != 0
+    try:
+        tcp.bind(("localhost", port))
+    except OSError:
+        return False
+    finally:
+        tcp.close()
+
+    return True
+
+
+def _get_ephemeral_port_range() -> range:
+    """Get range of ports, which kernel uses for port 0."""
+    try:
+        with open(EPHEMERAL_PORT_RANGE_PATH, encoding="utf-8") as file:
+            low, high = map(int, file.read().split())
+    except (OSError, ValueError):
+        low, high = 32768, 60999  # default on Linux
+
+    return range(low, high + 1)
+
+
+def _get_kernel_port() -> int:
+    """Get free port chosen by kernel."""
+    tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        tcp.bind(("localhost", 0))
+        return tcp.getsockname()[1]
+    finally:
+        tcp.close()
+
+
+def _split_target(target: str) -> Tuple[str, int]:
+    """Split [bind_address:]port target to host and port."""
+    host, _, port = target.rpartition(":")
+    return host or "localhost", int(port)
+
+
+async def _is_port_open(host: str, port: int) -> bool:
+    """Check if port accepts connections."""
+    try:
+        _, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return False
+
+    writer.close()
+    return True
+
+
+class PortAllocator:
+    """Process-wide allocator of local TCP ports for port-forwarding.
+
+    The allocated ports are reserved until they are released, so tunnels started at
+    the same time never get the same port. If the port range covers the whole
+    ephemeral port range, the port is chosen by kernel. Otherwise the range is
+    walked from random offset and ports are checked by binding to them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the allocator."""
+        self._reserved: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def reserved(self) -> Set[int]:
+        """Return reserved ports."""
+        return self._reserved
+
+    def _find_port(self, port_range: range) -> Optional[int]:
+        """Find free and not reserved port in range."""
+        ephemeral_range = _get_ephemeral_port_range()
+        if ephemeral_range[0] in port_range and ephemeral_range[-1] in port_range:
+            port = _get_kernel_port()
+            if port not in self._reserved:
+                return port
+
+        offset = random.randrange(len(port_range)) if port_range else 0
+        for i in range(len(port_range)):
+            port = port_range[(offset + i) % len(port_range)]
+            if port not in self._reserved and _is_port_free(port):
+                return port
+
+        return None
+
+    def allocate(self, port_range: range) -> int:
+        """Reserve free TCP port from range."""
+        with self._lock:
+            port = self._find_port(port_range)
+            if port is None:
+                raise ValueError(f"Could not find a free port in range {port_range}")
+
+            self._reserved.add(port)
+
+        logger.debug("free port %d was reserved", port)
+        return port
+
+    def release(self, port: int) -> None:
+        """Release reserved TCP port."""
+        with self._lock:
+            self._reserved.discard(port)
+
+
+port_allocator = PortAllocator()
 
 
 def get_free_tcp_port(port_range: range) -> int:
     """Get free TCP port from range.
 
     This function will return free port on local system. This port will be used to
-    port-forward remote controller to localhost:<port>.
+    port-forward remote controller to localhost:<port>. The port is reserved until
+    it's released by `release_tcp_port`.
     """
-    list_of_ports = list(port_range)
-    random.shuffle(list_of_ports)  # randomly shuffle list of ports
+    return port_allocator.allocate(port_range)
 
-    for port in list_of_ports:
-        if _is_port_free(port):
-            logger.debug("free port %d was found", port)
-            return port
 
-    raise ValueError(f"Could not find a free port in range {port_range}")
+def release_tcp_port(port: int) -> None:
+    """Release TCP port reserved by `get_free_tcp_port`."""
+    port_allocator.release(port)
 
 
 class BaseConnection(metaclass=abc.ABCMeta):
@@ -52,9 +160,15 @@ class BaseConnection(metaclass=abc.ABCMeta):
         """
 
     @abc.abstractmethod
-    def clean(self) -> None:  # pragma: no cover
+    async def clean(self) -> None:  # pragma: no cover
         """Clean/terminate/close connection."""
 
+    async def wait_ready(self) -> None:
+        """Wait until connection is ready to be used.
+
+        Connections, which are ready right after `connect`, do not need to override it.
+        """
+
 
 class EmptyConnection(BaseConnection):
     """Empty connection for controller with direct access."""
@@ -70,7 +184,7 @@ class EmptyConnection(BaseConnection):
     def connect(self) -> None:
         self._connected = True
 
-    def clean(self) -> None:
+    async def clean(self) -> None:
         self._connected = False
 
 
@@ -92,14 +206,164 @@ class BaseSubprocessConnection(BaseConnection):
     def connect(self) -> None:
         raise NotImplementedError
 
-    def clean(self) -> None:
+    async def clean(self) -> None:
         """Terminate connection subprocess."""
         if self.process is not None:
             self.process.terminate()
 
+    def _check_process(self, description: str) -> None:
+        """Raise error with stderr of subprocess if it already exited."""
+        if self.process is None or self.process.poll() is None:
+            return
+
+        raise JujuSpellError(
+            f"{description} exited with code {self.process.returncode}: "
+            f"{self._read_stderr().strip()}"
+        )
+
+    def _read_stderr(self) -> str:
+        """Read stderr of subprocess."""
+        if self.process is None or self.process.stderr is None:
+            return ""
+
+        return self.process.stderr.read().decode()
+
+
+class SshControlMaster(BaseSubprocessConnection):
+    """Ssh master connection shared by all port-forwards to the same destination.
+
+    The master session is opened only once for each destination and jumps chain, and
+    port-forwards are added to it on demand with `ssh -O forward`, so the ssh
+    handshake through bastions is done only once.
+    """
+
+    def __init__(self, destination: str, jumps: Optional[List[str]] = None):
+        """Configure ssh master connection.
+
+        :param destination: ssh destination, which may be specified as either
+                            [user@]hostname or a URI of the form
+                            `ssh://[user@]hostname[:port]`
+        :param jumps: connect to the destination by first making a ssh connection via
+                      list of jumps host described by destination
+        """
+        super().__init__()
+        self.destination = destination
+        self.jumps = jumps
+        self.forwards = 0  # number of port-forwards using this master
+        self._control_dir: Optional[str] = None
+        self._stderr: Optional[IO[bytes]] = None
+
+    @property
+    def control_path(self) -> str:
+        """Get path to control socket inside private directory created on first use."""
+        if self._control_dir is None:
+            self._control_dir = tempfile.mkdtemp(prefix="juju-spell-")
+
+        return os.path.join(self._control_dir, "control")
+
+    @property
+    def is_connected(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def connect(self) -> None:
+        """Start ssh master connection if it's not running."""
+        if self.is_connected:
+            return
+
+        logger.info("opening ssh master connection to %s", self.destination)
+        cmd = ["ssh", "-M", "-S", self.control_path, "-N", self.destination]
+        if self.jumps:
+            cmd.extend(["-J", ",".join(self.jumps)])
+
+        logger.debug("cmd `%s` will be executed", cmd)
+        # stderr of long-lived master goes to file, so ssh never blocks on full pipe
+        self._close_stderr()
+        # pylint: disable=R1732
+        self._stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=self._stderr)
+
+    def _read_stderr(self) -> str:
+        """Read stderr of ssh master connection from file."""
+        if self._stderr is None:
+            return ""
+
+        self._stderr.seek(0)
+        return self._stderr.read().decode()
+
+    def _close_stderr(self) -> None:
+        """Close file with stderr of ssh master connection."""
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    async def wait_ready(self, timeout: float = DEFAULT_CONNECTION_TIMEOUT) -> None:
+        """Wait until the control socket of master connection is created."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not os.path.exists(self.control_path):
+            self._check_process(f"ssh master connection to {self.destination}")
+            if loop.time() > deadline:
+                raise JujuSpellError(f"ssh master connection to {self.destination} timed out")
+
+            await asyncio.sleep(DEFAULT_PROBE_INTERVAL)
+
+    def _control_cmd(self, operation: str, *args: str) -> List[str]:
+        """Get command for ssh master connection."""
+        return ["ssh", "-S", self.control_path, "-O", operation, *args, self.destination]
+
+    async def forward(
+        self, local_target: str, remote_target: str, timeout: float = DEFAULT_CONNECTION_TIMEOUT
+    ) -> None:
+        """Add port-forward to master connection."""
+        await self.wait_ready(timeout)
+        cmd = self._control_cmd("forward", "-L", f"{local_target}:{remote_target}")
+        logger.debug("cmd `%s` will be executed", cmd)
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise JujuSpellError(
+                f"port forwarding {remote_target} to {local_target} via {self.destination} "
+                f"failed: {stderr.decode().strip()}"
+            )
+
+    async def cancel(self, local_target: str, remote_target: str) -> None:
+        """Cancel port-forward of master connection."""
+        if not self.is_connected:
+            return
+
+        cmd = self._control_cmd("cancel", "-L", f"{local_target}:{remote_target}")
+        logger.debug("cmd `%s` will be executed", cmd)
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        await process.communicate()
+
+    async def clean(self) -> None:
+        """Terminate ssh master connection and remove its control socket directory."""
+        await super().clean()
+        self.process = None
+        self._close_stderr()
+        if self._control_dir is not None:
+            shutil.rmtree(self._control_dir, ignore_errors=True)
+            self._control_dir = None
+
+
+_control_masters: Dict[Tuple[str, Tuple[str, ...]], SshControlMaster] = {}
 
-class SshPortForwardSubprocess(BaseSubprocessConnection):
-    """Shh port-forwarding connection with usage of subprocess."""
+
+def get_control_master(destination: str, jumps: Optional[List[str]] = None) -> SshControlMaster:
+    """Get ssh master connection shared for destination and jumps."""
+    key = (destination, tuple(jumps or ()))
+    if key not in _control_masters:
+        _control_masters[key] = SshControlMaster(destination, jumps)
+
+    return _control_masters[key]
+
+
+class SshMultiplexedPortForward(BaseConnection):
+    """Ssh port-forwarding connection using shared ssh master connection."""
 
     def __init__(
         self,
@@ -107,22 +371,25 @@ class SshPortForwardSubprocess(BaseSubprocessConnection):
         remote_target: str,
         destination: str,
         jumps: Optional[List[str]] = None,
+        timeout: float = DEFAULT_CONNECTION_TIMEOUT,
     ):
-        """Configure SshPortForward subprocess.
+        """Configure SshMultiplexedPortForward.
 
         Example:
         Call this object as follows
         ```python
-        connection = SshPortForwardSubprocess(
+        connection = SshMultiplexedPortForward(
             "localhost:17071", "10.1.1.99:17070", "gandalf@customer", ["bastion"]
         )
         connection.connect()
+        await connection.wait_ready()
         ...
-        connection.clean()
+        await connection.clean()
         ```
         is equivalent to
         ```bash
-        ssh -N -L localhost:17071:10.1.1.99:17070 -J bastion gandalf@customer
+        ssh -M -S <control-path> -N gandalf@customer -J bastion  # only once
+        ssh -S <control-path> -O forward -L localhost:17071:10.1.1.99:17070 gandalf@customer
         ```
         and it will port-forward the `10.1.1.99:17070` to `localhost:17071`.
 
@@ -134,34 +401,67 @@ class SshPortForwardSubprocess(BaseSubprocessConnection):
                             `ssh://[user@]hostname[:port]`
         :param jumps: connect to the destination by first making a ssh connection via
                       list of jumps host described by destination
+        :param timeout: maximum time in seconds to wait until port-forward is ready
         """
-        super().__init__()
         self.local_target = local_target
         self.remote_target = remote_target
-        self.destination = destination
-        self.jumps = jumps
+        self.master = get_control_master(destination, jumps)
+        self.timeout = timeout
+        self._connected = False
+        self._forwarded = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._forwarded and self.master.is_connected
 
     def connect(self) -> None:
-        """Create ssh tunnel."""
+        """Start shared ssh master connection."""
         logger.info(
             "port forwarding %s to %s via %s",
             self.remote_target,
             self.local_target,
-            self.destination,
+            self.master.destination,
         )
-        cmd = [
-            "ssh",
-            self.destination,
-            "-N",
-            "-L",
-            f"{self.local_target}:{self.remote_target}",
-        ]
-        if self.jumps:
-            cmd.append(" ".join(f"-J {jump}" for jump in self.jumps))
+        self.master.connect()
+        if not self._connected:
+            self.master.forwards += 1
+            self._connected = True
 
-        logger.debug("cmd `%s` will be executed", cmd)
-        # pylint: disable=R1732
-        self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    async def wait_ready(self) -> None:
+        """Add port-forward to shared ssh master connection and wait for local port.
+
+        The error is raised as soon as master connection exits.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        if not self._forwarded:
+            await self.master.forward(self.local_target, self.remote_target, self.timeout)
+            self._forwarded = True
+
+        host, port = _split_target(self.local_target)
+        while not await _is_port_open(host, port):
+            if not self.master.is_connected:
+                raise JujuSpellError(f"ssh master connection to {self.master.destination} exited")
+            if loop.time() > deadline:
+                raise JujuSpellError(f"port forwarding to {self.local_target} timed out")
+
+            await asyncio.sleep(DEFAULT_PROBE_INTERVAL)
+
+        logger.debug("port forwarding to %s is ready", self.local_target)
+
+    async def clean(self) -> None:
+        """Cancel port-forward and close master connection if it's not used anymore."""
+        if self._forwarded:
+            await self.master.cancel(self.local_target, self.remote_target)
+            self._forwarded = False
+
+        if self._connected:
+            self.master.forwards -= 1
+            self._connected = False
+            if self.master.forwards == 0:
+                await self.master.clean()
+
+        release_tcp_port(_split_target(self.local_target)[1])
 
 
 class SshuttleSubprocess(BaseSubprocessConnection):
@@ -178,7 +478,7 @@ class SshuttleSubprocess(BaseSubprocessConnection):
         )
         connection.connect()
         ...
-        connection.clean()
+        await connection.clean()
         ```
         is equivalent to
         ```bash
@@ -224,11 +524,13 @@ def get_connection(
     elif not sshuttle:
         port = get_free_tcp_port(controller_config.connection.port_range)
         controller_endpoint = f"localhost:{port}"
-        process = SshPortForwardSubprocess(
+        retry_policy = controller_config.retry_policy
+        process = SshMultiplexedPortForward(
             controller_endpoint,
             controller_config.endpoint,
             controller_config.connection.destination,
             controller_config.connection.jumps,
+            timeout=(retry_policy and retry_policy.timeout) or DEFAULT_CONNECTION_TIMEOUT,
         )
     elif sshuttle and controller_config.connection.subnets:
         process = SshuttleSubprocess(
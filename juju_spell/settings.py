@@ -29,11 +29,26 @@ PERSONAL_CONFIG_PATH = pathlib.Path(
     )
 )
 DEFAULT_CACHE_DIR = pathlib.Path(JUJUSPELL_DATA / "caches")
+DAEMON_SOCKET_PATH = pathlib.Path(
+    os.environ.get("JUJUSPELL_SOCKET", pathlib.Path(JUJUSPELL_DATA / "juju-spell.sock"))
+)
+DEFAULT_PRUNE_INTERVAL = 30  # seconds
+DEFAULT_MODEL_IDLE_TIMEOUT = 60  # seconds before idle model connection is closed
 DEFAULT_PORT_RANGE = range(17071, 17170)
-DEFAULT_RETRY_BACKOFF = 1.5  # seconds
+EPHEMERAL_PORT_RANGE_PATH = "/proc/sys/net/ipv4/ip_local_port_range"
+DEFAULT_RETRY_BACKOFF = 1.5  # base of exponential wait between retries
+DEFAULT_RETRY_JITTER = 0.5  # max random jitter as a fraction of wait time
 DEFAULT_CONNECTION_TIMEOUT = 60  # seconds
 DEFAULT_CONNECTION_WAIT = 1  # seconds
+DEFAULT_PROBE_INTERVAL = 0.05  # seconds between tunnel readiness probes
 DEFAULT_MAX_FRAME_SIZE = 6**24
+DEFAULT_MAX_CONCURRENCY = 10  # controllers processed at the same time
+DEFAULT_MODEL_ACCESS_BATCH_SIZE = 500  # model access changes in single API request
+DEFAULT_MODEL_CONCURRENCY = 5  # models of single controller connected at the same time
+DEFAULT_APPLICATION_CONCURRENCY = 5  # applications of single model configured at the same time
+DEFAULT_BATCH_SIZE = 5  # controllers in single batch
+DEFAULT_BATCH_INTERVAL = 0  # seconds
+DEFAULT_BATCH_FAILURE_RATIO = 0.5  # ratio of failed controllers to stop batches
 
 
 CROSS_FINGERS = """
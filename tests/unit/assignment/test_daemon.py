@@ -0,0 +1,161 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2023 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for assignment.daemon."""
+import argparse
+import asyncio
+import contextlib
+import socket
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+
+from juju_spell.assignment.daemon import (
+    ConfigMismatchError,
+    Daemon,
+    is_daemon_running,
+    request,
+)
+from juju_spell.config import Config
+from juju_spell.exceptions import JujuSpellError
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """Return path to daemon socket."""
+    return tmp_path / "juju-spell.sock"
+
+
+@contextlib.asynccontextmanager
+async def run_daemon(socket_path):
+    """Run daemon with mocked connection manager."""
+    with mock.patch("juju_spell.assignment.daemon.connect_manager") as mock_connect_manager:
+        mock_connect_manager.clean = mock.AsyncMock()
+        mock_connect_manager.prune = mock.AsyncMock()
+        daemon = Daemon(
+            Config(controllers=[]), {"test": MagicMock()}, socket_path, prune_interval=0.01
+        )
+        task = asyncio.ensure_future(daemon.serve())
+        while not is_daemon_running(socket_path):
+            await asyncio.sleep(0.01)
+
+        yield daemon, mock_connect_manager
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        mock_connect_manager.clean.assert_awaited_once()
+        assert not socket_path.exists()
+
+
+def test_is_daemon_running(socket_path):
+    """Test checking if daemon is running."""
+    assert is_daemon_running(socket_path) is False
+    socket_path.touch()  # regular file is not a socket
+    assert is_daemon_running(socket_path) is False
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.daemon.get_filtered_config")
+@mock.patch("juju_spell.assignment.daemon.iter_results")
+async def test_daemon_request(mock_iter_results, mock_get_filtered_config, socket_path):
+    """Test sending command to daemon."""
+    parsed_args = argparse.Namespace(filter="", run_type="serial", models=None)
+    exp_results = [{"context": {"name": "a"}, "success": True}, {"context": {"name": "b"}}]
+
+    async def _iter_results(*_):
+        for result in exp_results:
+            yield result
+
+    mock_iter_results.side_effect = _iter_results
+
+    async with run_daemon(socket_path) as (daemon, mock_connect_manager):
+        results = [
+            result async for result in request("test", parsed_args, daemon.config, socket_path)
+        ]
+        await asyncio.sleep(0.05)
+
+    assert results == exp_results
+    mock_get_filtered_config.assert_called_once_with(daemon.config, "")
+    mock_iter_results.assert_called_once_with(
+        mock_get_filtered_config.return_value,
+        daemon.commands["test"].return_value,
+        parsed_args,
+    )
+    mock_connect_manager.prune.assert_awaited()  # periodic pruning
+
+
+@pytest.mark.asyncio
+async def test_daemon_request_unsupported_command(socket_path):
+    """Test sending unsupported command to daemon."""
+    parsed_args = argparse.Namespace(filter="")
+
+    async with run_daemon(socket_path) as (daemon, _):
+        with pytest.raises(JujuSpellError, match="command `unknown` is not supported"):
+            async for _ in request("unknown", parsed_args, daemon.config, socket_path):
+                pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+async def test_daemon_request_different_config(socket_path, test_config):
+    """Test sending command to daemon with different configuration."""
+    parsed_args = argparse.Namespace(filter="")
+
+    async with run_daemon(socket_path):
+        with pytest.raises(ConfigMismatchError, match="started with different configuration"):
+            async for _ in request("test", parsed_args, test_config, socket_path):
+                pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+async def test_request_no_daemon(socket_path):
+    """Test sending command without running daemon."""
+    with pytest.raises(FileNotFoundError):
+        async for _ in request("test", argparse.Namespace(), Config(controllers=[]), socket_path):
+            pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+async def test_daemon_socket_permissions(socket_path):
+    """Test only owner can access daemon socket."""
+    async with run_daemon(socket_path):
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+
+
+@pytest.mark.asyncio
+async def test_daemon_already_running(socket_path):
+    """Test daemon refuses to start if other daemon is listening on socket."""
+    async with run_daemon(socket_path):
+        daemon = Daemon(Config(controllers=[]), {}, socket_path)
+        with pytest.raises(JujuSpellError, match="daemon is already running"):
+            await daemon.serve()
+
+        assert is_daemon_running(socket_path)
+
+
+@pytest.mark.asyncio
+async def test_daemon_stale_socket(socket_path):
+    """Test daemon replaces socket, which nobody listens on."""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()  # socket file is left without listening process
+
+    async with run_daemon(socket_path) as (daemon, _):
+        await asyncio.sleep(0.05)  # socket exists before daemon starts listening
+        with pytest.raises(JujuSpellError, match="command `unknown` is not supported"):
+            async for _ in request("unknown", argparse.Namespace(), daemon.config, socket_path):
+                pass  # pragma: no cover
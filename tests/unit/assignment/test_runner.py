@@ -15,12 +15,22 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Tests for assignment.runner."""
 import argparse
+import asyncio
 from unittest import mock
 from unittest.mock import MagicMock
 
 import pytest
 
-from juju_spell.assignment.runner import get_result, run_serial
+from juju_spell.assignment.runner import (
+    get_result,
+    get_risk_concurrency,
+    run,
+    run_batch,
+    run_parallel,
+    run_risk,
+    run_serial,
+    stream,
+)
 from juju_spell.commands.base import Result
 
 
@@ -167,3 +177,239 @@ async def test_run_serial(mock_get_result, mock_get_controller, steps, parsed_ar
             )
 
         mock_get_result.assert_has_calls([mock.call(controller_config, exp_output)])
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller", new_callable=mock.AsyncMock)
+@mock.patch("juju_spell.assignment.runner.get_result")
+@pytest.mark.parametrize("max_concurrency", [1, 2, 5])
+async def test_run_parallel(mock_get_result, mock_get_controller, max_concurrency):
+    """Test run in parallel keeps config order and respects concurrency limit."""
+    controllers = [MagicMock() for _ in range(5)]
+    config = mock.MagicMock()
+    config.controllers = controllers
+    parsed_args = argparse.Namespace(dry_run=False, max_concurrency=max_concurrency)
+    mock_get_controller.side_effect = lambda controller_config: controller_config
+    mock_get_result.side_effect = lambda controller_config, output: output
+    running = 0
+    max_running = 0
+
+    async def _run(controller, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # the first controller will finish last
+        await asyncio.sleep(0.01 * (len(controllers) - controllers.index(controller)))
+        running -= 1
+        return controllers.index(controller)
+
+    command = mock.AsyncMock()
+    command.pre_check.return_value = None
+    command.run.side_effect = _run
+
+    result = await run_parallel(config, command, parsed_args)
+
+    assert result == list(range(len(controllers)))
+    assert max_running == max_concurrency
+    for controller_config in controllers:
+        command.run.assert_any_await(
+            controller=controller_config,
+            dry_run=False,
+            max_concurrency=max_concurrency,
+            controller_config=controller_config,
+        )
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.get_controller", new_callable=mock.AsyncMock)
+async def test_run_parallel_exception(mock_get_controller):
+    """Test run in parallel with connection failure of single controller."""
+    config = mock.MagicMock()
+    config.controllers = [MagicMock(), MagicMock()]
+    parsed_args = argparse.Namespace(dry_run=False, max_concurrency=2)
+    mock_get_controller.side_effect = [ValueError("connection failed"), MagicMock()]
+    command = mock.AsyncMock()
+    command.pre_check.return_value = None
+    command.run.return_value = Result(True, "test")
+
+    results = await run_parallel(config, command, parsed_args)
+
+    assert [result["success"] for result in results] == [False, True]
+    assert str(results[0]["error"]) == "connection failed"
+    command.run.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.asyncio.sleep", new_callable=mock.AsyncMock)
+@mock.patch("juju_spell.assignment.runner.get_controller", new_callable=mock.AsyncMock)
+async def test_run_batch_connection_failure(mock_get_controller, mock_sleep):
+    """Test connection failures are counted to failure ratio of batches."""
+    config = mock.MagicMock()
+    config.controllers = [MagicMock() for _ in range(4)]
+    parsed_args = argparse.Namespace(
+        dry_run=False, batch_size=2, batch_interval=10, batch_failure_ratio=0.4
+    )
+    mock_get_controller.side_effect = ConnectionError("unreachable")
+    command = mock.AsyncMock()
+
+    results = await run_batch(config, command, parsed_args)
+
+    assert mock_get_controller.await_count == 2
+    assert all(not result["success"] for result in results)
+    assert all(isinstance(result["error"], ConnectionError) for result in results[:2])
+    assert all("skipped" in str(result["error"]) for result in results[2:])
+    command.pre_check.assert_not_awaited()
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.asyncio.sleep", new_callable=mock.AsyncMock)
+@mock.patch("juju_spell.assignment.runner.run_controller", new_callable=mock.AsyncMock)
+@pytest.mark.parametrize(
+    "successes, batch_size, failure_ratio, exp_run, exp_sleeps",
+    [
+        ([], 2, 0.5, 0, 0),  # no controller
+        ([True] * 5, 2, 0.5, 5, 2),
+        ([True] * 5, 5, 0.5, 5, 0),
+        ([False, True, True, True, True], 2, 0.5, 5, 2),
+        ([False, False, True, True, True], 2, 0.5, 2, 0),
+        ([True, True, False, False, True, True], 2, 0.4, 4, 1),
+        ([False, False, False, False, False], 2, 1.0, 5, 2),
+        ([True, False, True, True], 2, 0.0, 2, 0),
+    ],
+)
+async def test_run_batch(
+    mock_run_controller,
+    mock_sleep,
+    successes,
+    batch_size,
+    failure_ratio,
+    exp_run,
+    exp_sleeps,
+):
+    """Test run in batches."""
+    config = mock.MagicMock()
+    config.controllers = [MagicMock() for _ in successes]
+    parsed_args = argparse.Namespace(
+        dry_run=False,
+        batch_size=batch_size,
+        batch_interval=10,
+        batch_failure_ratio=failure_ratio,
+    )
+    command = mock.AsyncMock()
+    mock_run_controller.side_effect = lambda controller_config, *_: {
+        "success": successes[config.controllers.index(controller_config)]
+    }
+
+    results = await run_batch(config, command, parsed_args)
+
+    assert len(results) == len(config.controllers)
+    assert mock_run_controller.await_count == exp_run
+    assert mock_sleep.await_count == exp_sleeps
+    for result, exp_success in zip(results[:exp_run], successes):
+        assert result["success"] == exp_success
+    for result in results[exp_run:]:
+        assert result["success"] is False
+        assert "skipped" in str(result["error"])
+
+
+@pytest.mark.parametrize(
+    "risk, max_concurrency, exp_concurrency",
+    [(1, 10, 10), (2, 10, 8), (3, 10, 5), (4, 10, 2), (5, 10, 1), (4, 1, 1), (1, 1, 1)],
+)
+def test_get_risk_concurrency(risk, max_concurrency, exp_concurrency):
+    """Test getting concurrency for risk level."""
+    assert get_risk_concurrency(risk, max_concurrency) == exp_concurrency
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner._iter_concurrently")
+@pytest.mark.parametrize(
+    "risks, successes, exp_waves",
+    [
+        ([], [], []),  # no controller
+        # canary and doubling wave size up to max concurrency
+        ([1] * 8, [True] * 8, [[0], [1, 2], [3, 4, 5, 6], [7]]),
+        # lowest risk first and serial run for the highest risk
+        ([5, 5, 1, 1, 1], [True] * 5, [[2], [3, 4], [0], [1]]),
+        ([3, 1, 3, 3, 3, 3], [True] * 6, [[1], [0, 2], [3, 4], [5]]),
+        # stop after failure
+        ([1, 1, 1, 1, 5], [True, False, True, True, True], [[0], [1, 2]]),
+        ([5, 1], [True, False], [[1]]),
+    ],
+)
+async def test_run_risk(mock_iter_concurrently, risks, successes, exp_waves):
+    """Test run ordered by risk."""
+    config = mock.MagicMock()
+    config.controllers = [MagicMock(risk=risk) for risk in risks]
+    parsed_args = argparse.Namespace(dry_run=False, max_concurrency=4)
+    command = mock.AsyncMock()
+    waves = []
+
+    async def _iter_concurrently(controllers, *_):
+        waves.append([index for index, _ in controllers])
+        for index, _ in controllers:
+            yield index, {"success": successes[index], "index": index}
+
+    mock_iter_concurrently.side_effect = _iter_concurrently
+
+    results = await run_risk(config, command, parsed_args)
+
+    assert waves == exp_waves
+    assert len(results) == len(config.controllers)
+    run_indexes = [index for wave in waves for index in wave]
+    for index, result in enumerate(results):
+        if index in run_indexes:
+            assert result == {"success": successes[index], "index": index}
+        else:
+            assert result["success"] is False
+            assert "skipped" in str(result["error"])
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.flush_cache")
+@mock.patch("juju_spell.assignment.runner.connect_manager")
+@mock.patch("juju_spell.assignment.runner.run_controller", new_callable=mock.AsyncMock)
+@pytest.mark.parametrize("run_type", ["parallel", "serial"])
+async def test_stream(mock_run_controller, mock_connect_manager, mock_flush_cache, run_type):
+    """Test streaming results as they are completed."""
+    mock_connect_manager.clean = mock.AsyncMock()
+    config = mock.MagicMock()
+    config.controllers = [MagicMock(), MagicMock(), MagicMock()]
+    parsed_args = argparse.Namespace(dry_run=False, run_type=run_type, max_concurrency=3)
+
+    async def _run_controller(controller_config, *_):
+        index = config.controllers.index(controller_config)
+        await asyncio.sleep(0.01 * (len(config.controllers) - index))
+        return index
+
+    mock_run_controller.side_effect = _run_controller
+
+    results = [result async for result in stream(config, mock.AsyncMock(), parsed_args)]
+
+    # parallel results are yielded in order of completion
+    assert results == ([2, 1, 0] if run_type == "parallel" else [0, 1, 2])
+    mock_connect_manager.clean.assert_awaited_once()
+    # flushed after results and after background tasks of command
+    assert mock_flush_cache.call_count == 2
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.assignment.runner.flush_cache")
+@mock.patch("juju_spell.assignment.runner.connect_manager")
+@mock.patch("juju_spell.assignment.runner.run_serial", new_callable=mock.AsyncMock)
+@mock.patch("juju_spell.assignment.runner.wait_background_tasks", new_callable=mock.AsyncMock)
+async def test_run_flush_cache(
+    mock_wait_background_tasks, mock_run_serial, mock_connect_manager, mock_flush_cache
+):
+    """Test background tasks are awaited and cache is flushed after run, even if it fails."""
+    mock_connect_manager.clean = mock.AsyncMock()
+    mock_run_serial.side_effect = ValueError()
+    parsed_args = argparse.Namespace(run_type="serial")
+
+    with pytest.raises(ValueError):
+        await run(MagicMock(), mock.AsyncMock(), parsed_args)
+
+    mock_wait_background_tasks.assert_awaited_once_with()
+    mock_flush_cache.assert_called_once_with()
+    mock_connect_manager.clean.assert_awaited_once()
@@ -21,8 +21,15 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from juju_spell.assignment.daemon import ConfigMismatchError
 from juju_spell.config import Controller
 from juju_spell.exceptions import JujuSpellError
+from juju_spell.settings import (
+    DEFAULT_BATCH_FAILURE_RATIO,
+    DEFAULT_BATCH_INTERVAL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+)
 
 
 def test_base_cmd_fill_parser(base_cmd):
@@ -49,6 +56,19 @@ def test_base_cmd_run(base_cmd):
     mock_after.assert_called_once_with(parsed_args)
 
 
+@patch("juju_spell.cli.base.emit")
+def test_base_cmd_run_streamed(mock_emit, base_cmd):
+    """Test run from BaseCMD with already streamed output."""
+    parsed_args = argparse.Namespace(**{"test": True})
+    base_cmd.execute_cli = MagicMock(return_value=None)
+    base_cmd.format_output = mock_format_output = MagicMock()
+
+    assert base_cmd.run(parsed_args) == 0
+
+    mock_format_output.assert_not_called()
+    mock_emit.message.assert_not_called()
+
+
 @patch("juju_spell.cli.base.emit")
 def test_base_cmd_run_exception(mock_emit, base_cmd):
     """Test run exceptions from BaseCMD."""
@@ -79,10 +99,18 @@ def test_base_cmd_format_output(output, exp_formatted_output, base_cmd):
     assert base_cmd.format_output(output) == exp_formatted_output
 
 
+@patch("juju_spell.cli.base.parse_ratio")
+@patch("juju_spell.cli.base.parse_non_negative_float")
+@patch("juju_spell.cli.base.parse_positive_int")
 @patch("juju_spell.cli.base.parse_filter")
 @patch("juju_spell.cli.base.parse_comma_separated_str")
 def test_base_juju_cmd_fill_parser(
-    mock_parse_comma_separated_str, mock_parse_filter, base_juju_cmd
+    mock_parse_comma_separated_str,
+    mock_parse_filter,
+    mock_parse_positive_int,
+    mock_parse_non_negative_float,
+    mock_parse_ratio,
+    base_juju_cmd,
 ):
     """Test add additional CLI arguments with BaseJujuCMD."""
     parser = MagicMock()
@@ -99,9 +127,9 @@ def test_base_juju_cmd_fill_parser(
             mock.call(
                 "--run-type",
                 type=str,
-                choices=["parallel", "batch", "serial"],
+                choices=["parallel", "batch", "risk", "serial"],
                 default="serial",
-                help="parallel, batch or serial",
+                help="parallel, batch, risk or serial",
             ),
             mock.call(
                 "--filter",
@@ -114,6 +142,37 @@ def test_base_juju_cmd_fill_parser(
                 ),
             ),
             mock.call("--models", type=mock_parse_comma_separated_str, help="model filter"),
+            mock.call(
+                "--max-concurrency",
+                type=mock_parse_positive_int,
+                default=DEFAULT_MAX_CONCURRENCY,
+                help="Maximum number of controllers processed at once with parallel run-type.",
+            ),
+            mock.call(
+                "--batch-size",
+                type=mock_parse_positive_int,
+                default=DEFAULT_BATCH_SIZE,
+                help="Number of controllers in single batch with batch run-type.",
+            ),
+            mock.call(
+                "--batch-interval",
+                type=mock_parse_non_negative_float,
+                default=DEFAULT_BATCH_INTERVAL,
+                help="Seconds to wait between batches with batch run-type.",
+            ),
+            mock.call(
+                "--batch-failure-ratio",
+                type=mock_parse_ratio,
+                default=DEFAULT_BATCH_FAILURE_RATIO,
+                help="Stop next batches when ratio of failed controllers exceeds this value.",
+            ),
+            mock.call(
+                "--output",
+                type=str,
+                choices=["json", "ndjson"],
+                default="json",
+                help="json output after all controllers or ndjson streamed per controller",
+            ),
         ]
     )
 
@@ -137,6 +196,61 @@ async def test_base_juju_cmd_execute(mock_get_filtered_config, mock_asyncio, _,
     assert result == task.result.return_value
 
 
+@patch("juju_spell.cli.base.emit")
+@patch("juju_spell.cli.base.run", new_callable=MagicMock)
+@patch("juju_spell.cli.base.asyncio")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute_swr(_, mock_asyncio, mock_run, mock_emit, base_juju_cmd):
+    """Test swr is ignored with json output, which would wait for background refresh."""
+    parsed_args = argparse.Namespace(**{"filter": None, "output": "json", "swr": True})
+    mock_asyncio.get_event_loop.return_value = MagicMock()
+
+    base_juju_cmd.execute_cli(parsed_args)
+
+    assert parsed_args.swr is False
+    mock_emit.progress.assert_called_once()
+    assert mock_run.call_args.args[2].swr is False
+
+
+@patch("juju_spell.cli.base.asyncio")
+@patch("juju_spell.cli.base.get_filtered_config")
+def test_base_juju_cmd_execute_ndjson(mock_get_filtered_config, mock_asyncio, base_juju_cmd):
+    """Test streaming output of BaseJujuCMD."""
+    parsed_args = argparse.Namespace(**{"filter": None, "output": "ndjson"})
+    mock_asyncio.get_event_loop.return_value = loop = MagicMock()
+    base_juju_cmd.stream_output = mock_stream_output = MagicMock()
+
+    result = base_juju_cmd.execute_cli(parsed_args)
+
+    assert result is None
+    mock_stream_output.assert_called_once_with(mock_get_filtered_config.return_value, parsed_args)
+    loop.run_until_complete.assert_called_once_with(mock_stream_output.return_value)
+    loop.create_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("juju_spell.cli.base.emit")
+@patch("juju_spell.cli.base.stream")
+async def test_base_juju_cmd_stream_output(mock_stream, mock_emit, base_juju_cmd):
+    """Test printing each result as single JSON line."""
+    results = [{"context": {"name": "a"}, "success": True}, {"context": {"name": "b"}}]
+
+    async def _stream(*_):
+        for result in results:
+            yield result
+
+    mock_stream.side_effect = _stream
+
+    await base_juju_cmd.stream_output(MagicMock(), argparse.Namespace())
+
+    mock_emit.message.assert_has_calls(
+        [
+            mock.call('{"context": {"name": "a"}, "success": true}'),
+            mock.call('{"context": {"name": "b"}}'),
+        ]
+    )
+
+
 def test_base_juju_cmd_execute_exception(base_juju_cmd):
     """Test add additional CLI arguments with BaseJujuCMD."""
     parsed_args = argparse.Namespace(**{"filter": None})
@@ -180,3 +294,64 @@ def test_juju_write_cmd_run(mock_run, parsed_args, confirm_return_value, execute
         juju_write_cmd.run(parsed_args)
 
     assert (mock_run.call_count != 0) == executed
+
+
+@patch("juju_spell.cli.base.is_daemon_running", return_value=True)
+@patch("juju_spell.cli.base.asyncio")
+def test_juju_read_cmd_execute_daemon(mock_asyncio, _, juju_read_cmd):
+    """Test executing read command with daemon."""
+    parsed_args = argparse.Namespace(**{"filter": None})
+    mock_asyncio.get_event_loop.return_value = loop = MagicMock()
+    juju_read_cmd.execute_daemon = mock_execute_daemon = MagicMock()
+
+    result = juju_read_cmd.execute_cli(parsed_args)
+
+    mock_execute_daemon.assert_called_once_with(parsed_args)
+    loop.run_until_complete.assert_called_once_with(mock_execute_daemon.return_value)
+    assert result == loop.run_until_complete.return_value
+
+
+@pytest.mark.parametrize("error", [ConnectionRefusedError, FileNotFoundError, ConfigMismatchError])
+@patch("juju_spell.cli.base.BaseJujuCMD.execute_cli")
+@patch("juju_spell.cli.base.is_daemon_running", return_value=True)
+@patch("juju_spell.cli.base.asyncio")
+def test_juju_read_cmd_execute_daemon_fallback(
+    mock_asyncio, _, mock_execute_cli, error, juju_read_cmd
+):
+    """Test executing read command without accessible daemon."""
+    parsed_args = argparse.Namespace(**{"filter": None})
+    mock_asyncio.get_event_loop.return_value.run_until_complete.side_effect = error
+    juju_read_cmd.execute_daemon = MagicMock()
+
+    result = juju_read_cmd.execute_cli(parsed_args)
+
+    mock_execute_cli.assert_called_once_with(parsed_args)
+    assert result == mock_execute_cli.return_value
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("output", ["json", "ndjson"])
+@patch("juju_spell.cli.base.emit")
+@patch("juju_spell.cli.base.request")
+async def test_juju_read_cmd_execute_daemon_output(mock_request, mock_emit, output, juju_read_cmd):
+    """Test receiving results from daemon."""
+    parsed_args = argparse.Namespace(**{"filter": None, "output": output})
+    results = [{"context": {"name": "a"}}, {"context": {"name": "b"}}]
+
+    async def _request(*_):
+        for result in results:
+            yield result
+
+    mock_request.side_effect = _request
+
+    retval = await juju_read_cmd.execute_daemon(parsed_args)
+
+    mock_request.assert_called_once_with(juju_read_cmd.name, parsed_args, juju_read_cmd.config)
+    if output == "ndjson":
+        assert retval is None
+        mock_emit.message.assert_has_calls(
+            [mock.call('{"context": {"name": "a"}}'), mock.call('{"context": {"name": "b"}}')]
+        )
+    else:
+        assert retval == results
+        mock_emit.message.assert_not_called()
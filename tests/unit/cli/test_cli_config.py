@@ -8,6 +8,7 @@ import pytest as pytest
 import yaml
 
 from juju_spell.cli.config import ConfigCMD, KeyValue, get_application_config
+from juju_spell.cli.utils import parse_positive_int
 from juju_spell.commands.config import ApplicationConfig
 
 TEST_APPLICATION_YAML = """
@@ -33,7 +34,7 @@ def test_fill_parser():
     cmd = ConfigCMD(None)
     cmd.fill_parser(parser)
 
-    assert parser.add_argument.call_count == 9
+    assert parser.add_argument.call_count == 16
     parser.add_argument.assert_has_calls(
         [
             mock.call(
@@ -60,6 +61,18 @@ def test_fill_parser():
                 required=False,
                 help="The path to yaml-formatted application config.",
             ),
+            mock.call(
+                "--app-concurrency",
+                type=parse_positive_int,
+                default=5,
+                help="Maximum number of applications of single model configured at once.",
+            ),
+            mock.call(
+                "--verify",
+                default=False,
+                action="store_true",
+                help="Read config back from applications after it was set.",
+            ),
         ]
     )
 
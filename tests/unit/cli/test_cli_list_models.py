@@ -25,6 +25,12 @@ def test_fill_parser():
                 action="store_true",
                 help="This will force refresh all models from the controllers.",
             ),
+            mock.call(
+                "--swr",
+                default=False,
+                action="store_true",
+                help="Return cached models and refresh stale models in background.",
+            ),
         ]
     )
 
@@ -0,0 +1,72 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright 2023 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for serve cli command."""
+import argparse
+import signal
+from unittest import mock
+
+from juju_spell.cli import PingCMD, StatusCMD
+from juju_spell.cli.base import JujuReadCMD
+from juju_spell.cli.serve import ServeCMD, get_read_commands
+
+
+def test_fill_parser():
+    """Test serve command has no arguments."""
+    parser = mock.MagicMock(spec=argparse.ArgumentParser)
+
+    ServeCMD(None).fill_parser(parser)
+
+    parser.add_argument.assert_not_called()
+
+
+@mock.patch("juju_spell.cli.serve.asyncio")
+@mock.patch("juju_spell.cli.serve.Daemon")
+def test_execute_cli(mock_daemon, mock_asyncio):
+    """Test running daemon."""
+    config = mock.MagicMock()
+    mock_asyncio.get_event_loop.return_value = loop = mock.MagicMock()
+
+    result = ServeCMD(config).execute_cli(argparse.Namespace())
+
+    assert result is None
+    mock_daemon.assert_called_once_with(config, mock.ANY)
+    commands = mock_daemon.call_args[0][1]
+    assert commands[PingCMD.name] == PingCMD.command
+    assert commands[StatusCMD.name] == StatusCMD.command
+    loop.create_task.assert_called_once_with(mock_daemon.return_value.serve.return_value)
+    loop.add_signal_handler.assert_has_calls(
+        [
+            mock.call(signal.SIGINT, loop.create_task.return_value.cancel),
+            mock.call(signal.SIGTERM, loop.create_task.return_value.cancel),
+        ]
+    )
+    loop.run_until_complete.assert_called_once_with(loop.create_task.return_value)
+
+
+def test_get_read_commands():
+    """Test getting commands of direct and indirect subclasses of JujuReadCMD."""
+
+    class IndirectCMD(PingCMD):
+        name = "indirect-ping"
+
+    class AbstractCMD(JujuReadCMD):
+        name = None
+
+    commands = get_read_commands()
+
+    assert commands[PingCMD.name] == PingCMD.command
+    assert commands[IndirectCMD.name] == PingCMD.command
+    assert AbstractCMD.name not in commands
@@ -9,7 +9,9 @@ import yaml
 
 from juju_spell.cli import UpdatePackages
 from juju_spell.cli.update_packages import get_patch_config
+from juju_spell.cli.utils import parse_max_unavailable
 from juju_spell.commands.update_packages import Application, PackageToUpdate, Updates
+from juju_spell.exceptions import JujuSpellError
 from juju_spell.utils import load_yaml_file
 
 TEST_PATCH = """
@@ -25,17 +27,16 @@ applications:
 """
 
 TEST_UPDATES = Updates(
-    [
+    (
         Application(
             name_expr="^.*ubuntu.*$",
             dist_upgrade=True,
-            results=[],
-            packages_to_update=[
+            packages_to_update=(
                 PackageToUpdate(package="nova-common", version="2:21.2.4-0ubuntu2.1"),
                 PackageToUpdate(package="python3-nova", version="2:21.2.4-0ubuntu2.1"),
-            ],
-        )
-    ]
+            ),
+        ),
+    )
 )
 
 
@@ -47,10 +48,29 @@ def test_fill_parser():
     cmd.fill_parser(parser)
 
     # This one is to check the basic arguments is been added.
-    assert parser.add_argument.call_count == 6
+    assert parser.add_argument.call_count == 14
     parser.add_argument.assert_has_calls(
         [
             mock.call("--patch", type=get_patch_config, help="patch file", required=True),
+            mock.call(
+                "--max-unavailable",
+                type=parse_max_unavailable,
+                default="1",
+                help="Number or percentage of units of application updated at the same time.",
+            ),
+            mock.call(
+                "--refresh",
+                default=False,
+                action="store_true",
+                help="Run dry-run on all units instead of using cached results.",
+            ),
+            mock.call(
+                "--raw-output",
+                type=str,
+                choices=["full", "truncated", "compressed"],
+                default="full",
+                help="Store full, truncated or compressed raw output of units.",
+            ),
         ]
     )
 
@@ -75,3 +95,12 @@ def test_get_patch_config(mock_load_patch_file, input_yaml):
     real: Updates = get_patch_config(file_path="test")
     assert real == TEST_UPDATES
     mock_load_patch_file.assert_called_once_with(Path("test"))
+
+
+@mock.patch("juju_spell.utils.load_yaml_file")
+def test_get_patch_config_invalid_expression(mock_load_patch_file):
+    """Test get_patch_config with invalid application expression."""
+    mock_load_patch_file.return_value = {"applications": [{"application": "^nova-(.*$"}]}
+
+    with pytest.raises(JujuSpellError, match=r"application\['\^nova-\(\.\*\$'\] is not valid"):
+        get_patch_config(file_path="test")
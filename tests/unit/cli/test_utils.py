@@ -8,6 +8,10 @@ from juju_spell.cli.utils import (
     confirm,
     parse_comma_separated_str,
     parse_filter,
+    parse_max_unavailable,
+    parse_non_negative_float,
+    parse_positive_int,
+    parse_ratio,
 )
 from juju_spell.exceptions import AbortError, JujuSpellError
 
@@ -106,3 +110,55 @@ def test_parse_filter_exception(value):
     """Test parse_filter raising exception."""
     with pytest.raises(ArgumentTypeError):
         parse_filter(value)
+
+
+@pytest.mark.parametrize("value, exp_result", [("1", 1), ("10", 10)])
+def test_parse_positive_int(value, exp_result):
+    """Test parse_positive_int with valid value."""
+    assert parse_positive_int(value) == exp_result
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "a", "1.5"])
+def test_parse_positive_int_exception(value):
+    """Test parse_positive_int raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_positive_int(value)
+
+
+@pytest.mark.parametrize("value, exp_result", [("0", 0.0), ("0.5", 0.5), ("10", 10.0)])
+def test_parse_non_negative_float(value, exp_result):
+    """Test parse_non_negative_float with valid value."""
+    assert parse_non_negative_float(value) == exp_result
+
+
+@pytest.mark.parametrize("value", ["-0.1", "-1", "a", "nan", "inf"])
+def test_parse_non_negative_float_exception(value):
+    """Test parse_non_negative_float raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_non_negative_float(value)
+
+
+@pytest.mark.parametrize("value, exp_result", [("0", 0.0), ("0.25", 0.25), ("1", 1.0)])
+def test_parse_ratio(value, exp_result):
+    """Test parse_ratio with valid value."""
+    assert parse_ratio(value) == exp_result
+
+
+@pytest.mark.parametrize("value", ["-0.1", "1.1", "a"])
+def test_parse_ratio_exception(value):
+    """Test parse_ratio raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_ratio(value)
+
+
+@pytest.mark.parametrize("value, exp_result", [("1", "1"), ("10", "10"), ("25%", "25%")])
+def test_parse_max_unavailable(value, exp_result):
+    """Test parse_max_unavailable with valid value."""
+    assert parse_max_unavailable(value) == exp_result
+
+
+@pytest.mark.parametrize("value", ["0", "a", "0%", "101%", "a%"])
+def test_parse_max_unavailable_exception(value):
+    """Test parse_max_unavailable raising exception."""
+    with pytest.raises(ArgumentTypeError):
+        parse_max_unavailable(value)
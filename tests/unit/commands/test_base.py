@@ -15,10 +15,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """JujuSpell tests for base juju command."""
+import asyncio
 from unittest import mock
 
 import pytest
 
+from juju_spell.cache import CachePolicy
+from juju_spell.commands.base import wait_background_tasks
 from juju_spell.exceptions import JujuSpellError
 
 
@@ -27,6 +30,15 @@ class TestBaseJujuCommand:
         """Test BaseJujuCommand initialization."""
         assert test_juju_command.name == "TestJujuCommand"
         assert test_juju_command.logger.name == test_juju_command.name
+        assert test_juju_command.command_name == "test-juju"
+
+    def test_get_cache_policy(self, test_juju_command):
+        """Test getting cache policy of command."""
+        policy, default = CachePolicy(ttl=30), CachePolicy(ttl=60)
+
+        assert test_juju_command.get_cache_policy({"test-juju": policy}, default) == policy
+        assert test_juju_command.get_cache_policy({"list-models": policy}, default) == default
+        assert test_juju_command.get_cache_policy({}) == CachePolicy()
 
     @pytest.mark.asyncio
     async def test_dry_run(self, test_juju_command):
@@ -85,3 +97,28 @@ class TestBaseJujuCommand:
         assert result.success is False
         assert result.output is None
         assert result.error == exp_error
+
+    @pytest.mark.asyncio
+    async def test_run_in_background(self, test_juju_command):
+        """Test running tasks in background."""
+        calls = []
+
+        async def _task(name, fail=False):
+            await asyncio.sleep(0.01)
+            calls.append(name)
+            if fail:
+                raise Exception("test")
+
+        task = test_juju_command.run_in_background("key1", _task("first"))
+        same_task = test_juju_command.run_in_background("key1", _task("second"))
+        test_juju_command.run_in_background("key2", _task("third", fail=True))
+
+        assert task is same_task
+        assert calls == []
+        await wait_background_tasks()
+        assert sorted(calls) == ["first", "third"]
+
+        # key can be used again after task is done
+        test_juju_command.run_in_background("key1", _task("fourth"))
+        await wait_background_tasks()
+        assert calls[-1] == "fourth"
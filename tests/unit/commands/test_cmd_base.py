@@ -1,6 +1,9 @@
-from unittest.mock import AsyncMock, MagicMock, call
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
+from juju.client import client
+from juju.errors import JujuError
 
 
 @pytest.mark.asyncio
@@ -77,6 +80,75 @@ async def test_get_filtered_models_mapping(
     assert mock_model.disconnect.await_count == len(models)
 
 
+def _mock_concurrent_controller(delays):
+    """Get mocked controller connecting models with delays and counting connections."""
+    controller = AsyncMock()
+    controller.list_models.return_value = list(delays)
+    controller.connected, controller.max_connected = 0, 0
+
+    async def get_model(name):
+        controller.connected += 1
+        controller.max_connected = max(controller.max_connected, controller.connected)
+        await asyncio.sleep(delays[name])
+        model = AsyncMock()
+        model.name = name
+
+        async def disconnect():
+            controller.connected -= 1
+
+        model.disconnect.side_effect = disconnect
+        return model
+
+    controller.get_model.side_effect = get_model
+    return controller
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [1, 2, 5])
+async def test_get_filtered_models_concurrently(max_concurrency, test_juju_command):
+    """Test limiting number of connected models."""
+    delays = {"model1": 0.03, "model2": 0.01, "model3": 0.02, "model4": 0, "model5": 0.01}
+    controller = _mock_concurrent_controller(delays)
+
+    models = [
+        name
+        async for name, model in test_juju_command.get_filtered_models(
+            controller, {}, None, max_concurrency=max_concurrency
+        )
+    ]
+
+    assert sorted(models) == list(delays)
+    assert controller.max_connected == max_concurrency
+    assert controller.connected == 0
+
+
+@pytest.mark.asyncio
+async def test_get_filtered_models_ready_order(test_juju_command):
+    """Test yielding models as soon as they are connected."""
+    delays = {"model1": 0.03, "model2": 0.01, "model3": 0.02}
+    controller = _mock_concurrent_controller(delays)
+
+    models = [
+        name async for name, _ in test_juju_command.get_filtered_models(controller, {}, None)
+    ]
+
+    assert models == ["model2", "model3", "model1"]
+
+
+@pytest.mark.asyncio
+async def test_get_filtered_models_break(test_juju_command):
+    """Test disconnecting all models when processing is stopped."""
+    delays = {"model1": 0, "model2": 0, "model3": 0}
+    controller = _mock_concurrent_controller(delays)
+
+    models_generator = test_juju_command.get_filtered_models(controller, {}, None)
+    async for _ in models_generator:
+        break
+
+    await models_generator.aclose()
+    assert controller.connected == 0
+
+
 @pytest.mark.asyncio
 async def test_run(test_juju_command):
     """Test run for any juju command."""
@@ -90,3 +162,79 @@ async def test_run(test_juju_command):
 def test_need_shuttle(test_juju_command):
     """Test default return value for need_shuttle property."""
     assert test_juju_command.need_sshuttle is False
+
+
+@pytest.mark.asyncio
+async def test_get_filtered_model_uuids(test_juju_command):
+    """Test getting model UUIDs from single listing of models."""
+    mock_controller = AsyncMock()
+    mock_controller.model_uuids.return_value = {"model1": "uuid1", "model2": "uuid2"}
+
+    model_uuids = await test_juju_command.get_filtered_model_uuids(
+        mock_controller, {"default": ["model2"]}, ["default", "uuid3"]
+    )
+
+    assert model_uuids == {"model2": "uuid2", "uuid3": "uuid3"}
+    mock_controller.model_uuids.assert_awaited_once()
+    mock_controller.get_model.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "batch_size, exp_calls, exp_batches",
+    [
+        (
+            500,
+            6,
+            [[f"model-uuid{i}" for i in range(5)]] + [[f"model-uuid{i}"] for i in range(5)],
+        ),
+        (
+            2,
+            5,
+            [
+                ["model-uuid0", "model-uuid1"],
+                ["model-uuid2", "model-uuid3"],
+                ["model-uuid2"],
+                ["model-uuid3"],
+                ["model-uuid4"],
+            ],
+        ),
+        (1, 5, [[f"model-uuid{i}"] for i in range(5)]),
+    ],
+)
+@patch("juju_spell.commands.base.client.ModelManagerFacade.from_connection")
+async def test_modify_models_access(mock_from_connection, batch_size, exp_calls, exp_batches):
+    """Test changing access to models in batches."""
+    from juju_spell.commands.base import modify_models_access
+
+    model_uuids = [f"uuid{i}" for i in range(5)]
+    mock_from_connection.return_value = facade = MagicMock()
+
+    async def modify_model_access(changes):
+        # like pylibjuju, raise error if any result of response has error
+        if any(change.model_tag == "model-uuid3" for change in changes):
+            raise JujuError(["failed"])
+
+        return client.ErrorResults(results=[{} for _ in changes])
+
+    facade.ModifyModelAccess = AsyncMock(side_effect=modify_model_access)
+
+    errors = await modify_models_access(
+        MagicMock(), "user1", model_uuids, "read", "grant", batch_size=batch_size
+    )
+
+    assert errors == {"uuid3": "failed"}
+    assert facade.ModifyModelAccess.await_count == exp_calls
+    batches = [
+        [change.model_tag for change in await_call.kwargs["changes"]]
+        for await_call in facade.ModifyModelAccess.await_args_list
+    ]
+    assert batches == exp_batches
+    changes = [
+        change
+        for await_call in facade.ModifyModelAccess.await_args_list
+        for change in await_call.kwargs["changes"]
+    ]
+    assert {(change.access, change.action, change.user_tag) for change in changes} == {
+        ("read", "grant", "user-user1")
+    }
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 from typing import Dict
 from unittest.mock import AsyncMock
@@ -10,6 +11,7 @@ from juju_spell.commands.config import (
     apply_configuration,
     apply_file_config,
     values_only,
+    written_values,
 )
 
 SIMPLE_CONFIG = {"hostname": "osman", "xx": "xx", "others": "xx"}
@@ -44,6 +46,7 @@ class MockApp:
     def __init__(self):
         """Initialize with dictionary."""
         self.properties = copy.deepcopy(FULL_CONFIG)
+        self.get_config_calls = 0
 
     async def set_config(self, props: Dict[str, str]):
         for key, value in props.items():
@@ -51,6 +54,7 @@ class MockApp:
                 self.properties[key]["value"] = value
 
     async def get_config(self):
+        self.get_config_calls += 1
         return self.properties
 
 
@@ -65,6 +69,7 @@ def _mock_controller(model):
     controller.get_model.return_value = model
     controller_config = AsyncMock()
     controller_config.model_mapping = None
+    controller_config.model_concurrency = 5
     return controller, controller_config
 
 
@@ -143,6 +148,78 @@ async def test_apply_file_config():
     assert retval == {"ubuntu": ubuntu_expected_config}
 
 
+@pytest.mark.asyncio
+async def test_apply_file_config_concurrency():
+    running = max_running = 0
+
+    class SlowMockApp(MockApp):
+        async def set_config(self, props):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(running, max_running)
+            await asyncio.sleep(0.01)
+            await super().set_config(props)
+            running -= 1
+
+    model = AsyncMock()
+    model.applications = {f"ubuntu-{i}": SlowMockApp() for i in range(5)}
+    updates = [
+        ApplicationConfig(application=f"ubuntu-{i}", config={"xx": str(i)}) for i in range(6)
+    ]
+
+    retval = await apply_file_config(model, updates, max_concurrency=2)
+
+    assert max_running == 2
+    assert retval == {f"ubuntu-{i}": {"xx": str(i)} for i in range(5)}
+
+
+@pytest.mark.asyncio
+async def test_apply_file_config_same_application():
+    app = MockApp()
+    app.set_config = AsyncMock(wraps=app.set_config)
+    model = _mock_model(app)
+    updates = [
+        ApplicationConfig(application="ubuntu", config={"hostname": "a", "xx": "1"}),
+        ApplicationConfig(application="ubuntu", config={"hostname": "b"}),
+    ]
+
+    retval = await apply_file_config(model, updates)
+
+    app.set_config.assert_awaited_once_with({"hostname": "b", "xx": "1"})
+    assert retval == {"ubuntu": {"hostname": "b", "xx": "1"}}
+
+
+@pytest.mark.asyncio
+async def test_apply_file_config_failure():
+    cancelled = False
+
+    class FailingMockApp(MockApp):
+        async def set_config(self, props):
+            raise ValueError("failed")
+
+    class SlowMockApp(MockApp):
+        async def set_config(self, props):
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+    model = AsyncMock()
+    model.applications = {"slow": SlowMockApp(), "failing": FailingMockApp()}
+    updates = [
+        ApplicationConfig(application="slow", config={"xx": "1"}),
+        ApplicationConfig(application="failing", config={"xx": "1"}),
+    ]
+
+    with pytest.raises(ValueError, match="failed"):
+        await apply_file_config(model, updates)
+
+    await asyncio.sleep(0)
+    assert cancelled is True
+
+
 @pytest.mark.asyncio
 async def test_apply_configuration_get_single_config():
     model = _mock_model(MockApp())
@@ -195,6 +272,62 @@ async def test_apply_configuration_set_from_file():
     assert result == {"ubuntu": ubuntu_expected_config}
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("verify, exp_get_config_calls", [(False, 0), (True, 1)])
+async def test_apply_configuration_set_verify(verify, exp_get_config_calls):
+    app = MockApp()
+    model = _mock_model(app)
+    kwargs = {"config-app": "ubuntu", "config_set": {"hostname": "xxx"}, "verify": verify}
+
+    result = await apply_configuration(kwargs, model)
+
+    assert result == {"ubuntu": {"hostname": "xxx"}}
+    assert app.get_config_calls == exp_get_config_calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "single_property, expected, exp_get_config_calls",
+    [("hostname", {"hostname": "xxx"}, 0), ("others", {"others": "xx"}, 1)],
+)
+async def test_apply_configuration_set_and_get(single_property, expected, exp_get_config_calls):
+    app = MockApp()
+    model = _mock_model(app)
+    kwargs = {
+        "config-app": "ubuntu",
+        "config-get": single_property,
+        "config_set": {"hostname": "xxx"},
+    }
+
+    result = await apply_configuration(kwargs, model)
+
+    assert result == {"ubuntu": expected}
+    assert app.get_config_calls == exp_get_config_calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("verify, exp_get_config_calls", [(False, 0), (True, 1)])
+async def test_apply_file_config_verify(verify, exp_get_config_calls):
+    app = MockApp()
+    model = _mock_model(app)
+    updates = [ApplicationConfig(application="ubuntu", config={"xx": "44", "unknown": "1"})]
+
+    retval = await apply_file_config(model, updates, verify=verify)
+
+    # unknown option is not returned from application config
+    expected = {"xx": "44"} if verify else {"xx": "44", "unknown": "1"}
+    assert retval == {"ubuntu": expected}
+    assert app.get_config_calls == exp_get_config_calls
+
+
+def test_written_values():
+    properties = {"hostname": "xxx", "xx": "44"}
+
+    assert written_values(properties) == properties
+    assert written_values(properties, None) == properties
+    assert written_values(properties, "xx") == {"xx": "44"}
+
+
 def test_values_only():
     result = values_only(FULL_CONFIG)
     assert result == SIMPLE_CONFIG
@@ -1,23 +1,25 @@
-from unittest.mock import AsyncMock, call, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from juju.errors import JujuError
 
 from juju_spell.commands.grant import GrantCommand
 from juju_spell.config import _validate_config
-from tests.unit.utils import _async_generator
 
 
 @pytest.mark.asyncio
-@patch("juju_spell.commands.grant.GrantCommand.get_filtered_models")
+@patch("juju_spell.commands.grant.modify_models_access")
+@patch("juju_spell.commands.grant.GrantCommand.get_filtered_model_uuids")
 @pytest.mark.parametrize(
     "acl,exp_controller_acl,exp_model_acl",
     (
         ("superuser", "superuser", "admin"),
-        ("superuser", "superuser", "admin"),
+        ("login", "login", "read"),
     ),
 )
 async def test_grant_execute(
-    mocked_models,
+    mocked_model_uuids,
+    mocked_modify_models_access,
     test_config_dict,
     acl,
     exp_controller_acl,
@@ -25,12 +27,11 @@ async def test_grant_execute(
 ):
     cmd = GrantCommand()
 
-    mock_model1 = AsyncMock()
-    mock_model1.uuid = "0050e762-9002-4197-b163-64bda52427db"
-    mock_model2 = AsyncMock()
-    mock_model2.uuid = "ab9065d4-f762-4386-85e1-5fd892453b68"
-    models = [("model1", mock_model1), ("model2", mock_model2)]
-    mocked_models.return_value = _async_generator(models)
+    mocked_model_uuids.return_value = {
+        "model1": "0050e762-9002-4197-b163-64bda52427db",
+        "model2": "ab9065d4-f762-4386-85e1-5fd892453b68",
+    }
+    mocked_modify_models_access.return_value = {}
 
     mock_conn = AsyncMock()
 
@@ -53,22 +54,39 @@ async def test_grant_execute(
         }
     )
 
-    mocked_models.assert_called_once_with(
+    mocked_model_uuids.assert_called_once_with(
         controller=mock_conn,
         models=None,
         model_mappings=None,
     )
-    mock_conn.grant_model.assert_has_awaits(
-        [
-            call(
-                username="new-user",
-                model_uuid=mock_model1.uuid,
-                acl=exp_model_acl,
-            ),
-            call(
-                username="new-user",
-                model_uuid=mock_model2.uuid,
-                acl=exp_model_acl,
-            ),
-        ]
+    mocked_modify_models_access.assert_awaited_once_with(
+        mock_conn,
+        "new-user",
+        ["0050e762-9002-4197-b163-64bda52427db", "ab9065d4-f762-4386-85e1-5fd892453b68"],
+        exp_model_acl,
+        "grant",
     )
+    mock_conn.grant_model.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overwrite", [True, False])
+@patch("juju_spell.commands.grant.modify_models_access")
+@patch("juju_spell.commands.grant.GrantCommand.get_filtered_model_uuids")
+async def test_grant_execute_error(
+    mocked_model_uuids, mocked_modify_models_access, test_config_dict, overwrite
+):
+    """Test grant raising error only without overwrite."""
+    cmd = GrantCommand()
+    mocked_model_uuids.return_value = {"model1": "0050e762-9002-4197-b163-64bda52427db"}
+    mocked_modify_models_access.return_value = {
+        "0050e762-9002-4197-b163-64bda52427db": "user already has access"
+    }
+    controller = _validate_config(test_config_dict).controllers[0]
+
+    kwargs = {"user": "new-user", "acl": "read", "controller_config": controller}
+    if overwrite:
+        assert await cmd.execute(AsyncMock(), overwrite=overwrite, **kwargs) is True
+    else:
+        with pytest.raises(JujuError, match="user already has access"):
+            await cmd.execute(AsyncMock(), overwrite=overwrite, **kwargs)
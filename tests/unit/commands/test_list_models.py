@@ -1,7 +1,10 @@
+from time import time
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from juju_spell.cache import CachePolicy
+from juju_spell.commands.base import wait_background_tasks
 from juju_spell.commands.list_models import ListModelsCommand
 
 
@@ -66,3 +69,40 @@ async def test_11_execute_without_refresh_no_cache(mock_use_cache):
     )
 
     mock_controller.list_models.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "swr, age, exp_refresh", [(True, 301, True), (True, 10, False), (False, 301, False)]
+)
+@patch("juju_spell.commands.list_models.use_cache")
+async def test_execute_swr(mock_use_cache, swr, age, exp_refresh):
+    """Test execute function for ListModelsCommand with --swr."""
+    mock_controller = AsyncMock()
+    mock_controller.list_models.return_value = ["model-a", "model-b"]
+    list_models = ListModelsCommand()
+
+    mock_cache = Mock()
+    mock_cache.policy = CachePolicy(ttl=3600, soft_ttl=300)
+    cached = {"timestamp": time() - age, "data": {"refresh": False, "models": ["model-a"]}}
+    mock_cache.get.return_value = cached
+    mock_use_cache.return_value = mock_cache
+
+    context = await list_models.execute(
+        controller=mock_controller,
+        refresh=False,
+        swr=swr,
+        controller_config=Mock(),
+        models=None,
+    )
+
+    assert context == cached  # cached models are returned without waiting
+    await wait_background_tasks()
+    assert mock_controller.list_models.await_count == exp_refresh
+    if exp_refresh:
+        mock_cache.put.assert_called_once_with(
+            f"ListModelsCommand_{mock_controller.controller_uuid}",
+            {"models": ["model-a", "model-b"], "refresh": True},
+        )
+    else:
+        mock_cache.put.assert_not_called()
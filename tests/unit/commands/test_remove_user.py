@@ -13,20 +13,19 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from unittest.mock import AsyncMock, MagicMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from juju_spell.commands.remove_user import RemoveUserCommand
 from juju_spell.config import Controller
-from tests.unit.utils import _async_generator
 
 
 @pytest.mark.asyncio
 @patch("juju_spell.commands.remove_user.DisableUserCommand")
 @patch("juju_spell.commands.remove_user.RevokeCommand")
 @patch("juju_spell.commands.remove_user.RevokeModelCommand")
-@patch("juju_spell.commands.base.BaseJujuCommand.get_filtered_models")
+@patch("juju_spell.commands.base.BaseJujuCommand.get_filtered_model_uuids")
 async def test_remove_user_execute(
     # mock_disable_cmd, mock_revoke_cmd, mock_revoke_model_cmd,  mock_models,
     mock_models,
@@ -37,11 +36,11 @@ async def test_remove_user_execute(
     """Test execute function for RemoveUserCommand."""
     cmd = RemoveUserCommand()
 
-    models = [("model1", AsyncMock()), ("model2", AsyncMock())]
+    models = {"model1": "uuid1", "model2": "uuid2"}
 
     controller_config = MagicMock(Controller)
     controller_config.model_mapping = None
-    mock_models.return_value = _async_generator(models)
+    mock_models.return_value = models
 
     _mock_revoke_cmd = AsyncMock()
     mock_revoke_cmd.return_value = _mock_revoke_cmd
@@ -66,11 +65,8 @@ async def test_remove_user_execute(
     assert output is True
     _mock_revoke_cmd.run.assert_awaited_once_with(controller=mock_conn, user=user, acl="login")
 
-    _mock_revoke_model_cmd.run.assert_has_awaits(
-        [
-            call(controller=mock_conn, user=user, model_uuid=models[0][-1].uuid, acl="read"),
-            call(controller=mock_conn, user=user, model_uuid=models[1][-1].uuid, acl="read"),
-        ]
+    _mock_revoke_model_cmd.run.assert_awaited_once_with(
+        controller=mock_conn, user=user, model_uuids=["uuid1", "uuid2"], acl="read"
     )
     _mock_disable_cmd.run.assert_awaited_once_with(
         controller=mock_conn,
@@ -1,8 +1,9 @@
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from juju_spell.commands.revoke import RevokeCommand, RevokeModelCommand
+from juju_spell.exceptions import JujuSpellError
 
 
 @pytest.mark.asyncio
@@ -39,3 +40,34 @@ async def test_revoke_model_execute():
         acl="superuser",
         model_uuid="13089ea3-2cba-47c2-92d1-a33db230ea49",
     )
+
+
+@pytest.mark.asyncio
+@patch("juju_spell.commands.revoke.modify_models_access")
+async def test_revoke_models_execute(mock_modify_models_access):
+    mock_conn = AsyncMock()
+    mock_modify_models_access.return_value = {"uuid2": "model not found"}
+
+    cmd = RevokeModelCommand()
+    output = await cmd.execute(
+        controller=mock_conn, user="new-user", acl="read", model_uuids=["uuid1", "uuid2"]
+    )
+    assert output is True
+
+    mock_modify_models_access.assert_awaited_once_with(
+        mock_conn, "new-user", ["uuid1", "uuid2"], "read", "revoke"
+    )
+    mock_conn.revoke_model.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("user, acl", [(None, "read"), ("new-user", None)])
+@patch("juju_spell.commands.revoke.modify_models_access")
+async def test_revoke_models_execute_missing_args(mock_modify_models_access, user, acl):
+    mock_conn = AsyncMock()
+
+    cmd = RevokeModelCommand()
+    with pytest.raises(JujuSpellError):
+        await cmd.execute(controller=mock_conn, user=user, acl=acl, model_uuids=["uuid1"])
+
+    mock_modify_models_access.assert_not_called()
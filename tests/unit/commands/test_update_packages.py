@@ -1,15 +1,29 @@
+import base64
 import copy
+import dataclasses
+import re
 import uuid
+import zlib
+from unittest import mock
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from juju import tag
 
+from juju_spell.cache import DEFAULT_CACHE_BACKEND, CachePolicy
 from juju_spell.cli.update_packages import get_patch_config
 from juju_spell.commands.update_packages import (
+    ApplicationMatcher,
+    ApplicationResult,
+    ModelUpdateResult,
     PackageUpdateResult,
     UnitUpdateResult,
     UpdatePackagesCommand,
     UpdateResult,
+    get_raw_output,
+    get_unit_concurrency,
+    get_unit_name,
+    is_action_succeeded,
 )
 
 TEST_PATCH = """
@@ -157,11 +171,41 @@ def patch_config(request, tmp_path):
     return get_patch_config(file_path)
 
 
+@pytest.fixture
+def action_facade():
+    """Mock ActionFacade starting action for each unit."""
+    with mock.patch(
+        "juju_spell.commands.update_packages.client.ActionFacade.from_connection"
+    ) as mock_from_connection:
+        facade = mock_from_connection.return_value
+
+        async def run(units, **_):
+            return MagicMock(
+                results=[
+                    MagicMock(
+                        error=None, action=MagicMock(tag=f"action-{u}", receiver=tag.unit(u))
+                    )
+                    for u in units
+                ]
+            )
+
+        facade.Run = AsyncMock(side_effect=run)
+        yield facade
+
+
+def _model_result(*results):
+    return ModelUpdateResult(
+        applications=[ApplicationResult(name_expr="^.*ubuntu.*$", results=list(results))]
+    )
+
+
 async def _mock_controller(model):
     controller = AsyncMock()
     controller.get_model.return_value = model
     controller_config = AsyncMock()
     controller_config.model_mapping = None
+    controller_config.model_concurrency = 5
+    controller_config.cache_policies = {}
     return controller, controller_config
 
 
@@ -169,9 +213,10 @@ async def _mock_model(output):
     model = AsyncMock()
     unit = AsyncMock()
     unit.name = "ubuntu/0"
-    action = MagicMock()
+    action = MagicMock(status="completed")
     action.data = {"results": {"Stdout": output}}
-    unit.run.return_value = action
+    model.connection = MagicMock()
+    model.wait_for_action.return_value = action
     model.units = {"ubuntu/0": unit}
     app_status = AsyncMock()
     app_status.units = [unit]
@@ -185,26 +230,58 @@ def test_set_success_flags(unit_update_result, expected_packages):
     assert unit_update_result.success
 
 
-def test_set_apps_to_update(patch_config, unit_update_result):
-    result = copy.deepcopy(patch_config)
+def test_get_apps_to_update(patch_config, unit_update_result):
+    exp_patch_config = copy.deepcopy(patch_config)
     model = AsyncMock()
     app_status = AsyncMock()
     unit = AsyncMock()
     unit.name = "ubuntu/0"
     app_status.units = [unit]
-    model.applications = {"ubuntu": app_status}
+    model.applications = {"ubuntu": app_status, "nova-compute": AsyncMock()}
 
     update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
-    update_packages.set_apps_to_update(updates=patch_config, model=model, dry_run=False)
+    result = update_packages.get_apps_to_update(updates=patch_config, model=model, dry_run=False)
 
-    unit_update_result = copy.deepcopy(unit_update_result)
-    unit_update_result.packages = []
     update_result = copy.deepcopy(unit_update_result)
+    update_result.packages = []
     update_result.raw_output = ""
     update_result.success = False
-    result.applications[0].results = [UpdateResult(application="ubuntu", units=[update_result])]
+    assert result == ModelUpdateResult(
+        applications=[
+            ApplicationResult(
+                name_expr="^.*ubuntu.*$",
+                results=[UpdateResult(application="ubuntu", units=[update_result])],
+            )
+        ]
+    )
+    assert patch_config == exp_patch_config  # updates are not modified
+
+
+@pytest.mark.parametrize(
+    "name_exprs, application, exp_indexes",
+    [
+        (["^nova-compute$", "nova-compute"], "nova-compute", [0, 1]),
+        (["^nova-compute$"], "nova-compute-kvm", []),
+        (["^nova-.*", "nova", "^nova.*$", "^.*$"], "nova-compute", [0, 1, 2, 3]),
+        (["^nova-.*"], "ceph-osd", []),
+        (["^.*ubuntu.*$", "^(ceph|nova)-.*$"], "ceph-ubuntu", [0, 1]),
+        (["^.*ubuntu.*$", "^nova-compute$"], "nova-compute", [1]),
+        (["^ceph-osd\\$"], "ceph-osd", []),
+    ],
+)
+def test_application_matcher(name_exprs, application, exp_indexes):
+    matcher = ApplicationMatcher(name_exprs)
+
+    assert matcher.match(application) == exp_indexes
+    assert exp_indexes == [i for i, expr in enumerate(name_exprs) if re.match(expr, application)]
 
-    assert result == patch_config
+
+def test_application_matcher_index():
+    matcher = ApplicationMatcher(["^nova-compute$", "^nova-.*", "^.*ubuntu.*$"])
+
+    assert dict(matcher.literals) == {"nova-compute": [0]}
+    assert dict(matcher.prefixes) == {"nova-": [1]}
+    assert [index for index, _ in matcher.patterns] == [2]
 
 
 def test_get_update_command(patch_config):
@@ -222,7 +299,7 @@ def test_get_update_command(patch_config):
         " --option=Dpkg::Options::=--force-confdef dist-upgrade --upgrade -y "
         " --dry-run"
     )
-    app.dist_upgrade = False
+    app = dataclasses.replace(app, dist_upgrade=False)
     res = update_packages.get_update_command(app, False)
     assert (
         res == "sudo apt-get update ; sudo apt-get --option=Dpkg::Options::=--force-confold"
@@ -245,12 +322,47 @@ def test_parse_result(unit_update_result):
     assert [p in result for p in unit_update_result.packages] == [True, True]
 
 
+def test_parse_result_lines():
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    output = (
+        "Inst libdrm2 [2.4.110-1ubuntu1] (2.4.113-2~ubuntu0.22.04.1 Ubuntu:22.04/jammy [amd64])\n"
+        "Inst linux-image-5.15.0-60 (5.15.0-60.66 Ubuntu:22.04/jammy-updates [amd64])\n"
+        "Unpacking libapt-pkg6.0:amd64 (2.4.8) over (2.4.7) ...\n"
+        "Unpacking linux-image-5.15.0-60 (5.15.0-60.66) ...\n"
+        "Conf libdrm2 (2.4.113-2~ubuntu0.22.04.1 Ubuntu:22.04/jammy [amd64])\n"
+        " Inst not-a-package [1] (2)"
+    )
+
+    assert update_packages.parse_result(output) == [
+        PackageUpdateResult("libdrm2", "2.4.110-1ubuntu1", "2.4.113-2~ubuntu0.22.04.1"),
+        PackageUpdateResult("libapt-pkg6.0:amd64", "2.4.7", "2.4.8"),
+    ]
+
+
+@pytest.mark.parametrize("mode", ["full", "truncated", "compressed"])
+def test_get_raw_output(mode):
+    stdout = "x" * 5000 + "E: Unable to fetch some archives"
+    raw_output = get_raw_output(stdout, mode)
+
+    if mode == "full":
+        assert raw_output == stdout
+    elif mode == "truncated":
+        assert len(raw_output) == 4096 + 3
+        assert raw_output.endswith("E: Unable to fetch some archives")
+    else:
+        assert zlib.decompress(base64.b64decode(raw_output)).decode() == stdout
+
+
+def test_get_raw_output_short():
+    assert get_raw_output(RAW_OUTPUT_DRYRUN, "truncated") == RAW_OUTPUT_DRYRUN
+
+
 @pytest.mark.asyncio
-async def test_run_updates_on_model(patch_config, unit_update_result):
+async def test_run_updates_on_model(patch_config, unit_update_result, action_facade):
     update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
     model = await _mock_model(RAW_OUTPUT_DRYRUN)
 
-    patch_config.applications[0].results = [
+    model_result = _model_result(
         UpdateResult(
             application="ubuntu",
             units=[
@@ -263,17 +375,19 @@ async def test_run_updates_on_model(patch_config, unit_update_result):
                 )
             ],
         )
-    ]
+    )
 
-    await update_packages.run_updates_on_model(model=model, updates=patch_config)
+    await update_packages.run_updates_on_model(
+        model=model, updates=patch_config, model_result=model_result
+    )
     assert [
-        p in patch_config.applications[0].results[0].units[0].packages
+        p in model_result.applications[0].results[0].units[0].packages
         for p in unit_update_result.packages
     ] == [True, True]
 
 
 @pytest.mark.asyncio
-async def test_make_updates(patch_config, unit_update_result):
+async def test_make_updates(patch_config, unit_update_result, action_facade):
     model = await _mock_model(RAW_OUTPUT_DRYRUN)
 
     controller = AsyncMock()
@@ -296,7 +410,7 @@ async def test_make_updates(patch_config, unit_update_result):
 
 
 @pytest.mark.asyncio
-async def test_execute(patch_config, unit_update_result):
+async def test_execute(patch_config, unit_update_result, action_facade):
     model = await _mock_model(RAW_OUTPUT_DRYRUN)
     controller, controller_config = await _mock_controller(model)
 
@@ -318,9 +432,11 @@ async def test_execute(patch_config, unit_update_result):
 
 
 @pytest.mark.asyncio
-async def test_dry_run(patch_config, unit_update_result):
+@mock.patch("juju_spell.commands.update_packages.use_cache")
+async def test_dry_run(mock_use_cache, patch_config, unit_update_result, action_facade):
     model = await _mock_model(RAW_OUTPUT_DRYRUN)
     controller, controller_config = await _mock_controller(model)
+    controller_config.cache_policies = {"update-packages": CachePolicy(ttl=60, max_entries=10)}
 
     update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
     result = await update_packages.dry_run(
@@ -332,8 +448,362 @@ async def test_dry_run(patch_config, unit_update_result):
             "dry_run": True,
         },
     )
+    mock_use_cache.assert_called_once_with(
+        DEFAULT_CACHE_BACKEND,
+        write_behind=True,
+        policy=CachePolicy(ttl=60, max_entries=10),
+        namespace="UpdatePackagesCommand",
+    )
+    assert mock_use_cache.return_value.get.call_count == 2  # load and merge on store
+    mock_use_cache.return_value.put.assert_called_once()
     assert result.success
     assert [
         p in result.output["lma"].applications[0].results[0].units[0].packages
         for p in unit_update_result.packages
     ] == [True, True]
+
+
+@pytest.mark.parametrize(
+    "max_unavailable, units, exp_concurrency",
+    [("1", 10, 1), ("3", 10, 3), ("20", 10, 10), ("25%", 10, 2), ("5%", 10, 1), ("100%", 7, 7)],
+)
+def test_get_unit_concurrency(max_unavailable, units, exp_concurrency):
+    assert get_unit_concurrency(max_unavailable, units) == exp_concurrency
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "max_unavailable, exp_waves",
+    [("1", [[0], [1], [2], [3], [4]]), ("2", [[0, 1], [2, 3], [4]]), ("100%", [[0, 1, 2, 3, 4]])],
+)
+async def test_run_updates_on_model_waves(patch_config, action_facade, max_unavailable, exp_waves):
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    model = MagicMock()
+    action = MagicMock(status="completed")
+    action.data = {"results": {"Stdout": RAW_OUTPUT_DRYRUN}}
+    model.wait_for_action = AsyncMock(return_value=action)
+    units = [f"ubuntu/{i}" for i in range(5)]
+    model_result = _model_result(
+        UpdateResult(
+            application="ubuntu",
+            units=[
+                UnitUpdateResult(unit=name, command=UNIT_UPDATE_COMMAND, packages=[])
+                for name in units
+            ],
+        )
+    )
+
+    await update_packages.run_updates_on_model(model, patch_config, model_result, max_unavailable)
+
+    action_facade.Run.assert_has_awaits(
+        [
+            mock.call(
+                applications=[],
+                commands=UNIT_UPDATE_COMMAND,
+                machines=[],
+                timeout=600 * 10**9,
+                units=[units[i] for i in wave],
+            )
+            for wave in exp_waves
+        ]
+    )
+    assert action_facade.Run.await_count == len(exp_waves)
+    model.wait_for_action.assert_has_awaits([mock.call(f"action-{name}") for name in units])
+    for unit in model_result.applications[0].results[0].units:
+        assert unit.success is True
+        assert unit.raw_output == RAW_OUTPUT_DRYRUN
+
+
+@pytest.mark.asyncio
+async def test_run_updates_on_model_waves_failed(patch_config, action_facade):
+    """Test remaining waves of application are skipped after failed wave."""
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    model = MagicMock()
+    actions = {
+        f"action-ubuntu/{i}": MagicMock(
+            status="failed" if i == 3 else "completed",
+            data={"results": {"Stdout": RAW_OUTPUT_DRYRUN}},
+        )
+        for i in range(6)
+    }
+    model.wait_for_action = AsyncMock(side_effect=lambda action_tag: actions[action_tag])
+    units = [f"ubuntu/{i}" for i in range(6)]
+    model_result = _model_result(
+        UpdateResult(
+            application="ubuntu",
+            units=[
+                UnitUpdateResult(unit=name, command=UNIT_UPDATE_COMMAND, packages=[])
+                for name in units
+            ],
+        )
+    )
+
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "2")
+
+    assert [call.kwargs["units"] for call in action_facade.Run.await_args_list] == [
+        ["ubuntu/0", "ubuntu/1"],
+        ["ubuntu/2", "ubuntu/3"],
+    ]
+    results = model_result.applications[0].results[0].units
+    assert [unit.success for unit in results] == [True, True, True, False, False, False]
+    for unit in results[4:]:
+        assert unit.raw_output == "skipped, previous wave of application failed"
+
+
+@pytest.mark.asyncio
+async def test_run_updates_on_units_error(patch_config, action_facade):
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    model = MagicMock()
+    action = MagicMock(status="completed")
+    action.data = {"results": {"Stdout": RAW_OUTPUT_DRYRUN}}
+    model.wait_for_action = AsyncMock(return_value=action)
+    error_result = MagicMock(action=MagicMock(receiver="unit-ubuntu-0"))
+    error_result.error.message = "action failed"
+    unmatched_result = MagicMock(action=None)
+    unmatched_result.error.message = "unit not found"
+    action_facade.Run.side_effect = None
+    action_facade.Run.return_value = MagicMock(
+        results=[
+            MagicMock(
+                error=None, action=MagicMock(tag="action-ubuntu/1", receiver="unit-ubuntu-1")
+            ),
+            unmatched_result,
+            error_result,
+        ]
+    )
+    units = [
+        UnitUpdateResult(unit=name, command=UNIT_UPDATE_COMMAND, packages=[])
+        for name in ["ubuntu/0", "ubuntu/1", "ubuntu/2"]
+    ]
+
+    await update_packages.run_updates_on_units(
+        model, units, patch_config.applications[0].packages_to_update, "compressed"
+    )
+
+    model.wait_for_action.assert_awaited_once_with("action-ubuntu/1")
+    assert units[0].success is False
+    assert units[0].raw_output == "action failed"
+    assert units[1].success is True
+    assert zlib.decompress(base64.b64decode(units[1].raw_output)).decode() == RAW_OUTPUT_DRYRUN
+    # result without receiver is not attached to any unit
+    assert units[2].success is False
+    assert units[2].raw_output == "no result returned"
+
+
+@pytest.mark.asyncio
+async def test_run_updates_on_units_order(patch_config, action_facade):
+    """Test results of units are matched by receiver, not by order of units."""
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    model = MagicMock()
+    outputs = {"action-app/2": RAW_OUTPUT_DRYRUN, "action-app/10": "failed"}
+    model.wait_for_action = AsyncMock(
+        side_effect=lambda action_tag: MagicMock(
+            status="completed", data={"results": {"Stdout": outputs[action_tag]}}
+        )
+    )
+    action_facade.Run.side_effect = None
+    action_facade.Run.return_value = MagicMock(
+        results=[  # receivers are sorted by name
+            MagicMock(error=None, action=MagicMock(tag=f"action-{name}", receiver=tag.unit(name)))
+            for name in ["app/10", "app/2"]
+        ]
+    )
+    units = [
+        UnitUpdateResult(unit=name, command=UNIT_UPDATE_COMMAND, packages=[])
+        for name in ["app/2", "app/10"]
+    ]
+
+    await update_packages.run_updates_on_units(
+        model, units, patch_config.applications[0].packages_to_update
+    )
+
+    assert units[0].raw_output == RAW_OUTPUT_DRYRUN
+    assert units[0].success is True
+    assert units[1].raw_output == "failed"
+    assert units[1].packages == []
+
+
+@pytest.mark.parametrize(
+    "receiver, exp_unit",
+    [("unit-ubuntu-0", "ubuntu/0"), ("unit-my-app-10", "my-app/10")],
+)
+def test_get_unit_name(receiver, exp_unit):
+    assert get_unit_name(receiver) == exp_unit
+
+
+class _DictCache:
+    """Simple in-memory cache with the same interface as FileCache."""
+
+    def __init__(self):
+        self.data = {}
+        self.policy = CachePolicy(ttl=3600)
+
+    def get(self, key):
+        return {"data": self.data[key]} if key in self.data else None
+
+    def put(self, key, value):
+        self.data[key] = value
+
+
+def _mock_model_with_units(units):
+    model = MagicMock()
+    model.info.uuid = "model-uuid"
+    model.applications["ubuntu"].get_series = AsyncMock(return_value="jammy")
+    action = MagicMock(status="completed")
+    action.data = {"results": {"Stdout": RAW_OUTPUT_DRYRUN}}
+    model.wait_for_action = AsyncMock(return_value=action)
+    model_result = _model_result(
+        UpdateResult(
+            application="ubuntu",
+            units=[
+                UnitUpdateResult(unit=name, command=UNIT_UPDATE_COMMAND, packages=[])
+                for name in units
+            ],
+        )
+    )
+    return model, model_result
+
+
+@pytest.mark.asyncio
+async def test_run_updates_on_model_cache(patch_config, action_facade):
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    cache = _DictCache()
+
+    # first dry-run with cold cache
+    model, model_result = _mock_model_with_units(["ubuntu/0"])
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+
+    assert action_facade.Run.await_args.kwargs["units"] == ["ubuntu/0"]
+    assert len(cache.data) == 1
+
+    # second dry-run with new unit
+    model, model_result = _mock_model_with_units(["ubuntu/0", "ubuntu/1"])
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+
+    assert action_facade.Run.await_args.kwargs["units"] == ["ubuntu/1"]
+    cached_unit, new_unit = model_result.applications[0].results[0].units
+    assert cached_unit.cached is True
+    assert cached_unit.raw_output is None
+    assert cached_unit.success is True
+    assert cached_unit.packages == new_unit.packages
+    assert new_unit.cached is False
+    assert set(list(cache.data.values())[0]) == {"ubuntu/0", "ubuntu/1"}
+    assert cache.data[list(cache.data)[0]]["ubuntu/0"]["packages"]
+
+    # third dry-run from cache only
+    model, model_result = _mock_model_with_units(["ubuntu/0", "ubuntu/1"])
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+    assert action_facade.Run.await_count == 2
+
+    # dry-run with refresh
+    model, model_result = _mock_model_with_units(["ubuntu/0", "ubuntu/1"])
+    await update_packages.run_updates_on_model(
+        model, patch_config, model_result, "100%", cache, refresh=True
+    )
+    assert action_facade.Run.await_args.kwargs["units"] == ["ubuntu/0", "ubuntu/1"]
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.commands.update_packages.time.time")
+async def test_run_updates_on_model_cache_unit_expiration(mock_time, patch_config, action_facade):
+    """Test storing new unit does not extend the life of other cached units."""
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    cache = _DictCache()
+
+    mock_time.return_value = 0
+    model, model_result = _mock_model_with_units(["ubuntu/0"])
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+
+    mock_time.return_value = 3000
+    model, model_result = _mock_model_with_units(["ubuntu/0", "ubuntu/1"])
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+    assert action_facade.Run.await_args.kwargs["units"] == ["ubuntu/1"]
+
+    mock_time.return_value = 4000  # ubuntu/0 is expired, ubuntu/1 is not
+    model, model_result = _mock_model_with_units(["ubuntu/0", "ubuntu/1"])
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+    assert action_facade.Run.await_args.kwargs["units"] == ["ubuntu/0"]
+    cached = list(cache.data.values())[0]
+    assert {unit: result["timestamp"] for unit, result in cached.items()} == {
+        "ubuntu/0": 4000,
+        "ubuntu/1": 3000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_updates_on_model_cache_key(patch_config, action_facade):
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    model, model_result = _mock_model_with_units(["ubuntu/0"])
+    results = model_result.applications[0].results
+
+    key = await update_packages.get_cache_key(model, results[0])
+    model.applications["ubuntu"].get_series.return_value = "focal"
+    other_series_key = await update_packages.get_cache_key(model, results[0])
+    results[0].units[0].command += "--dry-run"
+    other_command_key = await update_packages.get_cache_key(model, results[0])
+
+    assert key.startswith("UpdatePackagesCommand_")
+    assert len({key, other_series_key, other_command_key}) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_updates_on_model_cache_failed_unit(patch_config, action_facade):
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    cache = _DictCache()
+    model, model_result = _mock_model_with_units(["ubuntu/0", "ubuntu/1"])
+    error_result = MagicMock(action=None)
+    error_result.error.message = "unit not found"
+    action_facade.Run.side_effect = None
+    action_facade.Run.return_value = MagicMock(
+        results=[
+            MagicMock(
+                error=None, action=MagicMock(tag="action-ubuntu/1", receiver="unit-ubuntu-1")
+            ),
+            error_result,
+        ]
+    )
+
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+
+    assert set(list(cache.data.values())[0]) == {"ubuntu/1"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "status, results",
+    [
+        ("failed", {"Stdout": RAW_OUTPUT_DRYRUN}),
+        ("completed", {"Stdout": "", "Code": "100"}),
+        ("completed", {"Stdout": "", "return-code": 1}),
+    ],
+)
+async def test_run_updates_on_model_cache_failed_action(
+    patch_config, action_facade, status, results
+):
+    """Test that units with failed action or non-zero exit code are not cached."""
+    update_packages: UpdatePackagesCommand = UpdatePackagesCommand()
+    cache = _DictCache()
+    model, model_result = _mock_model_with_units(["ubuntu/0"])
+    model.wait_for_action.return_value = MagicMock(status=status, data={"results": results})
+
+    await update_packages.run_updates_on_model(model, patch_config, model_result, "100%", cache)
+
+    assert model_result.applications[0].results[0].units[0].success is False
+    assert cache.data == {}
+
+
+@pytest.mark.parametrize(
+    "status, results, exp_succeeded",
+    [
+        ("completed", {"Stdout": ""}, True),
+        ("completed", {"Code": "0"}, True),
+        ("completed", {"return-code": 0}, True),
+        ("completed", {"Code": "1"}, False),
+        ("completed", {"return-code": 1}, False),
+        ("failed", {"return-code": 0}, False),
+        ("cancelled", {}, False),
+    ],
+)
+def test_is_action_succeeded(status, results, exp_succeeded):
+    action = MagicMock(status=status, data={"results": results})
+    assert is_action_succeeded(action) is exp_succeeded
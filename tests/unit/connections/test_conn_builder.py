@@ -1,3 +1,4 @@
+import asyncio
 from unittest import mock
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
@@ -7,7 +8,11 @@ import tenacity
 from juju.errors import JujuAPIError, JujuConnectionError
 
 from juju_spell.config import RetryPolicy
-from juju_spell.settings import DEFAULT_CONNECTION_WAIT, DEFAULT_MAX_FRAME_SIZE
+from juju_spell.settings import (
+    DEFAULT_CONNECTION_WAIT,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_RETRY_BACKOFF,
+)
 
 
 @pytest.mark.asyncio
@@ -68,25 +73,30 @@ async def test_build_controller_conn_exception():
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "retry_policy,exp_args",
+    "retry_policy,exp_args,exp_wait",
     [
-        (RetryPolicy(timeout=None, attempt=None, wait=None), {}),
+        (
+            RetryPolicy(timeout=None, attempt=None, wait=None, backoff=None),
+            {},
+            (DEFAULT_CONNECTION_WAIT, DEFAULT_RETRY_BACKOFF),
+        ),
         (
             RetryPolicy(attempt=10, timeout=None, wait=None),
             {"stop_func": tenacity.stop_any(*[tenacity.stop_after_attempt(10)])},
+            (DEFAULT_CONNECTION_WAIT, DEFAULT_RETRY_BACKOFF),
         ),
         (
             RetryPolicy(attempt=None, timeout=10, wait=None),
             {"stop_func": tenacity.stop_any(*[tenacity.stop_after_delay(10)])},
+            (DEFAULT_CONNECTION_WAIT, DEFAULT_RETRY_BACKOFF),
         ),
         (
             RetryPolicy(attempt=None, timeout=None, wait=10),
-            {
-                "wait_func": tenacity.wait_fixed(10),
-            },
+            {},
+            (10, DEFAULT_RETRY_BACKOFF),
         ),
         (
-            RetryPolicy(attempt=10, timeout=11, wait=12),
+            RetryPolicy(attempt=10, timeout=11, wait=12, backoff=2),
             {
                 "stop_func": tenacity.stop_any(
                     *[
@@ -94,17 +104,17 @@ async def test_build_controller_conn_exception():
                         tenacity.stop_after_delay(11),
                     ]
                 ),
-                "wait_func": tenacity.wait_fixed(12),
             },
+            (12, 2),
         ),
     ],
 )
-@mock.patch("juju_spell.connections.conn_builder.tenacity.wait_fixed")
+@mock.patch("juju_spell.connections.conn_builder.WaitBackoff")
 @mock.patch("juju_spell.connections.conn_builder.tenacity.retry_any")
 @mock.patch("juju_spell.connections.conn_builder.tenacity.stop_any")
 @mock.patch("juju_spell.connections.conn_builder._conn")
 async def test_build_controller_conn_retry_policy(
-    mock_conn, mock_stop_any, mock_retry_any, mock_wait_fixed, retry_policy, exp_args
+    mock_conn, mock_stop_any, mock_retry_any, mock_wait_backoff, retry_policy, exp_args, exp_wait
 ):
     from juju_spell.connections.conn_builder import build_controller_conn
 
@@ -113,14 +123,13 @@ async def test_build_controller_conn_retry_policy(
 
     default = {
         "stop_func": tenacity.stop_any(*[]),
-        "wait_func": tenacity.wait_fixed(DEFAULT_CONNECTION_WAIT),
+        "wait_func": mock_wait_backoff.return_value,
         "retry_func": tenacity.retry_any(*[tenacity.retry_if_exception_type(JujuConnectionError)]),
     }
     exp_args = {**default, **exp_args}
 
     mock_stop_any.return_value = exp_args["stop_func"]
     mock_retry_any.return_value = exp_args["retry_func"]
-    mock_wait_fixed.return_value = exp_args["wait_func"]
 
     params = {
         "controller": mock_controller,
@@ -137,6 +146,7 @@ async def test_build_controller_conn_retry_policy(
         retry_policy=retry_policy,
     )
 
+    mock_wait_backoff.assert_called_once_with(*exp_wait)
     mock_conn.assert_has_awaits(
         [
             mock.call(
@@ -148,7 +158,7 @@ async def test_build_controller_conn_retry_policy(
 
 
 @pytest.mark.asyncio
-@mock.patch("juju_spell.connections.conn_builder.Retrying")
+@mock.patch("juju_spell.connections.conn_builder.AsyncRetrying")
 @mock.patch("juju_spell.connections.conn_builder._after_log")
 @mock.patch("juju_spell.connections.conn_builder._before_log")
 async def test_conn(mock_before_log, mock_after_log, mock_retrying):
@@ -179,3 +189,63 @@ async def test_conn(mock_before_log, mock_after_log, mock_retrying):
         after=mock_after_log.return_value,
         before=mock_before_log.return_value,
     )
+
+
+@pytest.mark.parametrize(
+    "attempt, retry_backoff, exp_wait",
+    [
+        (0, 1.5, 0.44),
+        (1, 1.5, 0.67),
+        (2, 1.5, 1),
+        (3, 1.5, 1.5),
+        (4, 1.5, 2.25),
+        (5, 1.5, 3.38),
+    ],
+)
+def test_get_wait_time(attempt, retry_backoff, exp_wait):
+    """Test calculation of wait time."""
+    from juju_spell.connections.conn_builder import _get_wait_time
+
+    wait = _get_wait_time(attempt, retry_backoff)
+
+    assert exp_wait == round(wait, 2)
+
+
+@pytest.mark.parametrize(
+    "wait, attempt, exp_min, exp_max",
+    [(1, 1, 0.67, 1.0), (1, 2, 1, 1.5), (2, 3, 3, 4.5), (1, 5, 3.38, 5.06)],
+)
+@mock.patch("juju_spell.connections.conn_builder.random.uniform")
+def test_wait_backoff(mock_uniform, wait, attempt, exp_min, exp_max):
+    """Test exponential wait strategy with jitter."""
+    from juju_spell.connections.conn_builder import WaitBackoff
+
+    retry_state = MagicMock(attempt_number=attempt)
+    wait_func = WaitBackoff(wait, retry_backoff=1.5, jitter=0.5)
+
+    mock_uniform.side_effect = lambda low, high: low
+    assert round(wait_func(retry_state), 2) == exp_min
+    mock_uniform.side_effect = lambda low, high: high
+    assert round(wait_func(retry_state), 2) == exp_max
+
+
+@pytest.mark.asyncio
+@mock.patch("juju_spell.connections.conn_builder.WaitBackoff")
+async def test_build_controller_conn_not_blocking(mock_wait_backoff):
+    """Test that waiting between retries does not block other connections."""
+    from juju_spell.connections.conn_builder import build_controller_conn
+
+    mock_wait_backoff.return_value = tenacity.wait_fixed(0.2)
+    flapping_controller, controller = AsyncMock(), AsyncMock()
+    flapping_controller._connector.connect.side_effect = [JujuConnectionError, None]
+    args = ("localhost:1234", "user", "password", "ca_cert", RetryPolicy(attempt=2))
+
+    flapping = asyncio.ensure_future(
+        build_controller_conn(flapping_controller, uuid4(), "flapping", *args)
+    )
+    await asyncio.sleep(0.01)  # flapping controller is waiting for next attempt
+    await asyncio.wait_for(build_controller_conn(controller, uuid4(), "test", *args), 0.1)
+
+    assert not flapping.done()
+    await flapping
+    assert flapping_controller._connector.connect.await_count == 2
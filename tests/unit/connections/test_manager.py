@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import io
 import unittest
@@ -11,26 +12,6 @@ from juju_spell import config as juju_spell_config
 from tests.unit.conftest import TEST_CONFIG, TEST_PERSONAL_CONFIG
 
 
-@pytest.mark.parametrize(
-    "attempt, retry_backoff, exp_wait",
-    [
-        (0, 1.5, 0.44),
-        (1, 1.5, 0.67),
-        (2, 1.5, 1),
-        (3, 1.5, 1.5),
-        (4, 1.5, 2.25),
-        (5, 1.5, 3.38),
-    ],
-)
-def test_get_wait_time(attempt, retry_backoff, exp_wait):
-    """Test calculation of wait time."""
-    from juju_spell.connections.manager import _get_wait_time
-
-    wait = _get_wait_time(attempt, retry_backoff)
-
-    assert exp_wait == round(wait, 2)
-
-
 @mock.patch("juju_spell.connections.connect_manager")
 def test_connect_manager(mock_connect_manager):
     """Test predefined connect_manager object."""
@@ -90,7 +71,7 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(connect_manager1, connect_manager2)
         self.assertEqual(connect_manager1.connections, connect_manager2.connections)
 
-    @mock.patch("juju_spell.connections.manager.juju.Controller")
+    @mock.patch("juju_spell.connections.manager.PooledController")
     @mock.patch("juju_spell.connections.manager.build_controller_conn")
     async def test_connect(self, mock_build_controller_conn, mock_controller):
         """Test connection with direct access."""
@@ -101,10 +82,15 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
 
         mocked_controller = mock_controller.return_value = AsyncMock()
         with mock.patch("juju_spell.connections.manager.get_connection") as mock_get_connection:
-            mock_get_connection.return_value = exp_endpoint, MagicMock()
+            mock_connection_process = MagicMock()
+            mock_connection_process.wait_ready = AsyncMock()
+            mock_get_connection.return_value = exp_endpoint, mock_connection_process
             controller = await self.connect_manager._connect(config)
             mock_get_connection.assert_called_once_with(config, False)
 
+        mock_connection_process.connect.assert_called_once_with()
+        mock_connection_process.wait_ready.assert_awaited_once_with()
+
         assert controller == mocked_controller
         mock_build_controller_conn.assert_called_once_with(
             mocked_controller,
@@ -125,7 +111,7 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
         # define mocked connections
         connections = []
         for i in range(10):
-            connection = Connection(AsyncMock(), MagicMock())
+            connection = Connection(AsyncMock(), AsyncMock())
             self.connect_manager.connections[f"test-{i}"] = connection
             connections.append(connection)
 
@@ -136,7 +122,25 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
         assert len(self.connect_manager.connections) == 0
         for connection in connections:
             connection.controller.disconnect.assert_called_once()
-            connection.connection_process.clean.assert_called_once()
+            connection.connection_process.clean.assert_awaited_once()
+
+    async def test_prune(self):
+        """Test prune function."""
+        from juju_spell.connections.manager import Connection
+
+        connected = Connection(MagicMock(), AsyncMock())
+        connected.controller.is_connected.return_value = True
+        connected.controller.model_pool.evict = AsyncMock()
+        lost = Connection(MagicMock(), AsyncMock())
+        lost.controller.is_connected.return_value = False
+        self.connect_manager.connections.update({"connected": connected, "lost": lost})
+
+        await self.connect_manager.prune()
+
+        assert self.connect_manager.connections == {"connected": connected}
+        connected.connection_process.clean.assert_not_called()
+        connected.controller.model_pool.evict.assert_awaited_once()
+        lost.connection_process.clean.assert_awaited_once()
 
     async def test_get_controller_invalid_controller_config(self):
         """Test function to get controller with invalid controller config."""
@@ -163,6 +167,7 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
         controller = await self.connect_manager.get_controller(config, reconnect=True)
 
         mocked_connection.controller.disconnect.assert_called_once()
+        mocked_connection.connection_process.clean.assert_awaited_once()
         mock_connect.assert_called_once_with(config, False)
         assert controller == mock_connect.return_value
 
@@ -177,9 +182,36 @@ class TestConnectManager(unittest.IsolatedAsyncioTestCase):
 
         controller = await self.connect_manager.get_controller(config, reconnect=False)
 
+        mock_controller.disconnect.assert_not_called()
+        mocked_connection.connection_process.clean.assert_awaited_once()
+        assert config.name not in self.connect_manager.connections
         mock_connect.assert_called_once_with(config, False)
         assert controller == mock_connect.return_value
 
+    async def test_get_controller_concurrent(self):
+        """Test concurrent calls to get the same controller connect only once."""
+        from juju_spell.connections.manager import Connection
+
+        config = self.controller_config_1
+        controller = MagicMock()
+        controller.is_connected.return_value = True
+
+        async def _connect(controller_config, _):
+            await asyncio.sleep(0.01)
+            self.connect_manager.connections[controller_config.name] = Connection(
+                controller, MagicMock()
+            )
+            return controller
+
+        self.connect_manager._connect = mock_connect = AsyncMock(side_effect=_connect)
+
+        controllers = await asyncio.gather(
+            *(self.connect_manager.get_controller(config) for _ in range(3))
+        )
+
+        mock_connect.assert_awaited_once_with(config, False)
+        assert controllers == [controller] * 3
+
     async def test_get_controller_existing_controller(self):
         """Test function to get controller, which already exists."""
         config = self.controller_config_1
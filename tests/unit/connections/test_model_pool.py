@@ -0,0 +1,138 @@
+import unittest
+from unittest import mock
+from unittest.mock import AsyncMock, MagicMock
+
+from juju_spell.connections.model_pool import ModelPool, PooledController, PooledModel
+
+
+class ModelPoolTestCase(unittest.IsolatedAsyncioTestCase):
+    """Test case for ModelPool class."""
+
+    def setUp(self) -> None:
+        """Set up before each test."""
+        self.controller = MagicMock()
+        self.controller.model_uuids = AsyncMock(return_value={"model1": "uuid1"})
+        self.controller.connection.return_value.connect_params.return_value = {"endpoint": "e"}
+        self.pool = ModelPool(self.controller, idle_timeout=60)
+
+    @mock.patch.object(PooledModel, "_connect_direct", new_callable=AsyncMock)
+    async def test_get_model(self, mock_connect_direct):
+        """Test connecting to model, which is not in pool."""
+        model = await self.pool.get_model("model1")
+
+        assert isinstance(model, PooledModel)
+        assert model.key == "uuid1"
+        mock_connect_direct.assert_awaited_once_with(endpoint="e", uuid="uuid1")
+
+    @mock.patch.object(PooledModel, "is_connected", return_value=True)
+    @mock.patch.object(PooledModel, "_connect_direct", new_callable=AsyncMock)
+    async def test_get_model_reuse(self, mock_connect_direct, _):
+        """Test reusing model connection returned to pool."""
+        model = await self.pool.get_model("model1")
+        await model.disconnect()
+
+        assert self.pool.idle["uuid1"][0][0] is model
+        assert await self.pool.get_model("uuid1") is model
+        mock_connect_direct.assert_awaited_once()
+        assert self.pool.idle["uuid1"] == []
+
+    @mock.patch.object(PooledModel, "is_connected", return_value=False)
+    @mock.patch.object(PooledModel, "_connect_direct", new_callable=AsyncMock)
+    async def test_get_model_lost_connection(self, mock_connect_direct, _):
+        """Test connecting to model again, when pooled connection was lost."""
+        model = await self.pool.get_model("model1")
+        await model.disconnect()
+
+        assert await self.pool.get_model("model1") is not model
+        assert mock_connect_direct.await_count == 2
+
+    @mock.patch("juju_spell.connections.model_pool.time.monotonic")
+    async def test_evict(self, mock_monotonic):
+        """Test closing model connections idle for longer than idle timeout."""
+        old_model, new_model = MagicMock(key="uuid1"), MagicMock(key="uuid1")
+        old_model.close = AsyncMock()
+        new_model.close = AsyncMock()
+        mock_monotonic.side_effect = [0, 50, 50, 50, 100]
+        await self.pool.release(old_model)
+        await self.pool.release(new_model)
+
+        await self.pool.evict()
+
+        old_model.close.assert_awaited_once()
+        new_model.close.assert_not_awaited()
+        assert self.pool.idle["uuid1"] == [(new_model, 50)]
+
+    async def test_release_max_idle(self):
+        """Test closing the least recently released connections over idle limit."""
+        self.pool.max_idle = 2
+        models = [MagicMock(key=f"uuid{i % 2}") for i in range(4)]
+        for model in models:
+            model.close = AsyncMock()
+            await self.pool.release(model)
+
+        models[0].close.assert_awaited_once()
+        models[1].close.assert_awaited_once()
+        models[2].close.assert_not_awaited()
+        models[3].close.assert_not_awaited()
+        assert [model for pooled in self.pool.idle.values() for model, _ in pooled] == [
+            models[2],
+            models[3],
+        ]
+
+    async def test_clear(self):
+        """Test closing all idle model connections."""
+        models = [MagicMock(key=f"uuid{i}") for i in range(3)]
+        for model in models:
+            model.close = AsyncMock()
+            await self.pool.release(model)
+
+        await self.pool.clear()
+
+        for model in models:
+            model.close.assert_awaited_once()
+        assert len(self.pool.idle) == 0
+
+
+class PooledModelTestCase(unittest.IsolatedAsyncioTestCase):
+    """Test case for PooledModel class."""
+
+    @mock.patch("juju_spell.connections.model_pool.Model.disconnect", new_callable=AsyncMock)
+    async def test_disconnect(self, mock_disconnect):
+        """Test returning model to pool instead of disconnecting."""
+        pool = MagicMock()
+        pool.release = AsyncMock()
+        model = PooledModel(pool, "uuid1")
+
+        await model.disconnect()
+        pool.release.assert_awaited_once_with(model)
+        mock_disconnect.assert_not_awaited()
+
+        await model.close()
+        mock_disconnect.assert_awaited_once()
+
+
+class PooledControllerTestCase(unittest.IsolatedAsyncioTestCase):
+    """Test case for PooledController class."""
+
+    async def test_get_model(self):
+        """Test getting model from pool."""
+        controller = PooledController()
+        controller.model_pool = MagicMock()
+        controller.model_pool.get_model = AsyncMock()
+
+        model = await controller.get_model("model1")
+
+        assert model == controller.model_pool.get_model.return_value
+        controller.model_pool.get_model.assert_awaited_once_with("model1")
+
+    @mock.patch("juju_spell.connections.model_pool.juju.Controller.disconnect")
+    async def test_disconnect(self, mock_disconnect):
+        """Test closing pooled models when controller is disconnected."""
+        controller = PooledController()
+        controller.model_pool = MagicMock()
+        controller.model_pool.clear = AsyncMock()
+
+        await controller.disconnect()
+
+        controller.model_pool.clear.assert_awaited_once()
+        mock_disconnect.assert_awaited_once()
@@ -1,45 +1,128 @@
+import asyncio
+import os
 import socket
 import subprocess
+import tempfile
 import unittest
 from unittest import mock
+from unittest.mock import AsyncMock
 
 import pytest
 
-from juju_spell.config import Connection
+from juju_spell.config import Connection, RetryPolicy
 
 
-@pytest.mark.parametrize("return_code, exp_result", [(1, True), (0, False)])
+@pytest.mark.parametrize("error, exp_result", [(None, True), (OSError, False)])
 @mock.patch("juju_spell.connections.network.socket.socket")
-def test_is_port_free(mock_socket, return_code, exp_result):
+def test_is_port_free(mock_socket, error, exp_result):
     """Test function checking if port is free."""
     from juju_spell.connections.network import _is_port_free
 
     test_port = 17070
     mock_socket.return_value = tcp = mock.MagicMock()
-    tcp.connect_ex.return_value = return_code
+    tcp.bind.side_effect = error
 
     result = _is_port_free(test_port)
 
     assert result == exp_result
     mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_STREAM)
-    tcp.connect_ex.assert_called_once_with(("localhost", test_port))
+    tcp.bind.assert_called_once_with(("localhost", test_port))
     tcp.close.assert_called_once()
 
 
+@pytest.mark.parametrize(
+    "content, exp_range", [("32768\t60999\n", range(32768, 61000)), (None, range(32768, 61000))]
+)
+def test_get_ephemeral_port_range(tmp_path, content, exp_range):
+    """Test getting ephemeral port range."""
+    from juju_spell.connections.network import _get_ephemeral_port_range
+
+    path = tmp_path / "ip_local_port_range"
+    if content is not None:
+        path.write_text(content)
+
+    with mock.patch("juju_spell.connections.network.EPHEMERAL_PORT_RANGE_PATH", path):
+        assert _get_ephemeral_port_range() == exp_range
+
+
+@mock.patch("juju_spell.connections.network._get_ephemeral_port_range")
 @mock.patch("juju_spell.connections.network._is_port_free")
-@mock.patch("juju_spell.connections.network.random.shuffle")
-def test_get_free_tcp_port(mock_random_shuffle, mock_is_port_free):
-    """Test getting free TCP port."""
-    from juju_spell.connections.network import get_free_tcp_port
+@mock.patch("juju_spell.connections.network.random.randrange", return_value=1)
+def test_port_allocator(_, mock_is_port_free, mock_get_ephemeral_port_range):
+    """Test allocating free TCP ports."""
+    from juju_spell.connections.network import PortAllocator
 
-    exp_port = 17073
-    mock_is_port_free.side_effect = [False, False, True, False]
+    mock_get_ephemeral_port_range.return_value = range(32768, 61000)
+    mock_is_port_free.return_value = True
+    allocator = PortAllocator()
+
+    ports = [allocator.allocate(range(17071, 17075)) for _ in range(4)]
+
+    assert ports == [17072, 17073, 17074, 17071]
+    assert allocator.reserved == {17071, 17072, 17073, 17074}
+    with pytest.raises(ValueError):
+        allocator.allocate(range(17071, 17075))
+
+    allocator.release(17073)
+    assert allocator.allocate(range(17071, 17075)) == 17073
 
-    port = get_free_tcp_port(range(17071, 17075))
 
-    mock_random_shuffle.assert_called_once_with([17071, 17072, 17073, 17074])
+@mock.patch("juju_spell.connections.network._get_ephemeral_port_range")
+@mock.patch("juju_spell.connections.network._is_port_free")
+@mock.patch("juju_spell.connections.network.random.randrange", return_value=0)
+def test_port_allocator_skip_used_port(_, mock_is_port_free, mock_get_ephemeral_port_range):
+    """Test allocating free TCP port, when some ports are used."""
+    from juju_spell.connections.network import PortAllocator
+
+    mock_get_ephemeral_port_range.return_value = range(32768, 61000)
+    mock_is_port_free.side_effect = [False, False, True]
+
+    port = PortAllocator().allocate(range(17071, 17075))
+
+    assert port == 17073
     mock_is_port_free.assert_has_calls([mock.call(17071), mock.call(17072), mock.call(17073)])
-    assert port == exp_port
+
+
+@mock.patch("juju_spell.connections.network._is_port_free")
+@mock.patch("juju_spell.connections.network._get_kernel_port", return_value=40000)
+@mock.patch("juju_spell.connections.network._get_ephemeral_port_range")
+def test_port_allocator_kernel_port(
+    mock_get_ephemeral_port_range, mock_get_kernel_port, mock_is_port_free
+):
+    """Test allocating port chosen by kernel, when range covers ephemeral ports."""
+    from juju_spell.connections.network import PortAllocator
+
+    mock_get_ephemeral_port_range.return_value = range(32768, 61000)
+
+    port = PortAllocator().allocate(range(1024, 65536))
+
+    assert port == 40000
+    mock_get_kernel_port.assert_called_once()
+    mock_is_port_free.assert_not_called()
+
+
+def test_get_kernel_port():
+    """Test getting free port chosen by kernel."""
+    from juju_spell.connections.network import _get_kernel_port
+
+    assert 0 < _get_kernel_port() < 65536
+
+
+@mock.patch("juju_spell.connections.network._is_port_free", return_value=True)
+def test_get_free_tcp_port(_):
+    """Test getting and releasing free TCP port."""
+    from juju_spell.connections.network import (
+        get_free_tcp_port,
+        port_allocator,
+        release_tcp_port,
+    )
+
+    port = get_free_tcp_port(range(17071, 17075))
+
+    assert port in range(17071, 17075)
+    assert port in port_allocator.reserved
+    release_tcp_port(port)
+    assert port not in port_allocator.reserved
 
 
 @mock.patch("juju_spell.connections.network._is_port_free")
@@ -53,7 +136,8 @@ def test_get_free_tcp_port_exception(mock_is_port_free):
         get_free_tcp_port(range(17071, 17075))
 
 
-def test_empty_connection():
+@pytest.mark.asyncio
+async def test_empty_connection():
     """Test EmptyConnection."""
     from juju_spell.connections.network import EmptyConnection
 
@@ -61,11 +145,11 @@ def test_empty_connection():
     assert connection.is_connected is False
     connection.connect()
     assert connection.is_connected is True
-    connection.clean()
+    await connection.clean()
     assert connection.is_connected is False
 
 
-class EmptyConnectionTestCase(unittest.TestCase):
+class EmptyConnectionTestCase(unittest.IsolatedAsyncioTestCase):
     def setUp(self) -> None:
         """Set up test cases."""
         from juju_spell.connections.network import EmptyConnection
@@ -84,15 +168,15 @@ class EmptyConnectionTestCase(unittest.TestCase):
         self.connection.connect()
         self.assertTrue(self.connection._connected)
 
-    def test_clean(self):
+    async def test_clean(self):
         """Test clean function."""
         self.connection._connected = True
         self.assertTrue(self.connection._connected)
-        self.connection.clean()
+        await self.connection.clean()
         self.assertFalse(self.connection._connected)
 
 
-class BaseSubprocessConnectionTestCase(unittest.TestCase):
+class BaseSubprocessConnectionTestCase(unittest.IsolatedAsyncioTestCase):
     def setUp(self) -> None:
         """Set up test cases."""
         from juju_spell.connections.network import BaseSubprocessConnection
@@ -110,49 +194,288 @@ class BaseSubprocessConnectionTestCase(unittest.TestCase):
         with pytest.raises(NotImplementedError):
             self.connection.connect()
 
-    def test_clean(self):
+    async def test_clean(self):
         """Test clean function."""
         self.connection.process = mocked_process = mock.MagicMock()
-        self.connection.clean()
+        await self.connection.clean()
         mocked_process.terminate.assert_called_once()
 
 
 @pytest.mark.parametrize(
-    "args, exp_cmd",
+    "target, exp_result",
     [
+        ("localhost:1234", ("localhost", 1234)),
+        ("1234", ("localhost", 1234)),
+        ("0.0.0.0:80", ("0.0.0.0", 80)),
+    ],
+)
+def test_split_target(target, exp_result):
+    """Test splitting target to host and port."""
+    from juju_spell.connections.network import _split_target
+
+    assert _split_target(target) == exp_result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error, exp_result", [(None, True), (ConnectionRefusedError, False)])
+@mock.patch("juju_spell.connections.network.asyncio.open_connection")
+async def test_is_port_open(mock_open_connection, error, exp_result):
+    """Test checking if port accepts connections."""
+    from juju_spell.connections.network import _is_port_open
+
+    writer = mock.MagicMock()
+    mock_open_connection.return_value = (mock.MagicMock(), writer)
+    mock_open_connection.side_effect = error
+
+    assert await _is_port_open("localhost", 1234) is exp_result
+    mock_open_connection.assert_called_once_with("localhost", 1234)
+    assert writer.close.called is exp_result
+
+
+@pytest.mark.parametrize(
+    "jumps, exp_cmd",
+    [
+        (None, ["ssh", "-M", "-S", "<control-path>", "-N", "bastion"]),
         (
-            ("localhost:1234", "10.1.1.99:17070", "bastion"),
-            ["ssh", "bastion", "-N", "-L", "localhost:1234:10.1.1.99:17070"],
+            ["bastion1", "bastion2"],
+            ["ssh", "-M", "-S", "<control-path>", "-N", "bastion", "-J", "bastion1,bastion2"],
         ),
-        (
-            ("localhost:1234", "10.1.1.99:17070", "bastion", ["bastion1", "bastion2"]),
-            [
+    ],
+)
+@mock.patch("juju_spell.connections.network.subprocess.Popen")
+def test_ssh_control_master_connect(mock_popen, jumps, exp_cmd):
+    """Test starting ssh master connection only once."""
+    from juju_spell.connections.network import SshControlMaster
+
+    mock_popen.return_value.poll.return_value = None
+    master = SshControlMaster("bastion", jumps)
+    exp_cmd[3] = master.control_path
+
+    master.connect()
+    master.connect()
+
+    assert master.is_connected is True
+    mock_popen.assert_called_once_with(exp_cmd, stdout=subprocess.DEVNULL, stderr=master._stderr)
+    asyncio.run(master.clean())
+
+
+@pytest.mark.asyncio
+async def test_ssh_control_master_control_path():
+    """Test control socket is created in private directory removed on clean."""
+    from juju_spell.connections.network import SshControlMaster
+
+    master, other_master = SshControlMaster("bastion"), SshControlMaster("bastion")
+    control_dir = os.path.dirname(master.control_path)
+
+    assert os.path.isdir(control_dir)
+    assert os.stat(control_dir).st_mode & 0o777 == 0o700
+    assert master.control_path != other_master.control_path
+
+    await master.clean()
+    await other_master.clean()
+
+    assert not os.path.exists(control_dir)
+
+
+def test_get_control_master():
+    """Test sharing ssh master connection for the same destination and jumps."""
+    from juju_spell.connections.network import get_control_master
+
+    master = get_control_master("bastion", ["jump"])
+
+    assert get_control_master("bastion", ["jump"]) is master
+    assert get_control_master("bastion") is not master
+    assert get_control_master("ubuntu@bastion", ["jump"]) is not master
+
+
+class SshControlMasterTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        """Set up test cases."""
+        from juju_spell.connections.network import SshControlMaster
+
+        self.master = SshControlMaster("bastion")
+        self.master.process = mock.MagicMock()
+        self.master.process.poll.return_value = None
+
+    async def asyncTearDown(self) -> None:
+        """Remove control socket directory."""
+        await self.master.clean()
+
+    @mock.patch("juju_spell.connections.network.os.path.exists")
+    async def test_wait_ready(self, mock_exists):
+        """Test waiting for control socket."""
+        mock_exists.side_effect = [False, True]
+
+        await self.master.wait_ready()
+
+        mock_exists.assert_called_with(self.master.control_path)
+
+    @mock.patch("juju_spell.connections.network.os.path.exists", return_value=False)
+    async def test_wait_ready_process_exited(self, _):
+        """Test waiting for control socket when ssh exited."""
+        from juju_spell.exceptions import JujuSpellError
+
+        self.master.process.poll.return_value = 255
+        self.master._stderr = tempfile.TemporaryFile()
+        self.master._stderr.write(b"Permission denied\n")
+
+        with pytest.raises(JujuSpellError, match="Permission denied"):
+            await self.master.wait_ready()
+
+    @mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+    async def test_forward(self, mock_create_subprocess_exec):
+        """Test adding port-forward to master connection."""
+        self.master.wait_ready = AsyncMock()
+        mock_create_subprocess_exec.return_value = process = mock.MagicMock()
+        process.communicate = AsyncMock(return_value=(b"", b""))
+        process.returncode = 0
+
+        await self.master.forward("localhost:1234", "10.1.1.99:17070")
+
+        self.master.wait_ready.assert_awaited_once()
+        mock_create_subprocess_exec.assert_called_once_with(
+            *[
                 "ssh",
-                "bastion",
-                "-N",
+                "-S",
+                self.master.control_path,
+                "-O",
+                "forward",
                 "-L",
                 "localhost:1234:10.1.1.99:17070",
-                "-J bastion1 -J bastion2",
+                "bastion",
             ],
-        ),
-        (
-            ("1234", "10.1.1.99:17070", "ubuntu@bastion"),
-            ["ssh", "ubuntu@bastion", "-N", "-L", "1234:10.1.1.99:17070"],
-        ),
-    ],
-)
-@mock.patch("juju_spell.connections.network.subprocess.Popen", return_value=mock.MagicMock)
-def test_ssh_port_forwarding_proc_connect(mock_popen, args, exp_cmd):
-    """Test create ssh tune for port forwarding."""
-    mock_popen.return_value = mock_process = mock.MagicMock()
-    mock_process.returncode.return_value = 0
-    from juju_spell.connections.network import SshPortForwardSubprocess
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
 
-    ssh_portforward = SshPortForwardSubprocess(*args)
-    ssh_portforward.connect()
+    @mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+    async def test_forward_failed(self, mock_create_subprocess_exec):
+        """Test adding port-forward to master connection failed."""
+        from juju_spell.exceptions import JujuSpellError
 
-    assert ssh_portforward.is_connected is True
-    mock_popen.assert_called_once_with(exp_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.master.wait_ready = AsyncMock()
+        mock_create_subprocess_exec.return_value = process = mock.MagicMock()
+        process.communicate = AsyncMock(return_value=(b"", b"Port forwarding failed"))
+        process.returncode = 255
+
+        with pytest.raises(JujuSpellError, match="Port forwarding failed"):
+            await self.master.forward("localhost:1234", "10.1.1.99:17070")
+
+    @mock.patch("juju_spell.connections.network.asyncio.create_subprocess_exec")
+    async def test_cancel(self, mock_create_subprocess_exec):
+        """Test canceling port-forward without blocking event loop."""
+        mock_create_subprocess_exec.return_value = process = mock.MagicMock()
+        process.communicate = AsyncMock(return_value=(b"", b""))
+
+        await self.master.cancel("localhost:1234", "10.1.1.99:17070")
+
+        mock_create_subprocess_exec.assert_called_once_with(
+            *[
+                "ssh",
+                "-S",
+                self.master.control_path,
+                "-O",
+                "cancel",
+                "-L",
+                "localhost:1234:10.1.1.99:17070",
+                "bastion",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        process.communicate.assert_awaited_once()
+
+    async def test_clean(self):
+        """Test terminating master connection."""
+        process = self.master.process
+
+        await self.master.clean()
+
+        process.terminate.assert_called_once()
+        self.assertFalse(self.master.is_connected)
+
+
+class SshMultiplexedPortForwardTestCase(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("juju_spell.connections.network._is_port_open", return_value=True)
+    @mock.patch("juju_spell.connections.network.get_control_master")
+    async def test_shared_master(self, mock_get_control_master, _):
+        """Test port-forwards sharing master connection."""
+        from juju_spell.connections.network import SshMultiplexedPortForward
+
+        mock_get_control_master.return_value = master = mock.MagicMock()
+        master.forward = AsyncMock()
+        master.cancel = AsyncMock()
+        master.clean = AsyncMock()
+        master.forwards = 0
+        connection_1 = SshMultiplexedPortForward(
+            "localhost:1234", "10.1.1.98:17070", "bastion", ["jump"]
+        )
+        connection_2 = SshMultiplexedPortForward(
+            "localhost:1235", "10.1.1.99:17070", "bastion", ["jump"], timeout=10
+        )
+
+        for connection in (connection_1, connection_2):
+            connection.connect()
+            await connection.wait_ready()
+
+        mock_get_control_master.assert_called_with("bastion", ["jump"])
+        self.assertEqual(master.connect.call_count, 2)
+        master.forward.assert_has_awaits(
+            [
+                mock.call("localhost:1234", "10.1.1.98:17070", 60),
+                mock.call("localhost:1235", "10.1.1.99:17070", 10),
+            ]
+        )
+        self.assertEqual(master.forwards, 2)
+
+        await connection_1.clean()
+        master.cancel.assert_awaited_once_with("localhost:1234", "10.1.1.98:17070")
+        master.clean.assert_not_called()
+
+        await connection_2.clean()
+        await connection_2.clean()
+        self.assertEqual(master.forwards, 0)
+        master.clean.assert_awaited_once()
+
+    @mock.patch("juju_spell.connections.network.asyncio.sleep")
+    @mock.patch("juju_spell.connections.network._is_port_open")
+    @mock.patch("juju_spell.connections.network.get_control_master")
+    async def test_wait_ready(self, mock_get_control_master, mock_is_port_open, mock_sleep):
+        """Test waiting until local port of port-forward accepts connections."""
+        from juju_spell.connections.network import SshMultiplexedPortForward
+
+        mock_get_control_master.return_value.forward = AsyncMock()
+        mock_is_port_open.side_effect = [False, False, True]
+        connection = SshMultiplexedPortForward("localhost:1234", "10.1.1.99:17070", "bastion")
+
+        await connection.wait_ready()
+
+        mock_is_port_open.assert_awaited_with("localhost", 1234)
+        self.assertEqual(mock_is_port_open.await_count, 3)
+        self.assertEqual(mock_sleep.await_count, 2)
+
+    @mock.patch("juju_spell.connections.network.asyncio.sleep")
+    @mock.patch("juju_spell.connections.network._is_port_open", return_value=False)
+    @mock.patch("juju_spell.connections.network.get_control_master")
+    async def test_wait_ready_failed(self, mock_get_control_master, *_):
+        """Test waiting for local port when master connection exited or timed out."""
+        from juju_spell.connections.network import SshMultiplexedPortForward
+        from juju_spell.exceptions import JujuSpellError
+
+        master = mock_get_control_master.return_value
+        master.forward = AsyncMock()
+        master.destination = "bastion"
+        connection = SshMultiplexedPortForward(
+            "localhost:1234", "10.1.1.99:17070", "bastion", timeout=0
+        )
+
+        master.is_connected = False
+        with pytest.raises(JujuSpellError, match="master connection to bastion exited"):
+            await connection.wait_ready()
+
+        master.is_connected = True
+        with pytest.raises(JujuSpellError, match="timed out"):
+            await connection.wait_ready()
 
 
 @pytest.mark.parametrize(
@@ -195,7 +518,7 @@ def test_sshuttle_proc(mock_popen, args, exp_cmd):
     ],
 )
 @mock.patch("juju_spell.connections.network.get_free_tcp_port", return_value=18070)
-@mock.patch("juju_spell.connections.network.SshPortForwardSubprocess")
+@mock.patch("juju_spell.connections.network.SshMultiplexedPortForward")
 @mock.patch("juju_spell.connections.network.SshuttleSubprocess")
 def test_get_connection(
     mocked_sshuttle,
@@ -210,13 +533,16 @@ def test_get_connection(
     controller_config = mock.MagicMock()
     controller_config.endpoint = endpoint
     controller_config.connection = connection
+    controller_config.retry_policy = RetryPolicy(timeout=30)
     from juju_spell.connections.network import get_connection
 
     controller_endpoint, _ = get_connection(controller_config, sshuttle=sshuttle)
 
     assert controller_endpoint == exp_endpoint
     if connection and not sshuttle:
-        mocked_port_forward.assert_called_once()
+        mocked_port_forward.assert_called_once_with(
+            exp_endpoint, endpoint, connection.destination, connection.jumps, timeout=30
+        )
         mocked_sshuttle.assert_not_called()
     elif connection and sshuttle:
         mocked_port_forward.assert_not_called()
@@ -1,11 +1,26 @@
+import os
 import shutil
 from pathlib import Path
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock, call, mock_open, patch
 
 import pytest
 
 import juju_spell
-from juju_spell.cache import AVALIABLE_BACKENDS, DEFAULT_CACHE_BACKEND, Cache, use_cache
+from juju_spell.cache import (
+    AVALIABLE_BACKENDS,
+    DEFAULT_CACHE_BACKEND,
+    FILE_CACHE_BACKEND,
+    SQLITE_CACHE_BACKEND,
+    Cache,
+    CachePolicy,
+    FileCache,
+    LRUCache,
+    MemoryStore,
+    SQLiteCache,
+    flush_cache,
+    use_cache,
+    write_behind_queue,
+)
 from juju_spell.exceptions import JujuSpellError
 
 
@@ -20,7 +35,7 @@ def tmp_cache_dir():
 
 def test_00_file_cache_normal(tmp_cache_dir):
     """Test file cache class under normal situation."""
-    file_cache = use_cache(DEFAULT_CACHE_BACKEND)
+    file_cache = use_cache(FILE_CACHE_BACKEND, memory=False)
     file_cache.cache_directory = tmp_cache_dir
 
     # test put
@@ -44,7 +59,7 @@ def test_00_file_cache_normal(tmp_cache_dir):
 @patch.object(juju_spell.cache.FileCache, "_check_expired")
 def test_01_file_cache_get(mock_check_expired, tmp_cache_dir):
     """Test file cache get method."""
-    file_cache = use_cache(DEFAULT_CACHE_BACKEND)
+    file_cache = use_cache(FILE_CACHE_BACKEND, memory=False)
     file_cache.cache_directory = tmp_cache_dir
 
     # create some data
@@ -79,7 +94,7 @@ def test_01_file_cache_get(mock_check_expired, tmp_cache_dir):
 
 def test_02_file_cache_put(tmp_cache_dir):
     """Test file cache put method."""
-    file_cache = use_cache(DEFAULT_CACHE_BACKEND)
+    file_cache = use_cache(FILE_CACHE_BACKEND, memory=False)
     file_cache.cache_directory = tmp_cache_dir
 
     # test put: normal
@@ -104,7 +119,7 @@ def test_02_file_cache_put(tmp_cache_dir):
 
 def test_03_file_cache_delete(tmp_cache_dir):
     """Test file cache delete method."""
-    file_cache = use_cache(DEFAULT_CACHE_BACKEND)
+    file_cache = use_cache(FILE_CACHE_BACKEND, memory=False)
     file_cache.cache_directory = tmp_cache_dir
 
     # create some data
@@ -135,6 +150,323 @@ def test_03_file_cache_delete(tmp_cache_dir):
             file_cache.delete(key)
 
 
+@pytest.fixture
+def sqlite_cache(tmp_cache_dir, tmp_path):
+    sqlite_cache = use_cache(SQLITE_CACHE_BACKEND, memory=False)
+    sqlite_cache.cache_directory = tmp_path
+    return sqlite_cache
+
+
+@pytest.mark.parametrize(
+    "backend, exp_class",
+    [(FILE_CACHE_BACKEND, FileCache), (SQLITE_CACHE_BACKEND, SQLiteCache)],
+)
+def test_use_cache(tmp_cache_dir, backend, exp_class):
+    assert isinstance(use_cache(backend, memory=False), exp_class)
+    assert DEFAULT_CACHE_BACKEND == SQLITE_CACHE_BACKEND
+
+    cache = use_cache(backend)
+    assert isinstance(cache, LRUCache)
+    assert isinstance(cache.backend, exp_class)
+    assert cache.store is use_cache(backend).store  # store is shared in process
+
+
+def test_sqlite_cache_normal(sqlite_cache, tmp_path):
+    """Test SQLite cache class under normal situation."""
+    value = {"name": "foo", "models": ["a", "b"]}
+    sqlite_cache.put("key", value)
+    assert (tmp_path / "cache.sqlite3").exists()
+
+    context = sqlite_cache.get("key")
+    assert context["data"] == value
+    assert context["timestamp"]
+
+    sqlite_cache.put("key", {"name": "bar"})
+    assert sqlite_cache.get("key")["data"] == {"name": "bar"}
+
+    sqlite_cache.delete("key")
+    assert sqlite_cache.get("key") is None
+    with pytest.raises(JujuSpellError, match="`key` does not exists."):
+        sqlite_cache.delete("key")
+
+
+def test_sqlite_cache_many(sqlite_cache):
+    """Test SQLite cache bulk methods."""
+    sqlite_cache.put_many({f"key{i}": {"index": i} for i in range(300)})
+
+    contexts = sqlite_cache.get_many([f"key{i}" for i in range(0, 400, 2)])
+
+    assert {key: context["data"] for key, context in contexts.items()} == {
+        f"key{i}": {"index": i} for i in range(0, 300, 2)
+    }
+    assert sqlite_cache.get_many([]) == {}
+
+
+def test_sqlite_cache_expired(sqlite_cache):
+    """Test SQLite cache with expired data."""
+    sqlite_cache.policy = CachePolicy(ttl=60)
+    with patch("juju_spell.cache.time", return_value=1000):
+        sqlite_cache.put("key", {"name": "foo"})
+
+    with patch("juju_spell.cache.time", return_value=1060):
+        assert sqlite_cache.get("key")["data"] == {"name": "foo"}
+
+    with patch("juju_spell.cache.time", return_value=1061):
+        assert sqlite_cache.get("key") is None
+
+    # expired data were removed
+    assert sqlite_cache.connection.execute("SELECT COUNT(*) FROM cache").fetchone() == (0,)
+
+
+def test_sqlite_cache_namespace(sqlite_cache):
+    """Test SQLite cache evicts the oldest keys over max_entries of namespace."""
+    sqlite_cache.policy = CachePolicy(max_entries=2)
+    sqlite_cache.namespace = "ns"
+    for i in range(4):
+        with patch("juju_spell.cache.time", return_value=1000 + i):
+            sqlite_cache.put(f"ns_key{i}", {"index": i})
+            sqlite_cache.put(f"other_key{i}", {"index": i})
+
+    keys = [f"{prefix}_key{i}" for prefix in ["ns", "other"] for i in range(4)]
+    with patch("juju_spell.cache.time", return_value=1004):
+        assert sorted(sqlite_cache.get_many(keys)) == [
+            "ns_key2",
+            "ns_key3",
+            *[f"other_key{i}" for i in range(4)],
+        ]
+
+
+def test_sqlite_cache_error(sqlite_cache, tmp_path):
+    """Test SQLite cache with database errors."""
+    sqlite_cache.cache_directory = tmp_path / "missing"
+    with pytest.raises(JujuSpellError, match="unable to open cache database"):
+        sqlite_cache.get("key")
+
+    sqlite_cache.cache_directory = tmp_path
+    sqlite_cache.connection.execute("DROP TABLE cache")
+    with pytest.raises(JujuSpellError, match="no such table: cache"):
+        sqlite_cache.put("key", {"name": "foo"})
+
+
+def test_memory_store_lru():
+    """Test memory store evicts least recently used contexts."""
+    store = MemoryStore(max_items=2)
+    for key in ["a", "b"]:
+        store.put(key, {"timestamp": 10, "data": key}, expired_before=0)
+
+    assert store.get("a")["data"] == "a"  # "b" is now least recently used
+    store.put("c", {"timestamp": 10, "data": "c"}, expired_before=0)
+
+    assert store.get("b") is None
+    assert [store.get(key)["data"] for key in ["a", "c"]] == ["a", "c"]
+    assert len(store) == 2
+
+
+def test_memory_store_expired():
+    """Test memory store evicts expired contexts first."""
+    store = MemoryStore(max_items=2)
+    store.put("a", {"timestamp": 10, "data": "a"}, expired_before=0)
+    store.put("b", {"timestamp": 1, "data": "b"}, expired_before=0)
+    store.put("c", {"timestamp": 10, "data": "c"}, expired_before=5)
+
+    assert store.get("b") is None
+    assert len(store) == 2
+
+
+def test_memory_store_bytes():
+    """Test memory store limits size of contexts."""
+    store = MemoryStore(max_bytes=100)
+    store.put("a", {"timestamp": 10, "data": "a" * 40}, expired_before=0)
+    store.put("b", {"timestamp": 10, "data": "b" * 40}, expired_before=0)
+    store.put("c", {"timestamp": 10, "data": "c" * 200}, expired_before=0)
+
+    assert store.get("a") is None
+    assert store.get("b") is not None
+    assert store.get("c") is None  # bigger than store
+    assert store.size < 100
+
+    store.remove("b")
+    assert store.size == 0
+
+
+def test_memory_store_copy():
+    """Test memory store returns copy of context."""
+    store = MemoryStore()
+    store.put("a", {"timestamp": 10, "data": {"refresh": True}}, expired_before=0)
+    store.get("a")["data"]["refresh"] = False
+
+    assert store.get("a")["data"]["refresh"] is True
+
+
+def test_lru_cache(tmp_cache_dir):
+    """Test LRU cache with write-through to backend."""
+    backend = MagicMock()
+    backend.policy = CachePolicy(ttl=60)
+    cache = LRUCache(backend, MemoryStore())
+
+    with patch("juju_spell.cache.time", return_value=1000):
+        cache.put("key", {"name": "foo"})
+        backend.put_many.assert_called_once_with({"key": {"name": "foo"}})
+
+    # read from memory
+    with patch("juju_spell.cache.time", return_value=1060):
+        assert cache.get("key") == {"timestamp": 1000, "data": {"name": "foo"}}
+        backend.get_many.assert_not_called()
+
+    # expired in memory, read from backend
+    backend.get_many.return_value = {"key": {"timestamp": 1050, "data": {"name": "bar"}}}
+    with patch("juju_spell.cache.time", return_value=1061):
+        assert cache.get("key")["data"] == {"name": "bar"}
+        assert cache.get("key")["data"] == {"name": "bar"}
+        backend.get_many.assert_called_once_with(["key"])
+
+    cache.delete("key")
+    backend.delete.assert_called_once_with("key")
+    assert len(cache.store) == 0
+
+
+def test_lru_cache_policy(tmp_cache_dir):
+    """Test LRU cache shares policy with backend."""
+    backend = FileCache()
+    cache = LRUCache(backend, MemoryStore())
+    cache.policy = CachePolicy(ttl=10)
+
+    assert backend.policy.ttl == 10
+    assert cache.policy.ttl == 10
+
+
+def test_file_cache_namespace(tmp_cache_dir):
+    """Test file cache evicts the oldest keys over max_entries of namespace."""
+    file_cache = use_cache(
+        FILE_CACHE_BACKEND, memory=False, policy=CachePolicy(max_entries=2), namespace="ns"
+    )
+    other_cache = use_cache(FILE_CACHE_BACKEND, memory=False, namespace="other")
+    for i in range(4):
+        file_cache.put(f"ns_key{i}", {"index": i})
+        other_cache.put(f"other_key{i}", {"index": i})
+        mtime = 1000 + i
+        os.utime(tmp_cache_dir / f"ns_key{i}", (mtime, mtime))  # time resolution of file system
+
+    assert sorted(path.name for path in tmp_cache_dir.glob("ns_*")) == ["ns_key2", "ns_key3"]
+    assert len(list(tmp_cache_dir.glob("other_*"))) == 4
+
+
+def test_cache_many(tmp_cache_dir):
+    """Test default bulk methods of cache."""
+    file_cache = use_cache(FILE_CACHE_BACKEND, memory=False)
+    file_cache.put_many({"key1": {"name": "foo"}, "key2": {"name": "bar"}})
+
+    contexts = file_cache.get_many(["key1", "key2", "key3"])
+
+    assert {key: context["data"] for key, context in contexts.items()} == {
+        "key1": {"name": "foo"},
+        "key2": {"name": "bar"},
+    }
+
+
+def test_lru_cache_get_many(tmp_cache_dir):
+    """Test LRU cache reads keys missing in memory with single call."""
+    backend = MagicMock()
+    backend.policy = CachePolicy(ttl=60)
+    backend.get_many.return_value = {"key2": {"timestamp": 1000, "data": {"name": "bar"}}}
+    cache = LRUCache(backend, MemoryStore())
+
+    with patch("juju_spell.cache.time", return_value=1000):
+        cache.put_many({"key1": {"name": "foo"}})
+        backend.put_many.assert_called_once_with({"key1": {"name": "foo"}})
+        contexts = cache.get_many(["key1", "key2", "key3"])
+
+    backend.get_many.assert_called_once_with(["key2", "key3"])
+    assert contexts == {
+        "key1": {"timestamp": 1000, "data": {"name": "foo"}},
+        "key2": {"timestamp": 1000, "data": {"name": "bar"}},
+    }
+
+
+def test_lru_cache_write_behind(tmp_cache_dir, tmp_path):
+    """Test LRU cache postpones writes until flush."""
+    backend = SQLiteCache()
+    backend.cache_directory = tmp_path
+    cache = LRUCache(backend, MemoryStore(), write_behind=True)
+
+    for i in range(10):
+        cache.put(f"key{i}", {"index": i})
+    cache.put("key0", {"index": 10})
+
+    assert len(write_behind_queue) == 10
+    assert backend.get_many([f"key{i}" for i in range(10)]) == {}
+    assert cache.get("key0")["data"] == {"index": 10}
+
+    cache.delete("key9")  # only in queue
+    with patch.object(backend, "put_many", wraps=backend.put_many) as mock_put_many:
+        flush_cache()
+        mock_put_many.assert_called_once()
+
+    assert len(write_behind_queue) == 0
+    contexts = backend.get_many([f"key{i}" for i in range(10)])
+    assert {key: context["data"]["index"] for key, context in contexts.items()} == {
+        "key0": 10,
+        **{f"key{i}": i for i in range(1, 9)},
+    }
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_lru_cache_namespace(tmp_cache_dir, tmp_path, write_behind):
+    """Test LRU cache removes keys evicted by backend from memory."""
+    backend = SQLiteCache(CachePolicy(max_entries=2), "ns")
+    backend.cache_directory = tmp_path
+    cache = LRUCache(backend, MemoryStore(), write_behind)
+    for i in range(4):
+        with patch("juju_spell.cache.time", return_value=1000 + i):
+            cache.put(f"ns_key{i}", {"index": i})
+            flush_cache()
+
+    keys = [f"ns_key{i}" for i in range(4)]
+    with patch("juju_spell.cache.time", return_value=1004):
+        assert sorted(cache.get_many(keys)) == ["ns_key2", "ns_key3"]
+
+    assert len(cache.store) == 2
+
+
+def test_file_cache_on_evict(tmp_cache_dir):
+    """Test file cache passes evicted keys to on_evict callback."""
+    file_cache = use_cache(
+        FILE_CACHE_BACKEND, memory=False, policy=CachePolicy(max_entries=1), namespace="evict"
+    )
+    file_cache.on_evict = MagicMock()
+    file_cache.put("evict_key0", {"index": 0})
+    os.utime(tmp_cache_dir / "evict_key0", (1000, 1000))
+    file_cache.put("evict_key1", {"index": 1})
+
+    file_cache.on_evict.assert_called_once_with(["evict_key0"])
+
+
+def test_write_behind_queue_policy(tmp_cache_dir, tmp_path):
+    """Test writes of backends with different policies are flushed separately."""
+    backends = [SQLiteCache(CachePolicy(ttl=ttl), "ns") for ttl in (60, 120)]
+    for index, backend in enumerate(backends):
+        write_behind_queue.put(backend, f"ns_key{index}", {"index": index})
+
+    with patch.object(SQLiteCache, "put_many") as mock_put_many:
+        flush_cache()
+
+    mock_put_many.assert_has_calls(
+        [call({"ns_key0": {"index": 0}}), call({"ns_key1": {"index": 1}})]
+    )
+
+
+def test_flush_cache_error(tmp_cache_dir):
+    """Test flush only logs errors of backend."""
+    backend = MagicMock()
+    backend.put_many.side_effect = JujuSpellError("permission denied")
+    write_behind_queue.put(backend, "key", {"name": "foo"})
+
+    flush_cache()
+
+    backend.put_many.assert_called_once_with({"key": {"name": "foo"}})
+    assert len(write_behind_queue) == 0
+
+
 def test_unknown_backend():
     with pytest.raises(JujuSpellError, match=f"Supported cache backends are {AVALIABLE_BACKENDS}"):
         use_cache("unknown_backend")
@@ -5,8 +5,9 @@ from unittest import mock
 
 import pytest
 import yaml
-from confuse import ConfigTypeError, ConfigView, MappingTemplate
+from confuse import ConfigTypeError, ConfigView, MappingTemplate, RootView
 
+from juju_spell.cache import CachePolicy
 from juju_spell.config import (
     API_ENDPOINT_REGEX,
     DESTINATION_REGEX,
@@ -15,6 +16,7 @@ from juju_spell.config import (
     UUID_REGEX,
     Config,
     Connection,
+    PositiveInteger,
     String,
     _apply_default,
     _validate_config,
@@ -53,6 +55,21 @@ def test_string_exception(regex, value):
         string.convert(value, view)
 
 
+@pytest.mark.parametrize("value", [1, 10])
+def test_positive_integer(value):
+    """Test custom positive integer option."""
+    positive_integer = PositiveInteger("test message")
+    assert positive_integer.convert(value, ConfigView()) == value
+
+
+@pytest.mark.parametrize("value", [0, -1, "1", 1.5, True])
+def test_positive_integer_exception(value):
+    """Test custom positive integer option."""
+    positive_integer = PositiveInteger("test message")
+    with pytest.raises(ConfigTypeError):
+        positive_integer.convert(value, RootView([]))
+
+
 def _update_test_config(
     config: Dict[str, Any], extra_configuration: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -110,6 +127,7 @@ def _update_test_config(
                     "description": "some nice notes",
                     "tags": ["test"],
                     "risk": 3,
+                    "model_concurrency": 5,
                     "connection": Connection(
                         destination="ubuntu@10.78.137.126",
                         port_range=range(17071, 17170),
@@ -119,6 +137,7 @@ def _update_test_config(
                     "description": None,
                     "tags": None,
                     "risk": 5,
+                    "model_concurrency": 5,
                     "connection": None,
                 },  # controller 1
             ],
@@ -163,6 +182,33 @@ def _update_test_config(
                 },  # controller 1
             ],
         ),
+        # test cache policies
+        (
+            {  # extra configuration
+                "controllers": [
+                    {
+                        "cache_policies": {
+                            "list-models": {"ttl": 86400, "max_entries": 100},
+                            "update-packages": {"ttl": 30, "soft_ttl": 10},
+                        }
+                    }
+                ]
+            },
+            [
+                {
+                    "cache_policies": {
+                        "list-models": CachePolicy(ttl=86400, max_entries=100),
+                        "update-packages": CachePolicy(ttl=30, soft_ttl=10),
+                    },
+                },  # controller 0
+                {"cache_policies": {}},  # controller 1
+            ],
+        ),
+        # test default soft_ttl lowered to ttl
+        (
+            {"controllers": [{"cache_policies": {"list-models": {"ttl": 60}}}]},
+            [{"cache_policies": {"list-models": CachePolicy(ttl=60, soft_ttl=60)}}],
+        ),
         # test special destination
     ],
 )
@@ -190,12 +236,20 @@ def test_validate_config(extra_configuration, exp_controller, test_config_dict):
         {"controllers": [{"owner": None}]},
         {"controllers": [{"tags": {"test": 1}}]},
         {"controllers": [{"risk": 6}]},
+        {"controllers": [{"model_concurrency": "many"}]},
+        {"controllers": [{"model_concurrency": 0}]},
+        {"controllers": [{"model_concurrency": -1}]},
+        {"controllers": [{"model_concurrency": True}]},
         {"controllers": [{"endpoint": "1.2.3"}]},
         {"controllers": [{"endpoint": "llocalhost"}]},
         {"controllers": [{"ca_cert": "1234"}]},
         {"controllers": [{"connection": {"destination": "1.2.3.4", "subnets": ["1.2.3.4/00"]}}]},
         {"controllers": [{"connection": {"destination": "1.2.3.4", "subnets": ["1.2"]}}]},
         {"controllers": [{"connection": {"destination": "1.2.3.4", "jumps": [None]}}]},
+        {"controllers": [{"cache_policies": {"list-models": {"ttl": "day"}}}]},
+        {"controllers": [{"cache_policies": ["list-models"]}]},
+        {"controllers": [{"cache_policies": {"status": {"ttl": 30}}}]},
+        {"controllers": [{"cache_policies": {"list-models": {"ttl": 30, "soft_ttl": 60}}}]},
     ],
 )
 def test_validate_config_failure(extra_configuration, test_config_dict):
@@ -244,6 +298,37 @@ def test_validate_config_missing_uuid(test_config_dict):
             JUJUSPELL_DEFAULT_CONFIG_TEMPLATE,
             False,
         ),
+        (
+            {
+                "default": {"controller": {"cache_policies": {"list-models": {"ttl": 60}}}},
+            },
+            JUJUSPELL_DEFAULT_CONFIG_TEMPLATE,
+            False,
+        ),
+        (
+            {
+                "default": {"controller": {"cache_policies": {"list-models": {"ttl": "x"}}}},
+            },
+            JUJUSPELL_DEFAULT_CONFIG_TEMPLATE,
+            True,
+        ),
+        (
+            {
+                "default": {"controller": {"cache_policies": {"lits-models": {"ttl": 60}}}},
+            },
+            JUJUSPELL_DEFAULT_CONFIG_TEMPLATE,
+            True,
+        ),
+        (
+            {"default": {"controller": {"model_concurrency": 10}}},
+            JUJUSPELL_DEFAULT_CONFIG_TEMPLATE,
+            False,
+        ),
+        (
+            {"default": {"controller": {"model_concurrency": 0}}},
+            JUJUSPELL_DEFAULT_CONFIG_TEMPLATE,
+            True,
+        ),
     ],
 )
 def test_config_match_template(extra_configuration, template, exp_error, test_config_dict):